@@ -0,0 +1,119 @@
+"""
+The headless core: the grid, the heuristics and the search engines, without pygame.
+
+Importing the package doesn't import any of them, every name is imported from its module the first time
+it is used, so a worker process or a command line tool only pay for what it use:
+
+    from a_star_core import Grid, FlatAStar, manhattan_distance
+
+The pygame interface (main.py, maze.py and the controllers) is a layer over this package,
+the package never import it.
+
+The modules of the package (a_star_core.grid, a_star_core.astar, ...) only import each other and numpy,
+so the package can be copied and used on its own.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+# the module of every name of the package
+_EXPORTS: Dict[str, str] = {
+    # locations and heuristics
+    "Location": "utils",
+    "Node": "utils",
+    "PriorityQueue": "utils",
+    "path_to_node": "utils",
+    "manhattan_distance": "utils",
+    "euclidean_distance": "utils",
+    "chebyshev_distance": "utils",
+    # the maze
+    "Grid": "grid",
+    "DIRECTIONS": "grid",
+    "EMPTY": "grid",
+    "BLOCK": "grid",
+    "START": "grid",
+    "GOAL": "grid",
+    "EXPLORE": "grid",
+    "PATH": "grid",
+    "EXPLORE_BACKWARD": "grid",
+    "save_maze": "maze_file",
+    "load_maze": "maze_file",
+    "MappedMaze": "maze_file",
+    # the search engines
+    "SearchEngine": "engine",
+    "AStar": "astar",
+    "FlatAStar": "flat_astar",
+    "JumpPointSearch": "jps",
+    "BidirectionalAStar": "bidirectional",
+    "DStarLite": "dstar_lite",
+    "BitsetBFS": "bitset_bfs",
+    "HierarchicalAStar": "hpa",
+    "AnytimeAStar": "anytime",
+    "AnytimeResult": "anytime",
+    "MultiGoalAStar": "multi_goal",
+    "GoalIndex": "multi_goal",
+    "Frontier": "frontier",
+    "BinaryHeapFrontier": "frontier",
+    "BucketFrontier": "frontier",
+    "IndexedHeapFrontier": "frontier",
+    "SearchObserver": "observer",
+    "ThrottledObserver": "observer",
+    "SearchStats": "stats",
+    # precomputation and caches
+    "PathCache": "path_cache",
+    "CachedPath": "path_cache",
+    # the function heuristic_field has the name of its module, it is a_star_core.heuristic_field.heuristic_field
+    "FieldCache": "heuristic_field",
+    "LandmarkTable": "landmarks",
+    "LandmarkStore": "landmarks",
+    "FlowField": "flow_field",
+    "FlowFieldCache": "flow_field",
+    "ComponentIndex": "components",
+    "label_components": "components",
+    # searches in other processes
+    "batch_search": "batch",
+    "BatchResult": "batch",
+    "SearchWorker": "search_worker",
+    "Progress": "search_worker",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from a_star_core.anytime import AnytimeAStar, AnytimeResult
+    from a_star_core.astar import AStar
+    from a_star_core.batch import batch_search, BatchResult
+    from a_star_core.bidirectional import BidirectionalAStar
+    from a_star_core.bitset_bfs import BitsetBFS
+    from a_star_core.components import ComponentIndex, label_components
+    from a_star_core.dstar_lite import DStarLite
+    from a_star_core.engine import SearchEngine
+    from a_star_core.flat_astar import FlatAStar
+    from a_star_core.flow_field import FlowField, FlowFieldCache
+    from a_star_core.frontier import Frontier, BinaryHeapFrontier, BucketFrontier, IndexedHeapFrontier
+    from a_star_core.grid import Grid, DIRECTIONS, EMPTY, BLOCK, START, GOAL, EXPLORE, PATH, EXPLORE_BACKWARD
+    from a_star_core.heuristic_field import FieldCache
+    from a_star_core.hpa import HierarchicalAStar
+    from a_star_core.jps import JumpPointSearch
+    from a_star_core.landmarks import LandmarkTable, LandmarkStore
+    from a_star_core.maze_file import save_maze, load_maze, MappedMaze
+    from a_star_core.multi_goal import MultiGoalAStar, GoalIndex
+    from a_star_core.observer import SearchObserver, ThrottledObserver
+    from a_star_core.path_cache import PathCache, CachedPath
+    from a_star_core.search_worker import SearchWorker, Progress
+    from a_star_core.stats import SearchStats
+    from a_star_core.utils import (Location, Node, PriorityQueue, path_to_node,
+                                   manhattan_distance, euclidean_distance, chebyshev_distance)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    # the next access doesn't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,166 @@
+import time
+from heapq import heapify, heappop, heappush
+from itertools import chain, count
+from typing import Callable, Dict, List, NamedTuple, Set, Tuple, Union
+
+from a_star_core.engine import SearchEngine
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+
+class AnytimeResult(NamedTuple):
+    # the best path found before the deadline, None if no path was found in time
+    path: Union[List[Location], None]
+    # the path is at most epsilon times longer than the shortest path, 1.0 when it is optimal
+    epsilon: float
+    time: float
+
+
+class AnytimeAStar(SearchEngine):
+    """
+    Anytime Repairing A* (ARA*): a first weighted A* search, with f = g + epsilon * h, quickly find a path
+    at most epsilon times longer than the shortest one. Then epsilon is decreased and the search is repaired:
+    only the locations whose cost was improved since their expansion are expanded again, until the deadline
+    or until the path is proven optimal
+    """
+
+    def __init__(self, heuristic: Callable[[Location], float],
+                 successor: Callable[[Location, bool], List[Location]],
+                 goal_check: Callable[[Location], bool],
+                 start: Location,
+                 allow_diagonal: bool,
+                 observer: Union[SearchObserver, None] = None,
+                 initial_epsilon: float = 3.0,
+                 epsilon_step: float = 0.5):
+        """
+        :param heuristic: a consistent heuristic, the bound on the path is only valid for it
+        :param initial_epsilon: weight of the heuristic for the first search
+        :param epsilon_step: decrease of the weight after every improvement
+        """
+        super().__init__(observer=observer)
+        self._heuristic = heuristic
+        self._successor = successor
+        self._goal_check = goal_check
+        self._start = start
+        self._allow_diagonal = allow_diagonal
+        self._initial_epsilon = initial_epsilon
+        self._epsilon_step = epsilon_step
+        self._epsilon: float = float("inf")
+        # (time, length of the path, epsilon) of every path found, in order
+        self._improvements: List[Tuple[float, int, float]] = []
+
+    def search(self, budget_ms: float) -> AnytimeResult:
+        """
+        :param budget_ms: wall clock budget, the search return the best path found when it is over
+        """
+        t1 = time.perf_counter()
+        deadline = t1 + budget_ms / 1000
+        self._path, self._epsilon, self._improvements = [], float("inf"), []
+
+        def search() -> List[Location]:
+            # the paths found before the deadline are published in self._path
+            self._search(started=t1, deadline=deadline)
+            return self._path
+
+        path = self._timed_search(search)
+        return AnytimeResult(path=path, epsilon=self._epsilon, time=self._time)
+
+    def _search(self, started: float, deadline: float):
+        heuristic: Dict[Location, float] = {self._start: self._heuristic(self._start)}
+        cost: Dict[Location, int] = {self._start: 0}
+        parent: Dict[Location, Location] = {}
+        # OPEN of ARA*, the frontier keep the entries of the locations in it
+        open_locations: Set[Location] = {self._start}
+        # locations improved after their expansion in the current search, searched again with the next epsilon
+        inconsistent: Set[Location] = set()
+        goal: Union[Location, None] = self._start if self._goal_check(self._start) else None
+        counter = count()
+        epsilon = self._initial_epsilon
+        self._expanded = 0
+        self._peak_frontier = 1
+
+        def entry(location: Location) -> Tuple[float, float, int, int, Location]:
+            h = heuristic[location]
+            return cost[location] + epsilon * h, h, next(counter), cost[location], location
+
+        frontier = [entry(self._start)]
+        while True:
+            closed: Set[Location] = set()
+            finished = False
+            while True:
+                # drop the entries of the locations expanded or improved since they were pushed
+                while frontier and (frontier[0][4] not in open_locations or frontier[0][3] != cost[frontier[0][4]]):
+                    heappop(frontier)
+                if not frontier or (goal is not None and frontier[0][0] >= cost[goal]):
+                    finished = True
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+                self._peak_frontier = max(self._peak_frontier, len(frontier))
+                location = heappop(frontier)[4]
+                open_locations.discard(location)
+                closed.add(location)
+                self._expanded += 1
+                if self._observer:
+                    self._observer.on_expand(location)
+                new_cost = cost[location] + 1
+                for child in self._successor(location, self._allow_diagonal):
+                    if child in cost and cost[child] <= new_cost:
+                        continue
+                    cost[child] = new_cost
+                    parent[child] = location
+                    if child not in heuristic:
+                        heuristic[child] = self._heuristic(child)
+                        if goal is None and self._goal_check(child):
+                            goal = child
+                    if child in closed:
+                        inconsistent.add(child)
+                    else:
+                        open_locations.add(child)
+                        heappush(frontier, entry(child))
+            if not finished or goal is None:
+                # out of time, or there is no path
+                return
+            path = self._path_to(parent=parent, goal=goal)
+            if time.perf_counter() >= deadline:
+                # no time left to scan the locations for a tighter bound, the path is within epsilon
+                self._publish(path=path, epsilon=max(epsilon, 1.0), started=started)
+                return
+            # the tightest bound: no path is shorter than the lowest g + h of the locations left to search
+            lowest = min((cost[location] + heuristic[location] for location in chain(open_locations, inconsistent)),
+                         default=cost[goal])
+            bound = min(epsilon, cost[goal] / lowest) if lowest > 0 else 1.0
+            self._publish(path=path, epsilon=max(bound, 1.0), started=started)
+            if self._epsilon <= 1.0 or time.perf_counter() >= deadline:
+                # optimal, or out of time before the frontier is built again
+                return
+            epsilon = max(1.0, epsilon - self._epsilon_step)
+            open_locations |= inconsistent
+            inconsistent = set()
+            # the keys depend on epsilon, the frontier is built again
+            frontier = [entry(location) for location in open_locations]
+            heapify(frontier)
+
+    def _publish(self, path: List[Location], epsilon: float, started: float):
+        if self._path and len(path) == len(self._path) and epsilon == self._epsilon:
+            # the search with a lower epsilon didn't find anything better
+            return
+        self._path = path
+        self._epsilon = epsilon
+        self._improvements.append((time.perf_counter() - started, len(path), epsilon))
+
+    def _path_to(self, parent: Dict[Location, Location], goal: Location) -> List[Location]:
+        path: List[Location] = [goal]
+        location = goal
+        while location in parent:
+            location = parent[location]
+            path.append(location)
+        return path[::-1]
+
+    @property
+    def epsilon(self) -> float:
+        return self._epsilon
+
+    @property
+    def improvements(self) -> List[Tuple[float, int, float]]:
+        return self._improvements
@@ -0,0 +1,195 @@
+import time
+from typing import Dict, Generator, List, Union, Callable
+
+from a_star_core.engine import SearchEngine
+from a_star_core.frontier import Frontier, BinaryHeapFrontier
+from a_star_core.observer import SearchObserver
+from a_star_core.stats import SearchStats
+from a_star_core.utils import (Node,
+                               path_to_node,
+                               Location)
+
+
+class AStar(SearchEngine):
+    def __init__(self, heuristic: Callable[[Location], float],
+                 successor: Callable[[Location, bool], List[Location]],
+                 goal_check: Callable[[Location], bool],
+                 start: Location,
+                 allow_diagonal: bool,
+                 observer: Union[SearchObserver, None] = None,
+                 frontier: Callable[[], Frontier] = BinaryHeapFrontier,
+                 profile: bool = False):
+        # the search itself never render anything, the observer receive the expansion events
+        super().__init__(observer=observer)
+        self._heuristic: Callable[[Location], float] = heuristic
+        self._successor = successor
+        self._goal_check = goal_check
+        self._start = start
+        self._solution: Union[Node, None] = None
+        self._allow_diagonal = allow_diagonal
+        # the open list implementation, so the queues can be compared
+        self._frontier = frontier
+        # timing every successor and heuristic call slow down the search, so it is only done when profiling
+        self._profile = profile
+        self._stats = SearchStats()
+        # the running search, advanced by step
+        self._run: Union[Generator[None, None, None], None] = None
+        self._busy: float = 0.0
+        # time spent by the observer inside step, it is taken off the busy time
+        self._rendering: float = 0.0
+        self._observer_elapsed: float = 0.0
+
+    @property
+    def heuristic(self):
+        return self._heuristic
+
+    @heuristic.setter
+    def heuristic(self, heuristic):
+        self._heuristic = heuristic
+
+    def start(self):
+        # the whole search at once
+        self.begin()
+        self.step()
+
+    def begin(self):
+        """
+        Prepare a search which is advanced by step, the running search is cancelled
+        """
+        self.cancel()
+        self._solution = None
+        self._path = []
+        self._len_of_path = 0
+        self._time = 0.0
+        self._busy = 0.0
+        self._rendering = 0.0
+        self._observer_elapsed = self._observer.elapsed if self._observer else 0.0
+        self._run = self._search()
+
+    def step(self, expansions: Union[int, None] = None, milliseconds: Union[float, None] = None) -> bool:
+        """
+        Advance the search, by default until it is over
+        :param expansions: expand at most this number of locations
+        :param milliseconds: stop after this time, checked after every expansion
+        :return: True once the search is over
+        """
+        run = self._run
+        if run is None:
+            return True
+        # the observer can also render between the steps, only its time inside the step is not searching
+        rendering = self._observer.elapsed if self._observer else 0.0
+        t1 = time.perf_counter()
+        if expansions is None and milliseconds is None:
+            for _ in run:
+                pass
+        else:
+            deadline = t1 + milliseconds / 1000 if milliseconds is not None else None
+            done = 0
+            for _ in run:
+                done += 1
+                if (expansions is not None and done >= expansions) or \
+                        (deadline is not None and time.perf_counter() >= deadline):
+                    self._account(started=t1, rendering=rendering)
+                    return False
+        self._account(started=t1, rendering=rendering)
+        self._run = None
+        self._finish()
+        return True
+
+    def cancel(self):
+        if self._run is not None:
+            # the search stop where it is, its finally block flush the observer
+            self._run.close()
+            self._run = None
+
+    def restart(self):
+        # search again from the start, e.g. after a new heuristic is set
+        self.begin()
+
+    @property
+    def running(self) -> bool:
+        return self._run is not None
+
+    def _account(self, started: float, rendering: float):
+        self._busy += time.perf_counter() - started
+        if self._observer:
+            self._rendering += self._observer.elapsed - rendering
+
+    def _finish(self):
+        # the time spent by the observer (rendering) is not part of the search
+        self._time = self._busy - self._rendering
+        self._stats.search_time = self._time
+        if self._solution:
+            self._path = path_to_node(self._solution)
+            self._len_of_path = len(self._path)
+            if self._observer:
+                self._observer.on_path(self._path)
+        self._stats.render_time = (self._observer.elapsed - self._observer_elapsed) if self._observer else 0.0
+
+    def _search(self) -> Generator[None, None, None]:
+        # A*, it yield after every expansion and set the solution once it is over
+        observer = self._observer
+        stats = self._stats = SearchStats()
+        heuristic_of, successor = self._heuristic, self._successor
+        if self._profile:
+            heuristic_of = self._timed(heuristic_of, "heuristic_time")
+            successor = self._timed(successor, "successor_time")
+        frontier: Frontier = self._frontier()
+        start = Node(location=self._start, parent=None, cost=0, heuristic=heuristic_of(self._start))
+        frontier.push(key=self._start, item=start, cost=start.cost, heuristic=start.heuristic)
+        explored: Dict[Location, int] = {self._start: 0}
+        closed = set()
+        expanded, pushes, reopened, peak_frontier = 0, 1, 0, 1
+        try:
+            while not frontier.empty:
+                if len(frontier) > peak_frontier:
+                    peak_frontier = len(frontier)
+                current_node: Node = frontier.pop()
+                current_location: Location = current_node.location
+                expanded += 1
+                closed.add(current_location)
+                if observer:
+                    observer.on_expand(current_location)
+                if self._goal_check(current_location):
+                    if observer:
+                        observer.on_goal(current_location)
+                    self._solution = current_node
+                    return
+                for child in successor(current_location, self._allow_diagonal):
+                    new_cost = current_node.cost + 1
+                    if child not in explored or explored[child] > new_cost:
+                        heuristic = heuristic_of(child)
+                        frontier.push(key=child, item=Node(location=child, parent=current_node,
+                                                           cost=new_cost, heuristic=heuristic),
+                                      cost=new_cost, heuristic=heuristic)
+                        explored[child] = new_cost
+                        pushes += 1
+                        if child in closed:
+                            reopened += 1
+                            closed.discard(child)
+                        if observer:
+                            observer.on_push(child)
+                yield
+        finally:
+            self._expanded, self._peak_frontier = expanded, peak_frontier
+            stats.expanded, stats.pushes, stats.reopened = expanded, pushes, reopened
+            # one heuristic evaluation per push
+            stats.heuristic_calls = pushes
+            stats.peak_frontier, stats.peak_explored = peak_frontier, len(explored)
+            if observer:
+                observer.flush()
+
+    def _timed(self, function: Callable, field: str) -> Callable:
+        stats = self._stats
+
+        def timed(*arguments):
+            t1 = time.perf_counter()
+            result = function(*arguments)
+            setattr(stats, field, getattr(stats, field) + time.perf_counter() - t1)
+            return result
+
+        return timed
+
+    @property
+    def stats(self) -> SearchStats:
+        return self._stats
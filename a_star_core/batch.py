@@ -0,0 +1,85 @@
+import time
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from a_star_core.components import ComponentIndex
+from a_star_core.flat_astar import FlatAStar
+from a_star_core.grid import Grid
+from a_star_core.heuristic_field import FieldCache
+from a_star_core.utils import Location, manhattan_distance
+
+
+class BatchResult(NamedTuple):
+    index: int
+    start: Location
+    goal: Location
+    path: Union[List[Location], None]
+    time: float
+
+
+# state of the worker process, created once by _attach
+_worker: Dict[str, object] = {}
+
+
+def batch_search(grid: Grid, queries: Iterable[Tuple[Location, Location]],
+                 heuristic: Callable[[Location], Callable[[Location], float]] = manhattan_distance,
+                 allow_diagonal: bool = False, processes: Union[int, None] = None,
+                 chunksize: int = 64) -> Iterator[BatchResult]:
+    """
+    Solve many (start, goal) queries on the same maze with a pool of processes.
+    The grid is copied once in shared memory and every worker attach to it, so the tasks
+    only carry the two locations. Every worker keep one FlatAStar, so its arrays are reused
+    by all the queries it solve, the heuristic fields of the goals it has seen, and the connected
+    parts of the maze, so the queries without solution are answered without searching
+    :param grid: the maze, it should not change while the results are consumed
+    :param queries: iterable of (start, goal)
+    :param heuristic: module level heuristic factory (it is sent to the workers), like manhattan_distance
+    :param allow_diagonal: allow for diagonal movement
+    :param processes: number of workers, the number of cpu by default
+    :param chunksize: number of queries sent to a worker at once
+    :return: the results in the order they are solved, index give the position of the query
+    """
+    cells = grid.grid.size
+    memory = SharedMemory(create=True, size=2 * cells)
+    try:
+        shared = np.ndarray((2, grid.rows, grid.columns), dtype=np.uint8, buffer=memory.buf)
+        shared[0] = grid.grid
+        shared[1] = grid.neighbors
+        del shared
+        with Pool(processes=processes, initializer=_attach,
+                  initargs=(memory.name, grid.rows, grid.columns, heuristic, allow_diagonal)) as pool:
+            yield from pool.imap_unordered(_solve, enumerate(queries), chunksize=chunksize)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _attach(name: str, rows: int, columns: int,
+            heuristic: Callable[[Location], Callable[[Location], float]], allow_diagonal: bool):
+    memory = SharedMemory(name=name)
+    shared = np.ndarray((2, rows, columns), dtype=np.uint8, buffer=memory.buf)
+    _worker["memory"] = memory
+    grid = Grid.from_array(grid=shared[0], neighbors=shared[1])
+    _worker["engine"] = FlatAStar(grid)
+    _worker["components"] = ComponentIndex(grid=grid)
+    _worker["heuristic"] = heuristic
+    _worker["fields"] = FieldCache(rows=rows, columns=columns)
+    _worker["allow_diagonal"] = allow_diagonal
+
+
+def _solve(query: Tuple[int, Tuple[Location, Location]]) -> BatchResult:
+    index, (start, goal) = query
+    engine: FlatAStar = _worker["engine"]
+    fields: FieldCache = _worker["fields"]
+    t1 = time.perf_counter()
+    components: ComponentIndex = _worker["components"]
+    if not components.connected(start=start, goal=goal, allow_diagonal=_worker["allow_diagonal"]):
+        return BatchResult(index=index, start=start, goal=goal, path=None, time=time.perf_counter() - t1)
+    field = fields.get(heuristic=_worker["heuristic"], goal=goal)
+    heuristic = field.item if field is not None else _worker["heuristic"](goal)
+    path = engine.search(start=start, goal=goal, heuristic=heuristic, allow_diagonal=_worker["allow_diagonal"],
+                         field=field)
+    return BatchResult(index=index, start=start, goal=goal, path=path, time=time.perf_counter() - t1)
@@ -0,0 +1,112 @@
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable, Dict, List, Tuple, Union
+
+from a_star_core.engine import SearchEngine
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+
+class BidirectionalAStar(SearchEngine):
+    """
+    A* which search from the start toward the goal and from the goal toward the start at the
+    same time, expanding the side with the smaller frontier. Every time one side reach a location
+    already reached by the other side, the path through it is a candidate.
+    The search stop when the lowest f of one of the frontiers is not lower than the best candidate:
+    with a consistent heuristic no path through the rest of that frontier can be shorter
+    """
+
+    def __init__(self, heuristic: Callable[[Location], Callable[[Location], float]],
+                 successor: Callable[[Location, bool], List[Location]],
+                 start: Location, goal: Location,
+                 allow_diagonal: bool,
+                 observer: Union[SearchObserver, None] = None):
+        """
+        :param heuristic: heuristic factory, like manhattan_distance, it is built for both ends
+        :param successor: the moves are reversible, so the same successor is used by both sides
+        """
+        super().__init__(observer=observer)
+        self._heuristic = heuristic
+        self._successor = successor
+        self._start = start
+        self._goal = goal
+        self._allow_diagonal = allow_diagonal
+
+    def start(self):
+        self._timed_search(self._search)
+
+    def _search(self) -> List[Location]:
+        forward = _Side(root=self._start, heuristic=self._heuristic(self._goal))
+        backward = _Side(root=self._goal, heuristic=self._heuristic(self._start))
+        best: float = 0 if self._start == self._goal else float("inf")
+        meeting: Union[Location, None] = self._start if self._start == self._goal else None
+        observer = self._observer
+        self._expanded = 0
+        # both frontiers together
+        self._peak_frontier = 2
+        while True:
+            self._peak_frontier = max(self._peak_frontier, len(forward.frontier) + len(backward.frontier))
+            forward_f, backward_f = forward.top(), backward.top()
+            if forward_f >= best or backward_f >= best:
+                break
+            is_forward = len(forward.frontier) <= len(backward.frontier)
+            side, other = (forward, backward) if is_forward else (backward, forward)
+            location = side.pop()
+            self._expanded += 1
+            if observer:
+                if is_forward:
+                    observer.on_expand(location)
+                else:
+                    observer.on_expand_backward(location)
+            new_cost = side.cost[location] + 1
+            for child in self._successor(location, self._allow_diagonal):
+                if side.push(location=child, parent=location, cost=new_cost) and child in other.cost:
+                    candidate = new_cost + other.cost[child]
+                    if candidate < best:
+                        best, meeting = candidate, child
+        if meeting is None:
+            return []
+        return forward.path_to(meeting) + backward.path_to(meeting)[::-1][1:]
+
+
+class _Side:
+    """
+    State of the search from one end
+    """
+
+    def __init__(self, root: Location, heuristic: Callable[[Location], float]):
+        self._heuristic = heuristic
+        self._counter = count()
+        self.cost: Dict[Location, int] = {root: 0}
+        self.parent: Dict[Location, Location] = {}
+        h = heuristic(root)
+        self.frontier: List[Tuple[float, float, int, int, Location]] = [(h, h, next(self._counter), 0, root)]
+
+    def top(self) -> float:
+        """
+        Drop the entries outdated by a lower cost
+        :return: the lowest f of the frontier, infinity if it is empty
+        """
+        frontier = self.frontier
+        while frontier and frontier[0][3] != self.cost[frontier[0][4]]:
+            heappop(frontier)
+        return frontier[0][0] if frontier else float("inf")
+
+    def pop(self) -> Location:
+        return heappop(self.frontier)[4]
+
+    def push(self, location: Location, parent: Location, cost: int) -> bool:
+        if location in self.cost and self.cost[location] <= cost:
+            return False
+        self.cost[location] = cost
+        self.parent[location] = parent
+        h = self._heuristic(location)
+        heappush(self.frontier, (cost + h, h, next(self._counter), cost, location))
+        return True
+
+    def path_to(self, location: Location) -> List[Location]:
+        path: List[Location] = [location]
+        while location in self.parent:
+            location = self.parent[location]
+            path.append(location)
+        return path[::-1]
@@ -0,0 +1,198 @@
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from a_star_core.engine import SearchEngine
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+# (distance, frontier and cells not reached yet in the window of the step)
+Checkpoint = Tuple[int, np.ndarray, np.ndarray]
+
+
+def _bit_count(words: np.ndarray) -> int:
+    # numpy 2 count the bits of the words directly, the older versions count the unpacked bits
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).sum())
+
+
+class BitsetBFS(SearchEngine):
+    """
+    Breadth first search for the shortest path of the uniform cost grid (every move cost 1).
+    Every row of the maze is an array of 64 bits words, one bit per cell, so one step of the search
+    expand the whole frontier at once with a few shifts and masks, 64 cells per operation.
+    A step only work on the rows and words of the previous frontier, with one more row and word on each
+    side, so a step cost the bounding box of its frontier, not the area its distance from the start can
+    reach: a narrow frontier stay cheap in a large maze, a wide one cost about as much as bfs_distances.
+    Only some frontiers are kept during the search (one every `checkpoint` steps, only the window of
+    their step), the path is recovered from the goal by replaying the steps after a kept frontier
+    and moving back to a cell of the previous frontier
+    """
+
+    def __init__(self, passable: np.ndarray, observer: Union[SearchObserver, None] = None, checkpoint: int = 64):
+        """
+        :param passable: boolean array of the passable cells of the maze
+        :param observer: receive the cells of every frontier and the final path
+        :param checkpoint: number of steps between two kept frontiers
+        """
+        super().__init__(observer=observer)
+        rows, columns = passable.shape
+        words = (columns + 63) // 64
+        self._rows, self._columns, self._words = rows, columns, words
+        # one empty row above and below and one empty word on each side, so the shifts never check the bounds
+        bits = np.zeros((rows + 2, (words + 2) * 64), dtype=bool)
+        bits[1:-1, 64:64 + columns] = passable
+        self._passable: np.ndarray = np.packbits(bits, axis=1, bitorder="little").view("<u8")
+        self._checkpoint = checkpoint
+
+    def search(self, start: Location, goal: Location, allow_diagonal: bool) -> Union[List[Location], None]:
+        return self._timed_search(lambda: self._search(start=start, goal=goal, allow_diagonal=allow_diagonal))
+
+    def _search(self, start: Location, goal: Location, allow_diagonal: bool) -> Union[List[Location], None]:
+        frontier = np.zeros_like(self._passable)
+        self._set(frontier, start)
+        # the passable cells not reached yet
+        remaining = self._passable.copy()
+        self._clear(remaining, start)
+        following = np.zeros_like(frontier)
+        distance = 0
+        word = start.column // 64 + 1
+        # the window of every step, the bits of a frontier are all in the window of its step
+        windows: List[Tuple[slice, slice]] = [np.s_[start.row + 1:start.row + 2, word:word + 1]]
+        window = windows[0]
+        # (distance, frontier, remaining) in the window of the step, every `checkpoint` steps, the search can be
+        # replayed from them: the cells reached before and next to the following frontiers are in that window
+        checkpoints: List[Checkpoint] = [(0, frontier[window].copy(), remaining[window].copy())]
+        self._expanded = 0
+        self._peak_frontier = 1
+        while not self._test(frontier, goal):
+            self._expanded += _bit_count(frontier[window])
+            self._notify(frontier[window], window=window)
+            distance += 1
+            if distance > 1:
+                # the frontier before the previous one is erased in its own window, it may not be in the new one
+                following[windows[-2]] = 0
+            window = self._around(frontier[window], window)
+            windows.append(window)
+            following[window] = self._grow(frontier, window=window, allow_diagonal=allow_diagonal)
+            following[window] &= remaining[window]
+            if not following[window].any():
+                return None
+            remaining[window] ^= following[window]
+            frontier, following = following, frontier
+            self._peak_frontier = max(self._peak_frontier, _bit_count(frontier[window]))
+            if distance % self._checkpoint == 0:
+                checkpoints.append((distance, frontier[window].copy(), remaining[window].copy()))
+        return self._backtrack(goal=goal, distance=distance, windows=windows, checkpoints=checkpoints,
+                               allow_diagonal=allow_diagonal)
+
+    def _around(self, frontier: np.ndarray, window: Tuple[slice, slice]) -> Tuple[slice, slice]:
+        # rows and words of the set bits of the frontier in its window, with one more row and word on each side,
+        # in the padded array: the next frontier is next to this one
+        rows, words = window
+        used_rows = np.flatnonzero(frontier.any(axis=1))
+        used_words = np.flatnonzero(frontier.any(axis=0))
+        first_row = max(rows.start + int(used_rows[0]) - 1, 1)
+        last_row = min(rows.start + int(used_rows[-1]) + 1, self._rows)
+        first_word = max(words.start + int(used_words[0]) - 1, 1)
+        last_word = min(words.start + int(used_words[-1]) + 1, self._words)
+        return np.s_[first_row:last_row + 1, first_word:last_word + 1]
+
+    @staticmethod
+    def _grow(frontier: np.ndarray, window: Tuple[slice, slice], allow_diagonal: bool) -> np.ndarray:
+        # the cells next to the frontier in the window, read with one more row and word around it
+        rows, words = window
+        around = frontier[rows.start - 1:rows.stop + 1, words.start - 1:words.stop + 1]
+        middle = around[:, 1:-1]
+        # a bit moved out of its word is carried to the next word
+        right = (middle << np.uint64(1)) | (around[:, :-2] >> np.uint64(63))
+        left = (middle >> np.uint64(1)) | (around[:, 2:] << np.uint64(63))
+        if allow_diagonal:
+            row = middle | right | left
+            return row[1:-1] | row[:-2] | row[2:]
+        return right[1:-1] | left[1:-1] | middle[:-2] | middle[2:]
+
+    def _backtrack(self, goal: Location, distance: int, windows: List[Tuple[slice, slice]],
+                   checkpoints: List[Checkpoint], allow_diagonal: bool) -> List[Location]:
+        moves = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+        if allow_diagonal:
+            moves += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+        location = goal
+        path: List[Location] = [goal]
+        # the checkpoints from the last one, each replay give the frontiers up to the next checkpoint
+        for checkpoint_distance, frontier, remaining in reversed(checkpoints):
+            if checkpoint_distance >= distance:
+                # the checkpoint of the goal step, or after it
+                continue
+            # the replay work on the windows of its steps, with one more row and word around them
+            replayed = windows[checkpoint_distance:distance]
+            top = min(rows.start for rows, _ in replayed) - 1
+            bottom = max(rows.stop for rows, _ in replayed) + 1
+            first_word = min(words.start for _, words in replayed) - 1
+            last_word = max(words.stop for _, words in replayed) + 1
+            area = np.s_[top:bottom, first_word:last_word]
+            current = np.zeros_like(self._passable[area])
+            following = np.zeros_like(current)
+            unreached = self._passable[area].copy()
+            window = windows[checkpoint_distance]
+            current[self._shift(window, top, first_word)] = frontier
+            unreached[self._shift(window, top, first_word)] = remaining
+            # (window, frontier in the window) of every step of the replay
+            frontiers: List[Tuple[Tuple[slice, slice], np.ndarray]] = [(window, frontier)]
+            for step in range(checkpoint_distance + 1, distance):
+                window = windows[step]
+                local = self._shift(window, top, first_word)
+                if step > checkpoint_distance + 1:
+                    following[self._shift(windows[step - 2], top, first_word)] = 0
+                grown = self._grow(current, window=local, allow_diagonal=allow_diagonal) & unreached[local]
+                unreached[local] ^= grown
+                following[local] = grown
+                current, following = following, current
+                frontiers.append((window, grown))
+            for window, frontier in reversed(frontiers):
+                # a neighbor in the previous frontier, the straight moves first
+                for d_row, d_column in moves:
+                    neighbor = Location(location.row + d_row, location.column + d_column)
+                    if 0 <= neighbor.row < self._rows and 0 <= neighbor.column < self._columns \
+                            and self._test_window(frontier, window, neighbor):
+                        location = neighbor
+                        break
+                path.append(location)
+            distance = checkpoint_distance
+        return path[::-1]
+
+    @staticmethod
+    def _shift(window: Tuple[slice, slice], top: int, first_word: int) -> Tuple[slice, slice]:
+        # the window in an array which start at the row top and the word first_word of the padded array
+        rows, words = window
+        return np.s_[rows.start - top:rows.stop - top, words.start - first_word:words.stop - first_word]
+
+    def _notify(self, frontier: np.ndarray, window: Tuple[slice, slice]):
+        if not self._observer:
+            return
+        rows, words = window
+        bits = np.unpackbits(np.ascontiguousarray(frontier).view(np.uint8), axis=1, bitorder="little")
+        for row, column in np.argwhere(bits).tolist():
+            self._observer.on_expand(Location(row + rows.start - 1, column + (words.start - 1) * 64))
+
+    @staticmethod
+    def _test(bits: np.ndarray, location: Location) -> bool:
+        return int(bits[location.row + 1, location.column // 64 + 1]) >> (location.column % 64) & 1 == 1
+
+    @staticmethod
+    def _test_window(bits: np.ndarray, window: Tuple[slice, slice], location: Location) -> bool:
+        # the bits of the window only, the cells outside of it are not set
+        rows, words = window
+        row, word = location.row + 1 - rows.start, location.column // 64 + 1 - words.start
+        if not (0 <= row < bits.shape[0] and 0 <= word < bits.shape[1]):
+            return False
+        return int(bits[row, word]) >> (location.column % 64) & 1 == 1
+
+    @staticmethod
+    def _set(bits: np.ndarray, location: Location):
+        bits[location.row + 1, location.column // 64 + 1] |= np.uint64(1 << (location.column % 64))
+
+    @staticmethod
+    def _clear(bits: np.ndarray, location: Location):
+        bits[location.row + 1, location.column // 64 + 1] &= ~np.uint64(1 << (location.column % 64))
@@ -0,0 +1,252 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Set, Tuple, Union
+
+import numpy as np
+
+from a_star_core.grid import DIRECTIONS, Grid, BLOCK
+from a_star_core.utils import Location
+
+
+def label_components(passable: np.ndarray, allow_diagonal: bool) -> np.ndarray:
+    """
+    Label the connected parts of the passable cells, with the edges between neighbors handled all at once:
+    every label is hooked to the lowest label of its neighbors, then the labels jump to their root,
+    until no edge join two labels
+    :return: int64 array, the label of the part of every passable cell, -1 for the blocked cells
+    """
+    rows, columns = passable.shape
+    # the passable cells are numbered from 0, the edges are pairs of these numbers
+    numbers = np.full((rows, columns), -1, dtype=np.int64)
+    count = int(passable.sum())
+    numbers[passable] = np.arange(count)
+    pairs = [(np.s_[:, :-1], np.s_[:, 1:]), (np.s_[:-1, :], np.s_[1:, :])]
+    if allow_diagonal:
+        pairs += [(np.s_[:-1, :-1], np.s_[1:, 1:]), (np.s_[:-1, 1:], np.s_[1:, :-1])]
+    first, second = [], []
+    for one, other in pairs:
+        both = passable[one] & passable[other]
+        first.append(numbers[one][both])
+        second.append(numbers[other][both])
+    first, second = np.concatenate(first), np.concatenate(second)
+    labels = np.arange(count)
+    while True:
+        first_labels, second_labels = labels[first], labels[second]
+        apart = first_labels != second_labels
+        if not apart.any():
+            break
+        # the edges inside a part never join anything again
+        first, second = first[apart], second[apart]
+        first_labels, second_labels = first_labels[apart], second_labels[apart]
+        labels[np.maximum(first_labels, second_labels)] = np.minimum(first_labels, second_labels)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    result = np.full((rows, columns), -1, dtype=np.int64)
+    result[passable] = labels
+    return result
+
+
+class ComponentIndex:
+    """
+    Connected parts of the maze, for 4 and 8 connectivity, so a goal in another part is rejected
+    before any search. The labels are computed at the first query, then kept up to date with the maze:
+    a cell which become passable join the parts around it (union find on the labels), a cell which become
+    blocked may split its part, which is checked at the next query that need it: a search from every neighbor
+    of the blocked cells, run in turns, stop as soon as the searches all meet, and the pieces they close off
+    get new labels. This cost the size of the pieces cut off, not of the maze, the whole maze is labeled again
+    only when they are large.
+    Two different parts are never joined by a block, so different labels always mean unreachable
+    """
+
+    def __init__(self, grid: Grid):
+        self._grid = grid
+        # per movement: the labels, the merged labels and the cells blocked since the labels were checked,
+        # each of them may have split its part
+        self._labels: Dict[bool, np.ndarray] = {}
+        self._merged: Dict[bool, Dict[int, int]] = {}
+        self._blocked: Dict[bool, List[Location]] = {}
+        # labels given to the cells which become passable, above the labels of label_components
+        self._next_label: int = grid.rows * grid.columns
+        grid.subscribe(self._on_change)
+
+    def close(self):
+        self._grid.unsubscribe(self._on_change)
+
+    def reachable(self, start: Location, goals: Iterable[Location], allow_diagonal: bool) -> bool:
+        """
+        :return: False if none of the goals can be reached from the start, in constant time for every goal
+            when no cell was blocked since the last check, else after the splits are checked
+        """
+        goals = list(goals)
+        if start in goals:
+            return True
+        joined = self._joined(start=start, goals=goals, allow_diagonal=allow_diagonal)
+        if joined and self._blocked[allow_diagonal]:
+            # a block may have split the part since it was labeled
+            self._check_splits(allow_diagonal)
+            joined = self._joined(start=start, goals=goals, allow_diagonal=allow_diagonal)
+        return joined
+
+    def connected(self, start: Location, goal: Location, allow_diagonal: bool) -> bool:
+        return self.reachable(start=start, goals=[goal], allow_diagonal=allow_diagonal)
+
+    def component(self, location: Location, allow_diagonal: bool) -> Union[int, None]:
+        """
+        :return: the label of the part of the location, None if it is blocked
+        """
+        self._labels_of(allow_diagonal)
+        self._check_splits(allow_diagonal)
+        labels = self._labels[allow_diagonal]
+        label = labels.item(location)
+        return self._find(label, allow_diagonal) if label >= 0 else None
+
+    def _joined(self, start: Location, goals: List[Location], allow_diagonal: bool) -> bool:
+        labels = self._labels_of(allow_diagonal)
+        starts = self._roots(start, labels=labels, allow_diagonal=allow_diagonal)
+        return any(labels.item(goal) >= 0 and self._find(labels.item(goal), allow_diagonal) in starts
+                   for goal in goals)
+
+    def _labels_of(self, allow_diagonal: bool) -> np.ndarray:
+        if allow_diagonal not in self._labels:
+            self._relabel(allow_diagonal)
+        return self._labels[allow_diagonal]
+
+    def _relabel(self, allow_diagonal: bool):
+        self._labels[allow_diagonal] = label_components(passable=self._grid.grid != BLOCK,
+                                                        allow_diagonal=allow_diagonal)
+        self._merged[allow_diagonal] = {}
+        self._blocked[allow_diagonal] = []
+
+    def _check_splits(self, allow_diagonal: bool):
+        blocked = self._blocked[allow_diagonal]
+        if not blocked:
+            return
+        labels = self._labels[allow_diagonal]
+        # the searches visit a few Python objects per cell, past this the labeling of the whole maze is faster
+        if not self._cut_pieces(blocked, labels=labels, allow_diagonal=allow_diagonal, budget=labels.size // 8):
+            self._relabel(allow_diagonal)
+            return
+        self._blocked[allow_diagonal] = []
+
+    def _cut_pieces(self, blocked: List[Location], labels: np.ndarray, allow_diagonal: bool, budget: int) -> bool:
+        """
+        Search from all the neighbors of the blocked cells in turns, the searches which meet are joined.
+        A search which run out of cells while others remain has closed off a piece, which get a new label.
+        The blocks are checked together, two of them can cut off a piece that none of them cut alone
+        :return: False if the budget of expanded cells was exceeded before the searches were done
+        """
+        rows, columns = labels.shape
+        directions = DIRECTIONS if allow_diagonal else DIRECTIONS[:4]
+        # search of every reached cell, and for every search the search it was joined to
+        owners: Dict[Tuple[int, int], int] = {}
+        joined: Dict[int, int] = {}
+        # the running searches: their queue and the cells they reached
+        searches: Dict[int, Tuple[Deque[Tuple[int, int]], List[Tuple[int, int]]]] = {}
+
+        def root(search: int) -> int:
+            while search in joined:
+                search = joined[search]
+            return search
+
+        for location in blocked:
+            if labels.item(location) >= 0:
+                # passable again, it joined the parts around it
+                continue
+            for d_row, d_column in directions:
+                cell = (location.row + d_row, location.column + d_column)
+                if 0 <= cell[0] < rows and 0 <= cell[1] < columns and labels.item(cell) >= 0 and cell not in owners:
+                    owners[cell] = len(searches)
+                    searches[len(searches)] = (deque([cell]), [cell])
+        while len(searches) > 1:
+            for search in list(searches):
+                if search not in searches:
+                    continue
+                queue, cells = searches[search]
+                if not queue:
+                    # a piece cut off from the others
+                    label = self._next_label
+                    self._next_label += 1
+                    for cell in cells:
+                        labels[cell] = label
+                    del searches[search]
+                    if len(searches) == 1:
+                        break
+                    continue
+                row, column = queue.popleft()
+                budget -= 1
+                for d_row, d_column in directions:
+                    cell = (row + d_row, column + d_column)
+                    if not (0 <= cell[0] < rows and 0 <= cell[1] < columns) or labels.item(cell) < 0:
+                        continue
+                    owner = owners.get(cell)
+                    if owner is None:
+                        owners[cell] = search
+                        queue.append(cell)
+                        cells.append(cell)
+                        continue
+                    other = root(owner)
+                    if other != search:
+                        # the two searches are in the same piece, the smaller one is moved into the larger one
+                        small, large = sorted((search, other), key=lambda index: len(searches[index][1]))
+                        searches[large][0].extend(searches[small][0])
+                        searches[large][1].extend(searches[small][1])
+                        joined[small] = large
+                        del searches[small]
+                        # the rest of the neighbors go to the joined search
+                        search = large
+                        queue, cells = searches[large]
+                if budget < 0:
+                    return False
+        return True
+
+    def _roots(self, location: Location, labels: np.ndarray, allow_diagonal: bool) -> Set[int]:
+        # the search can leave a blocked start, through its passable neighbors
+        label = labels.item(location)
+        if label >= 0:
+            return {self._find(label, allow_diagonal)}
+        return {self._find(neighbor, allow_diagonal)
+                for neighbor in self._neighbor_labels(location, labels, allow_diagonal)}
+
+    def _neighbor_labels(self, location: Location, labels: np.ndarray, allow_diagonal: bool) -> Set[int]:
+        rows, columns = labels.shape
+        found: Set[int] = set()
+        for d_row, d_column in DIRECTIONS if allow_diagonal else DIRECTIONS[:4]:
+            row, column = location.row + d_row, location.column + d_column
+            if 0 <= row < rows and 0 <= column < columns and labels.item(row, column) >= 0:
+                found.add(labels.item(row, column))
+        return found
+
+    def _find(self, label: int, allow_diagonal: bool) -> int:
+        merged = self._merged[allow_diagonal]
+        root = label
+        while root in merged:
+            root = merged[root]
+        # path compression, the next find is direct
+        while label != root:
+            merged[label], label = root, merged[label]
+        return root
+
+    def _on_change(self, location: Union[Location, None]):
+        if location is None:
+            # bulk change of the maze, labeled again at the next query
+            self._labels.clear()
+            return
+        passable = self._grid.grid[location.row, location.column] != BLOCK
+        for allow_diagonal, labels in self._labels.items():
+            if passable and labels.item(location) < 0:
+                roots = {self._find(label, allow_diagonal)
+                         for label in self._neighbor_labels(location, labels, allow_diagonal)}
+                if roots:
+                    label = min(roots)
+                    for root in roots:
+                        if root != label:
+                            self._merged[allow_diagonal][root] = label
+                else:
+                    label = self._next_label
+                    self._next_label += 1
+                labels[location.row, location.column] = label
+            elif not passable and labels.item(location) >= 0:
+                labels[location.row, location.column] = -1
+                self._blocked[allow_diagonal].append(location)
@@ -0,0 +1,171 @@
+from heapq import heappop, heappush
+from typing import Callable, Dict, List, Set, Tuple, Union
+
+from a_star_core.engine import SearchEngine
+from a_star_core.grid import Grid, BLOCK
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+INFINITY = float("inf")
+
+
+class DStarLite(SearchEngine):
+    """
+    Incremental planner (D* Lite): the search goes from the goal to the start and its state is kept
+    between the runs. The planner subscribe to the grid, so the cells blocked or freed after a run
+    are repaired on the next plan, only the part of the search tree which depend on them is expanded again.
+    The start can move without losing the search state, the goal is fixed
+    """
+
+    def __init__(self, grid: Grid, start: Location, goal: Location,
+                 heuristic: Callable[[Location], Callable[[Location], float]],
+                 allow_diagonal: bool, observer: Union[SearchObserver, None] = None):
+        """
+        :param heuristic: heuristic factory like manhattan_distance, the keys use the distance to the start
+        """
+        super().__init__(observer=observer)
+        self._grid = grid
+        self._start = start
+        self._goal = goal
+        self._heuristic = heuristic
+        self._allow_diagonal = allow_diagonal
+        # cells edited since the last plan, None if the whole grid changed
+        self._changed: Union[Set[Location], None] = set()
+        self._reset()
+        grid.subscribe(self._on_change)
+
+    @property
+    def goal(self) -> Location:
+        return self._goal
+
+    @property
+    def allow_diagonal(self) -> bool:
+        return self._allow_diagonal
+
+    @property
+    def heuristic(self) -> Callable[[Location], Callable[[Location], float]]:
+        return self._heuristic
+
+    @property
+    def observer(self) -> Union[SearchObserver, None]:
+        return self._observer
+
+    @observer.setter
+    def observer(self, observer: Union[SearchObserver, None]):
+        # every run can be shown by a new observer
+        self._observer = observer
+
+    def move_start(self, location: Location):
+        if location == self._start:
+            return
+        # the keys already in the queue are lower bound for the new start, km keep them valid
+        self._km += self._h(location)
+        self._start = location
+        self._h = self._heuristic(location)
+
+    def plan(self) -> Union[List[Location], None]:
+        def search() -> List[Location]:
+            self._repair()
+            self._compute_shortest_path()
+            return self._extract_path()
+
+        return self._timed_search(search)
+
+    def close(self):
+        self._grid.unsubscribe(self._on_change)
+
+    def _reset(self):
+        self._g: Dict[Location, float] = {}
+        self._rhs: Dict[Location, float] = {self._goal: 0}
+        self._km: float = 0
+        self._h: Callable[[Location], float] = self._heuristic(self._start)
+        self._queue: List[Tuple[float, float, Location]] = []
+        self._queued: Dict[Location, Tuple[float, float]] = {}
+        self._push(self._goal)
+
+    def _on_change(self, location: Union[Location, None]):
+        if location is None or self._changed is None:
+            self._changed = None
+        else:
+            self._changed.add(location)
+
+    def _repair(self):
+        if self._changed is None:
+            self._reset()
+        else:
+            for location in self._changed:
+                self._update_vertex(location)
+                for neighbor in self._grid.successor(location, self._allow_diagonal):
+                    self._update_vertex(neighbor)
+        self._changed = set()
+
+    def _compute_shortest_path(self):
+        g, rhs, queue, queued = self._g, self._rhs, self._queue, self._queued
+        observer = self._observer
+        self._expanded = 0
+        self._peak_frontier = len(queued)
+        while True:
+            self._peak_frontier = max(self._peak_frontier, len(queued))
+            # drop the entries which were removed or updated since they were pushed
+            while queue and queued.get(queue[0][2]) != queue[0][:2]:
+                heappop(queue)
+            start_key = self._key(self._start)
+            start_g, start_rhs = g.get(self._start, INFINITY), rhs.get(self._start, INFINITY)
+            if not queue or (queue[0][:2] >= start_key and start_g == start_rhs):
+                return
+            old_key = queue[0][:2]
+            location = queue[0][2]
+            new_key = self._key(location)
+            if old_key < new_key:
+                self._push(location)
+                continue
+            heappop(queue)
+            del queued[location]
+            self._expanded += 1
+            if observer:
+                observer.on_expand_backward(location)
+            location_g, location_rhs = g.get(location, INFINITY), rhs.get(location, INFINITY)
+            if location_g > location_rhs:
+                g[location] = location_rhs
+                for neighbor in self._neighbors(location):
+                    self._update_vertex(neighbor)
+            else:
+                g[location] = INFINITY
+                self._update_vertex(location)
+                for neighbor in self._neighbors(location):
+                    self._update_vertex(neighbor)
+
+    def _update_vertex(self, location: Location):
+        if location != self._goal:
+            g = self._g
+            self._rhs[location] = min((g.get(neighbor, INFINITY) for neighbor in self._neighbors(location)),
+                                      default=INFINITY) + 1
+        self._queued.pop(location, None)
+        if self._g.get(location, INFINITY) != self._rhs.get(location, INFINITY):
+            self._push(location)
+
+    def _neighbors(self, location: Location) -> List[Location]:
+        # a blocked cell has no edge
+        if self._grid.grid[location.row, location.column] == BLOCK:
+            return []
+        return self._grid.successor(location, self._allow_diagonal)
+
+    def _key(self, location: Location) -> Tuple[float, float]:
+        value = min(self._g.get(location, INFINITY), self._rhs.get(location, INFINITY))
+        return value + self._h(location) + self._km, value
+
+    def _push(self, location: Location):
+        key = self._key(location)
+        self._queued[location] = key
+        heappush(self._queue, (key[0], key[1], location))
+
+    def _extract_path(self) -> List[Location]:
+        g = self._g
+        if g.get(self._start, INFINITY) == INFINITY:
+            return []
+        path: List[Location] = [self._start]
+        location = self._start
+        while location != self._goal:
+            location = min(self._neighbors(location), key=lambda neighbor: g.get(neighbor, INFINITY))
+            path.append(location)
+        return path
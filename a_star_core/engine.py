@@ -0,0 +1,66 @@
+import time
+from typing import Callable, List, Union
+
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+
+class SearchEngine:
+    """
+    The result of a search engine: the path of the last search, its length, the search time,
+    the number of expanded locations and the peak size of the frontier.
+    The engines run their search through _timed_search, which keep the path and the time
+    """
+
+    def __init__(self, observer: Union[SearchObserver, None] = None):
+        """
+        :param observer: receive the expansions of the search and the final path
+        """
+        self._observer = observer
+        self._path: List[Location] = []
+        self._time: float = 0.0
+        self._len_of_path: int = 0
+        self._expanded: int = 0
+        self._peak_frontier: int = 0
+
+    def _timed_search(self, search: Callable[[], Union[List[Location], None]]) -> Union[List[Location], None]:
+        """
+        Run the search, flush the observer and send it the path.
+        The time spent by the observer during the search (rendering) is not part of the search time
+        :param search: return the path, an empty path or None if there is no path
+        :return: the path, None if there is no path
+        """
+        observer = self._observer
+        rendering = observer.elapsed if observer else 0.0
+        t1 = time.perf_counter()
+        try:
+            path = search()
+        finally:
+            if observer:
+                observer.flush()
+        self._path = path or []
+        self._len_of_path = len(self._path)
+        self._time = time.perf_counter() - t1 - ((observer.elapsed - rendering) if observer else 0.0)
+        if observer and path:
+            observer.on_path(self._path)
+        return path or None
+
+    @property
+    def time(self):
+        return self._time
+
+    @property
+    def len_of_path(self):
+        return self._len_of_path
+
+    @property
+    def path(self) -> List[Location]:
+        return self._path
+
+    @property
+    def expanded(self) -> int:
+        return self._expanded
+
+    @property
+    def peak_frontier(self) -> int:
+        return self._peak_frontier
@@ -0,0 +1,109 @@
+from array import array
+from heapq import heappop, heappush
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+
+from a_star_core.engine import SearchEngine
+from a_star_core.grid import Grid, DIAGONAL_OFFSETS, STRAIGHT_OFFSETS
+from a_star_core.utils import Location
+
+
+class FlatAStar(SearchEngine):
+    """
+    A* which keep the search state in flat arrays indexed by row * columns + column,
+    instead of Node chains and dictionaries keyed by Location.
+    The arrays are allocated once (12 bytes per cell) and reused by every search on the same grid:
+    every search get a new stamp, a cell is unseen if its state is older than the current stamp,
+    so the arrays never need to be cleared
+    """
+
+    def __init__(self, grid: Grid):
+        super().__init__()
+        self._grid = grid
+        self._columns: int = grid.columns
+        size = grid.rows * grid.columns
+        self._cost = array("i", bytes(4 * size))
+        self._parent = array("i", bytes(4 * size))
+        # 2 * stamp: reached in the current search, 2 * stamp + 1: closed in the current search
+        self._state = array("I", bytes(4 * size))
+        self._stamp: int = 0
+        # offset of the neighbors in the flat array, for every neighbor mask
+        self._straight_offsets: List[Tuple[int, ...]] = self._flat_offsets(STRAIGHT_OFFSETS)
+        self._diagonal_offsets: List[Tuple[int, ...]] = self._flat_offsets(DIAGONAL_OFFSETS)
+
+    def search(self, start: Location, goal: Location, heuristic: Callable[[Location], float],
+               allow_diagonal: bool, field: Union[np.ndarray, None] = None) -> Union[List[Location], None]:
+        """
+        :param field: the heuristic of every cell (see heuristic_field), read instead of calling heuristic
+        """
+        def search() -> List[Location]:
+            found = self._search(start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal,
+                                 field=field)
+            return self._path_to(start=start, goal=goal) if found else []
+
+        return self._timed_search(search)
+
+    def _search(self, start: Location, goal: Location, heuristic: Callable[[Location], float],
+                allow_diagonal: bool, field: Union[np.ndarray, None]) -> bool:
+        columns = self._columns
+        cost, parent, state = self._cost, self._parent, self._state
+        self._stamp += 1
+        reached, closed = 2 * self._stamp, 2 * self._stamp + 1
+        offsets = self._diagonal_offsets if allow_diagonal else self._straight_offsets
+        # live view on the neighbor masks of the grid
+        neighbors = memoryview(self._grid.neighbors).cast("B")
+        # flat view on the field, indexed like the other arrays
+        values = memoryview(np.ascontiguousarray(field).reshape(-1)) if field is not None else None
+
+        start_index = start.row * columns + start.column
+        goal_index = goal.row * columns + goal.column
+        cost[start_index] = 0
+        state[start_index] = reached
+        h = values[start_index] if values is not None else heuristic(start)
+        frontier: List[Tuple[float, float, int]] = [(h, h, start_index)]
+        expanded = 0
+        peak_frontier = 1
+        try:
+            while frontier:
+                if len(frontier) > peak_frontier:
+                    peak_frontier = len(frontier)
+                _, _, index = heappop(frontier)
+                if state[index] == closed:
+                    # lazy deletion, the location was already expanded with a lower cost
+                    continue
+                state[index] = closed
+                expanded += 1
+                if index == goal_index:
+                    return True
+                new_cost = cost[index] + 1
+                for offset in offsets[neighbors[index]]:
+                    child = index + offset
+                    if state[child] < reached or cost[child] > new_cost:
+                        cost[child] = new_cost
+                        parent[child] = index
+                        state[child] = reached
+                        h = values[child] if values is not None else heuristic(Location(*divmod(child, columns)))
+                        heappush(frontier, (new_cost + h, h, child))
+            return False
+        finally:
+            self._expanded = expanded
+            # the heap also count the outdated entries, which are skipped when they are popped
+            self._peak_frontier = peak_frontier
+            neighbors.release()
+            if values is not None:
+                values.release()
+
+    def _path_to(self, start: Location, goal: Location) -> List[Location]:
+        columns = self._columns
+        start_index = start.row * columns + start.column
+        index = goal.row * columns + goal.column
+        path: List[Location] = [goal]
+        while index != start_index:
+            index = self._parent[index]
+            path.append(Location(*divmod(index, columns)))
+        return path[::-1]
+
+    def _flat_offsets(self, offsets: List[Tuple[Tuple[int, int], ...]]) -> List[Tuple[int, ...]]:
+        return [tuple(d_row * self._columns + d_column for d_row, d_column in mask_offsets)
+                for mask_offsets in offsets]
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from a_star_core.grid import DIRECTIONS, Grid, BLOCK
+from a_star_core.landmarks import bfs_distances
+from a_star_core.utils import Location
+
+# direction of the goal and of the cells which can't reach it
+NO_DIRECTION: int = 255
+
+
+class FlowField:
+    """
+    Distance of every cell to one goal, and the direction of the next move toward it.
+    The field is built once with a breadth first wavefront from the goal, then the path of any start
+    only follow the directions, so many agents going to the same goal share the search
+    """
+
+    def __init__(self, goal: Location, distances: np.ndarray, directions: np.ndarray, allow_diagonal: bool):
+        """
+        :param distances: number of moves to the goal, the maximum of the dtype if the goal can't be reached
+        :param directions: index in DIRECTIONS of the next move, NO_DIRECTION for the goal and the unreachable cells
+        """
+        self._goal = goal
+        self._distances = distances
+        self._directions = directions
+        self._allow_diagonal = allow_diagonal
+        self._unreachable = np.iinfo(distances.dtype).max
+
+    @classmethod
+    def build(cls, grid: Grid, goal: Location, allow_diagonal: bool) -> "FlowField":
+        passable = grid.grid != BLOCK
+        if not passable[goal.row, goal.column]:
+            raise ValueError(f"the goal {goal} is blocked")
+        # every move can be made backward, so the distances from the goal are the distances to the goal
+        distances = bfs_distances(passable=passable, root=goal, allow_diagonal=allow_diagonal)
+        return cls(goal=goal, distances=distances, directions=cls._downhill(distances, allow_diagonal),
+                   allow_diagonal=allow_diagonal)
+
+    @staticmethod
+    def _downhill(distances: np.ndarray, allow_diagonal: bool) -> np.ndarray:
+        # the neighbor with the lowest distance, the straight moves are preferred on ties
+        rows, columns = distances.shape
+        unreachable = np.iinfo(distances.dtype).max
+        padded = np.full((rows + 2, columns + 2), unreachable, dtype=distances.dtype)
+        padded[1:-1, 1:-1] = distances
+        lowest = np.full((rows, columns), unreachable, dtype=distances.dtype)
+        directions = np.full((rows, columns), NO_DIRECTION, dtype=np.uint8)
+        for index, (d_row, d_column) in enumerate(DIRECTIONS if allow_diagonal else DIRECTIONS[:4]):
+            neighbor = padded[1 + d_row:rows + 1 + d_row, 1 + d_column:columns + 1 + d_column]
+            lower = neighbor < lowest
+            lowest[lower] = neighbor[lower]
+            directions[lower] = index
+        directions[(distances == 0) | (distances == unreachable)] = NO_DIRECTION
+        return directions
+
+    def path(self, start: Location) -> Union[List[Location], None]:
+        """
+        Follow the directions from the start, in O(length of the path)
+        :return: the path from the start to the goal, None if the goal can't be reached
+        """
+        if self.distance(start) is None:
+            return None
+        directions = self._directions
+        row, column = start
+        path: List[Location] = [start]
+        index = directions.item(row, column)
+        while index != NO_DIRECTION:
+            d_row, d_column = DIRECTIONS[index]
+            row, column = row + d_row, column + d_column
+            path.append(Location(row, column))
+            index = directions.item(row, column)
+        return path
+
+    def distance(self, location: Location) -> Union[int, None]:
+        """
+        :return: the number of moves to the goal, None if the goal can't be reached
+        """
+        distance = self._distances.item(location)
+        return distance if distance != self._unreachable else None
+
+    @property
+    def goal(self) -> Location:
+        return self._goal
+
+    @property
+    def allow_diagonal(self) -> bool:
+        return self._allow_diagonal
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self._distances
+
+    @property
+    def directions(self) -> np.ndarray:
+        return self._directions
+
+
+class FlowFieldCache:
+    """
+    Bounded cache of the flow fields of one grid, the least recently used field is evicted first.
+    The fields are keyed by the version of the grid, so any change of the maze invalidate them
+    """
+
+    def __init__(self, grid: Grid, maxsize: int = 16):
+        self._grid = grid
+        self._maxsize = maxsize
+        self._fields: "OrderedDict[Tuple[Location, bool], FlowField]" = OrderedDict()
+        self._version: int = grid.version
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def get(self, goal: Location, allow_diagonal: bool) -> FlowField:
+        """
+        :return: the field of the goal, built if it is not in the cache
+        """
+        version = self._grid.version
+        if version != self._version:
+            self._fields.clear()
+            self._version = version
+        key = (goal, allow_diagonal)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            self._hits += 1
+            return field
+        self._misses += 1
+        field = FlowField.build(grid=self._grid, goal=goal, allow_diagonal=allow_diagonal)
+        self._fields[key] = field
+        if len(self._fields) > self._maxsize:
+            self._fields.popitem(last=False)
+        return field
+
+    def path(self, start: Location, goal: Location, allow_diagonal: bool) -> Union[List[Location], None]:
+        return self.get(goal=goal, allow_diagonal=allow_diagonal).path(start)
+
+    def clear(self):
+        self._fields.clear()
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
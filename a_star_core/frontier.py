@@ -0,0 +1,172 @@
+from heapq import heappop, heappush
+from itertools import count
+from typing import Any, Dict, Hashable, List
+
+
+class Frontier:
+    """
+    Open list of the search. Every item is pushed with the key of its state (the location),
+    pushing a key which is already in the frontier replace the previous item.
+    Items are popped by the lowest f = cost + heuristic, ties are broken by the lowest heuristic
+    """
+
+    def push(self, key: Hashable, item: Any, cost: float, heuristic: float) -> None:
+        raise NotImplementedError
+
+    def pop(self) -> Any:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+
+class BinaryHeapFrontier(Frontier):
+    """
+    Binary heap of (f, h, counter) entries. A replaced item stays in the heap but is
+    flagged as removed, and it is skipped when it reaches the top (lazy deletion)
+    """
+    _REMOVED = object()
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._counter = count()
+
+    def push(self, key: Hashable, item: Any, cost: float, heuristic: float) -> None:
+        previous = self._entries.get(key)
+        if previous is not None:
+            previous[3] = self._REMOVED
+        entry = [cost + heuristic, heuristic, next(self._counter), item, key]
+        self._entries[key] = entry
+        heappush(self._heap, entry)
+
+    def pop(self) -> Any:
+        while self._heap:
+            entry = heappop(self._heap)
+            if entry[3] is not self._REMOVED:
+                del self._entries[entry[4]]
+                return entry[3]
+        raise IndexError("pop from an empty frontier")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BucketFrontier(Frontier):
+    """
+    Bucket (Dial) queue for integer f values, like the one produced by Manhattan and Chebyshev
+    distance with unit cost. Push and pop are O(1), items of the same f are popped last in
+    first out, which favor the deepest node instead of the heuristic tie breaking
+    """
+    _REMOVED = object()
+
+    def __init__(self):
+        self._buckets: List[List[list]] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._min: int = 0
+
+    def push(self, key: Hashable, item: Any, cost: float, heuristic: float) -> None:
+        f = cost + heuristic
+        index = int(f)
+        if index != f or index < 0:
+            raise ValueError(f"BucketFrontier needs non negative integer priority, got {f}")
+        previous = self._entries.get(key)
+        if previous is not None:
+            previous[0] = self._REMOVED
+        entry = [item, key]
+        self._entries[key] = entry
+        while len(self._buckets) <= index:
+            self._buckets.append([])
+        self._buckets[index].append(entry)
+        if index < self._min:
+            self._min = index
+
+    def pop(self) -> Any:
+        buckets = self._buckets
+        while self._entries:
+            bucket = buckets[self._min]
+            while bucket:
+                entry = bucket.pop()
+                if entry[0] is not self._REMOVED:
+                    del self._entries[entry[1]]
+                    return entry[0]
+            self._min += 1
+        raise IndexError("pop from an empty frontier")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IndexedHeapFrontier(Frontier):
+    """
+    Binary heap which keep the position of every key, so pushing a key again update its
+    entry in place (decrease-key) instead of adding a duplicate
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._counter = count()
+
+    def push(self, key: Hashable, item: Any, cost: float, heuristic: float) -> None:
+        entry = [cost + heuristic, heuristic, next(self._counter), item, key]
+        position = self._positions.get(key)
+        if position is None:
+            self._heap.append(entry)
+            self._sift_up(len(self._heap) - 1)
+            return
+        previous = self._heap[position]
+        self._heap[position] = entry
+        if entry < previous:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def pop(self) -> Any:
+        if not self._heap:
+            raise IndexError("pop from an empty frontier")
+        top = self._heap[0]
+        last = self._heap.pop()
+        del self._positions[top[4]]
+        if self._heap:
+            self._heap[0] = last
+            self._sift_down(0)
+        return top[3]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _sift_up(self, position: int):
+        heap, positions = self._heap, self._positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[position] = heap[parent]
+            positions[heap[position][4]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[4]] = position
+
+    def _sift_down(self, position: int):
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[position] = heap[child]
+            positions[heap[position][4]] = position
+            position = child
+        heap[position] = entry
+        positions[entry[4]] = position
@@ -0,0 +1,267 @@
+from typing import Callable, List, Set, Tuple, Union
+
+import numpy as np
+
+from a_star_core.utils import Location
+
+# State of every cell in the grid, stored as one byte per cell
+EMPTY: int = 0
+BLOCK: int = 1
+START: int = 2
+GOAL: int = 3
+EXPLORE: int = 4
+PATH: int = 5
+EXPLORE_BACKWARD: int = 6
+
+# The order of the neighbors returned by successor, the first four are the straight moves.
+# Bit i of the neighbor mask of a cell is set if the neighbor in DIRECTIONS[i] is passable
+DIRECTIONS: List[Tuple[int, int]] = [(0, -1), (1, 0), (0, 1), (-1, 0),
+                                     (1, -1), (1, 1), (-1, 1), (-1, -1)]
+STRAIGHT: int = 0b00001111
+# for every mask the offsets of its neighbors, so successor is a table read
+DIAGONAL_OFFSETS: List[Tuple[Tuple[int, int], ...]] = [
+    tuple(direction for bit, direction in enumerate(DIRECTIONS) if mask >> bit & 1) for mask in range(256)]
+STRAIGHT_OFFSETS: List[Tuple[Tuple[int, int], ...]] = [DIAGONAL_OFFSETS[mask & STRAIGHT] for mask in range(256)]
+
+
+def neighbor_masks(passable: np.ndarray) -> np.ndarray:
+    """
+    Compute the neighbor mask of every cell, the cells outside the grid are not passable
+    :param passable: boolean array of the passable cells
+    :return: uint8 array with the same shape
+    """
+    rows, columns = passable.shape
+    padded = np.zeros((rows + 2, columns + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = passable
+    masks = np.zeros((rows, columns), dtype=np.uint8)
+    for bit, (d_row, d_column) in enumerate(DIRECTIONS):
+        masks |= padded[1 + d_row:rows + 1 + d_row, 1 + d_column:columns + 1 + d_column] << bit
+    return masks
+
+
+class Grid:
+    """
+    Occupancy grid of the maze, backed by a uint8 numpy array.
+    The grid doesn't know anything about pygame, so it can be used by the headless search
+    """
+
+    def __init__(self, rows: int, columns: int):
+        self._rows: int = rows
+        self._columns: int = columns
+        self._start: Union[Location, None] = None
+        self._goal: Union[Location, None] = None
+        # more goals, the search stop at the first goal it reach
+        self._more_goals: Set[Location] = set()
+        self._grid: np.ndarray = np.zeros((rows, columns), dtype=np.uint8)
+        self._neighbors: np.ndarray = neighbor_masks(self._grid != BLOCK)
+        self._listeners: List[Callable[[Union[Location, None]], None]] = []
+        # bumped by every change of the maze, a search result is valid as long as the version is the same
+        self._version: int = 0
+
+    @classmethod
+    def from_array(cls, grid: np.ndarray, neighbors: Union[np.ndarray, None] = None) -> "Grid":
+        """
+        Create a grid over an existing state array without copying it (e.g. an array in shared memory)
+        :param grid: uint8 array of the cell states
+        :param neighbors: the neighbor masks of the grid, computed if they are not given
+        :return: Grid
+        """
+        instance = cls.__new__(cls)
+        instance._rows, instance._columns = grid.shape
+        instance._grid = grid
+        instance._neighbors = neighbors if neighbors is not None else neighbor_masks(grid != BLOCK)
+        instance._listeners = []
+        instance._version = 0
+        starts, goals = np.argwhere(grid == START), np.argwhere(grid == GOAL)
+        instance._start = Location(*starts[0].tolist()) if len(starts) else None
+        instance._goal = Location(*goals[0].tolist()) if len(goals) else None
+        instance._more_goals = {Location(*goal) for goal in goals[1:].tolist()}
+        return instance
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @property
+    def grid(self) -> np.ndarray:
+        return self._grid
+
+    @property
+    def neighbors(self) -> np.ndarray:
+        return self._neighbors
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def subscribe(self, listener: Callable[[Union[Location, None]], None]) -> None:
+        """
+        The listener is called with every cell which become passable or blocked,
+        or with None when many cells changed at once (erase_maze, fill_random)
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Union[Location, None]], None]) -> None:
+        self._listeners.remove(listener)
+
+    def check_goal(self, location: Location) -> bool:
+        return self._goal == location or location in self._more_goals
+
+    def successor(self, location: Location, allow_diagonal=False) -> List[Location]:
+        # the order: Top, Right, Bottom, Left, then the diagonals
+        offsets = DIAGONAL_OFFSETS if allow_diagonal else STRAIGHT_OFFSETS
+        row, column = location
+        return [Location(row + d_row, column + d_column)
+                for d_row, d_column in offsets[self._neighbors.item(row, column)]]
+
+    def mark(self, location: Location, state: int) -> None:
+        value = self._grid[location.row, location.column]
+        if value != START and value != GOAL:
+            self._grid[location.row, location.column] = state
+            if value == BLOCK or state == BLOCK:
+                self._update_neighbors(location=location)
+
+    @property
+    def start(self) -> Location:
+        return self._start
+
+    @start.setter
+    def start(self, location: Location):
+        # Check the boundary before assign
+        if not self._check_boundary(location=location):
+            return
+        # the previous start is tracked, so there is no need to look for it in the grid
+        self._reset_cell(location=self._start, state=START)
+        self._start = location
+        self._more_goals.discard(location)
+        self._set_cell(location=location, state=START)
+        self._version += 1
+
+    @property
+    def goal(self) -> Location:
+        return self._goal
+
+    @goal.setter
+    def goal(self, location: Location):
+        # check for boundary before assign
+        if not self._check_boundary(location=location):
+            return
+        self._reset_cell(location=self._goal, state=GOAL)
+        self._goal = location
+        self._more_goals.discard(location)
+        self._set_cell(location=location, state=GOAL)
+        self._version += 1
+
+    @property
+    def goals(self) -> List[Location]:
+        """
+        The goal, then the goals added by add_goal
+        """
+        goals = [self._goal] if self._goal is not None else []
+        return goals + sorted(self._more_goals)
+
+    def add_goal(self, location: Location):
+        # the start and the goal stay as they are
+        if not self._check_boundary(location=location):
+            return
+        if self._grid[location.row, location.column] in (START, GOAL):
+            return
+        self._more_goals.add(location)
+        self._set_cell(location=location, state=GOAL)
+        self._version += 1
+
+    def remove_goal(self, location: Location) -> bool:
+        """
+        Remove a goal added by add_goal
+        :return: False if the location is not one of these goals
+        """
+        if location not in self._more_goals:
+            return False
+        self._more_goals.discard(location)
+        self._reset_cell(location=location, state=GOAL)
+        self._version += 1
+        return True
+
+    def block(self, location: Location, to: int = BLOCK):
+        # check for boundary before assign
+        if not self._check_boundary(location=location):
+            return
+        value = self._grid[location.row, location.column]
+        if (value == EMPTY or value == BLOCK) and value != to:
+            self._set_cell(location=location, state=to)
+
+    def erase_maze(self):
+        blocked = self._grid == BLOCK
+        # the goals are erased with the blocks, a maze without any block still change
+        erased = bool(self._more_goals) or bool((self._grid != EMPTY).any())
+        self._grid.fill(EMPTY)
+        self._more_goals.clear()
+        self._update_neighbor_bits(changed=blocked, passable=True)
+        if erased:
+            self._changed(location=None)
+
+    def clear_maze(self):
+        self._change_location_state(from_states=(EXPLORE, EXPLORE_BACKWARD, PATH), to=EMPTY)
+
+    def fill_random(self, spread: float = 0.2, seed: Union[int, None] = None):
+        # the same seed always give the same maze
+        random = np.random.default_rng(seed)
+        random_block = (self._grid == EMPTY) & (random.random(self._grid.shape) < spread)
+        self._grid[random_block] = BLOCK
+        self._update_neighbor_bits(changed=random_block, passable=False)
+        if random_block.any():
+            self._changed(location=None)
+
+    def _change_location_state(self, from_states: Tuple[int, ...], to: int):
+        self._grid[np.isin(self._grid, from_states)] = to
+
+    def _set_cell(self, location: Location, state: int):
+        blocked = self._grid[location.row, location.column] == BLOCK
+        self._grid[location.row, location.column] = state
+        if blocked != (state == BLOCK):
+            self._update_neighbors(location=location)
+
+    def _update_neighbors(self, location: Location):
+        # only the cells around the location have it as a neighbor
+        passable = self._grid[location.row, location.column] != BLOCK
+        for bit, (d_row, d_column) in enumerate(DIRECTIONS):
+            row, column = location.row - d_row, location.column - d_column
+            if 0 <= row < self._rows and 0 <= column < self._columns:
+                if passable:
+                    self._neighbors[row, column] |= 1 << bit
+                else:
+                    self._neighbors[row, column] &= 0xFF ^ (1 << bit)
+        self._changed(location=location)
+
+    def _update_neighbor_bits(self, changed: np.ndarray, passable: bool):
+        # set or clear the bits of the changed cells in the masks of the cells around them
+        if not changed.any():
+            return
+        padded = np.zeros((self._rows + 2, self._columns + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = changed
+        for bit, (d_row, d_column) in enumerate(DIRECTIONS):
+            bits = padded[1 + d_row:self._rows + 1 + d_row, 1 + d_column:self._columns + 1 + d_column] << bit
+            if passable:
+                self._neighbors |= bits
+            else:
+                self._neighbors &= ~bits
+
+    def _changed(self, location: Union[Location, None]):
+        # a new version of the maze, the listeners get the changed cell or None for many cells
+        self._version += 1
+        for listener in self._listeners:
+            listener(location)
+
+    def _reset_cell(self, location: Union[Location, None], state: int):
+        # empty the cell, only if it still hold the given state
+        if location is not None and self._grid[location.row, location.column] == state:
+            self._grid[location.row, location.column] = EMPTY
+
+    def _check_boundary(self, location: Location):
+        if 0 <= location.row < self._rows and 0 <= location.column < self._columns:
+            return True
+        return False
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple, Union
+
+import numpy as np
+
+from a_star_core.utils import Location, manhattan_distance, euclidean_distance, chebyshev_distance
+
+
+def _manhattan_field(d_row: np.ndarray, d_column: np.ndarray) -> np.ndarray:
+    return d_row + d_column
+
+
+def _euclidean_field(d_row: np.ndarray, d_column: np.ndarray) -> np.ndarray:
+    # the squares are exact, so the values are equal to the ones of euclidean_distance
+    return np.sqrt(d_row.astype(np.float64) ** 2 + d_column.astype(np.float64) ** 2)
+
+
+def _chebyshev_field(d_row: np.ndarray, d_column: np.ndarray) -> np.ndarray:
+    return np.maximum(d_row, d_column)
+
+
+# vectorized form of the heuristic functions of utils, from the distances to the goal on both axes
+VECTORIZED: Dict[Callable, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    manhattan_distance: _manhattan_field,
+    euclidean_distance: _euclidean_field,
+    chebyshev_distance: _chebyshev_field,
+}
+
+
+def heuristic_field(heuristic: Callable[[Location], Callable[[Location], float]], goal: Location,
+                    rows: int, columns: int) -> Union[np.ndarray, None]:
+    """
+    Compute the heuristic of every cell of the grid at once
+    :param heuristic: a heuristic factory of utils, or a factory with a field method like LandmarkTable
+    :return: array rows x columns, None if the heuristic has no vectorized form
+    """
+    vectorized = VECTORIZED.get(heuristic)
+    if vectorized is not None:
+        d_row = np.abs(np.arange(rows, dtype=np.int32) - goal.row)[:, None]
+        d_column = np.abs(np.arange(columns, dtype=np.int32) - goal.column)[None, :]
+        return np.ascontiguousarray(np.broadcast_to(vectorized(d_row, d_column), (rows, columns)))
+    field = getattr(heuristic, "field", None)
+    if field is not None:
+        return field(goal)
+    return None
+
+
+class FieldCache:
+    """
+    Heuristic fields of one grid keyed by heuristic and goal, the least recently used field is evicted first.
+    A field cost one pass over the grid, then every heuristic of the search is an array read,
+    so it pays off when the same goal is searched again or the search explore a large part of the grid.
+    The geometric fields don't depend on the blocks, they stay valid when the maze change
+    """
+
+    def __init__(self, rows: int, columns: int, max_bytes: int = 256 * 2 ** 20):
+        """
+        :param max_bytes: the fields are evicted above this size, a bigger field is computed but not kept
+        """
+        self._rows = rows
+        self._columns = columns
+        self._max_bytes = max_bytes
+        self._fields: "OrderedDict[Tuple[Callable, Location], np.ndarray]" = OrderedDict()
+        self._bytes: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def get(self, heuristic: Callable[[Location], Callable[[Location], float]],
+            goal: Location) -> Union[np.ndarray, None]:
+        """
+        :return: the field of the heuristic to the goal, None if the heuristic has no vectorized form
+        """
+        key = (heuristic, goal)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            self._hits += 1
+            return field
+        field = heuristic_field(heuristic=heuristic, goal=goal, rows=self._rows, columns=self._columns)
+        if field is None:
+            return None
+        self._misses += 1
+        if field.nbytes <= self._max_bytes:
+            self._fields[key] = field
+            self._bytes += field.nbytes
+            while self._bytes > self._max_bytes:
+                self._bytes -= self._fields.popitem(last=False)[1].nbytes
+        return field
+
+    def heuristic(self, heuristic: Callable[[Location], Callable[[Location], float]],
+                  goal: Location) -> Callable[[Location], float]:
+        """
+        The heuristic function to the goal, reading the field if the heuristic has one
+        """
+        field = self.get(heuristic=heuristic, goal=goal)
+        if field is None:
+            return heuristic(goal)
+        # item take the location as an index tuple
+        return field.item
+
+    def clear(self):
+        self._fields.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
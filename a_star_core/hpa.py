@@ -0,0 +1,356 @@
+from collections import deque
+from heapq import heappop, heappush
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+from a_star_core.engine import SearchEngine
+from a_star_core.grid import Grid, BLOCK
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+# a border is the line between a cluster and its neighbor on the right (EAST) or below (SOUTH)
+EAST: int = 0
+SOUTH: int = 1
+
+Cluster = Tuple[int, int]
+# top, left, bottom, right of a rectangle of cells, the bottom and right ones excluded
+Area = Tuple[int, int, int, int]
+
+
+class HierarchicalAStar(SearchEngine):
+    """
+    Hierarchical A* (HPA*): the grid is split in square clusters, the passable segments of the border between
+    two clusters give the entrances, and the distances between the entrances of a cluster are found by a search
+    limited to the cluster. A* runs on this abstract graph, then every abstract edge is refined in its cluster.
+    The abstraction is built lazily, only for the clusters the abstract search reach, and the clusters
+    changed in the grid are rebuilt on the next search, so very large grids don't pay for the parts
+    the queries never cross.
+    Every way across a border is kept: each passable segment of a border, the diagonal moves no straight move
+    of the border stand for, and the diagonal moves across the corners of the clusters. So the abstract graph
+    connect the same cells as the grid, and no abstract path means no path at all.
+    The path is the shortest one through the entrances, not the shortest one of the grid: it can only cross
+    a border at an entrance, so it may go around to the end of a long segment
+    """
+
+    def __init__(self, grid: Grid, cluster_size: int = 16, weight: float = 1.0,
+                 observer: Union[SearchObserver, None] = None):
+        """
+        :param cluster_size: side of the clusters, in cells
+        :param weight: the heuristic of the abstract search is multiplied by weight. With an admissible heuristic
+        and the default 1, the abstract path is the shortest one through the entrances; above 1 the search expand
+        less entrances and the abstract path is at most weight times longer than that
+        :param observer: receive the expanded entrances and the final path
+        """
+        super().__init__(observer=observer)
+        self._grid = grid
+        self._size = cluster_size
+        self._weight = weight
+        # transitions of every border computed so far: (cell of the cluster, cell of the neighbor)
+        self._borders: Dict[Tuple[int, int, int, bool], List[Tuple[Location, Location]]] = {}
+        # entrances of a cluster, with the cells across the borders they lead to
+        self._entrances: Dict[Tuple[Cluster, bool], Dict[Location, List[Location]]] = {}
+        # the moves from every entrance of a cluster: across the borders, and to the other entrances
+        self._edges: Dict[Tuple[Cluster, bool], Dict[Location, List[Tuple[Location, int]]]] = {}
+        # refined paths inside a cluster, from a location to another
+        self._segments: Dict[Tuple[Cluster, bool], Dict[Tuple[Location, Location], List[Location]]] = {}
+        grid.subscribe(self._on_change)
+
+    def search(self, start: Location, goal: Location, heuristic: Callable[[Location], float],
+               allow_diagonal: bool) -> Union[List[Location], None]:
+        def search() -> List[Location]:
+            abstract_path = self._search(start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+            return self._refine(abstract_path=abstract_path, allow_diagonal=allow_diagonal) if abstract_path else []
+
+        return self._timed_search(search)
+
+    def close(self):
+        self._grid.unsubscribe(self._on_change)
+
+    def _search(self, start: Location, goal: Location, heuristic: Callable[[Location], float],
+                allow_diagonal: bool) -> List[Location]:
+        # like the other engines, a blocked start can be left through its passable neighbors
+        if self._grid.grid[goal.row, goal.column] == BLOCK:
+            return []
+        start_cluster, goal_cluster = self._cluster(start), self._cluster(goal)
+        # the start and the goal are linked to the entrances of their cluster
+        start_edges = [(across, 1) for across in self._cluster_entrances(start_cluster, allow_diagonal).get(start, [])]
+        start_edges += self._edges_from(roots=[start], area=self._area(start_cluster), allow_diagonal=allow_diagonal,
+                                        targets=list(self._cluster_entrances(start_cluster, allow_diagonal)))[start]
+        to_goal = dict(self._edges_from(roots=[goal], area=self._area(goal_cluster), allow_diagonal=allow_diagonal,
+                                        targets=list(self._cluster_entrances(goal_cluster, allow_diagonal)))[goal])
+        if max(abs(start_cluster[0] - goal_cluster[0]), abs(start_cluster[1] - goal_cluster[1])) <= 1:
+            # a goal close to the start is also linked directly, through the clusters of both,
+            # so a short path doesn't have to go around to an entrance
+            start_edges += self._edges_from(roots=[start], area=self._area(start_cluster, goal_cluster),
+                                            allow_diagonal=allow_diagonal, targets=[goal])[start]
+        observer = self._observer
+        weight = self._weight
+        cost: Dict[Location, int] = {start: 0}
+        parent: Dict[Location, Location] = {}
+        closed = set()
+        h = weight * heuristic(start)
+        frontier: List[Tuple[float, float, Location]] = [(h, h, start)]
+        self._expanded = 0
+        self._peak_frontier = 1
+        while frontier:
+            self._peak_frontier = max(self._peak_frontier, len(frontier))
+            _, _, node = heappop(frontier)
+            if node in closed:
+                continue
+            closed.add(node)
+            self._expanded += 1
+            if observer:
+                observer.on_expand(node)
+            if node == goal:
+                path: List[Location] = [goal]
+                while node in parent:
+                    node = parent[node]
+                    path.append(node)
+                return path[::-1]
+            if node == start:
+                edges = start_edges
+            else:
+                edges = self._cluster_edges(cluster=self._cluster(node), allow_diagonal=allow_diagonal).get(node, [])
+                if node in to_goal:
+                    edges = edges + [(goal, to_goal[node])]
+            node_cost = cost[node]
+            for child, distance in edges:
+                new_cost = node_cost + distance
+                # with a consistent heuristic, a closed entrance already has its shortest cost
+                if child not in closed and (child not in cost or cost[child] > new_cost):
+                    cost[child] = new_cost
+                    parent[child] = node
+                    h = weight * heuristic(child)
+                    heappush(frontier, (new_cost + h, h, child))
+        return []
+
+    def _refine(self, abstract_path: List[Location], allow_diagonal: bool) -> List[Location]:
+        path: List[Location] = [abstract_path[0]]
+        for source, target in zip(abstract_path, abstract_path[1:]):
+            d_row, d_column = abs(source.row - target.row), abs(source.column - target.column)
+            if max(d_row, d_column) == 1 and (allow_diagonal or d_row + d_column == 1):
+                # the move across the border
+                path.append(target)
+                continue
+            cluster = self._cluster(source)
+            # the segments between two entrances are kept, the next searches often cross the same clusters
+            segments = self._segments.setdefault((cluster, allow_diagonal), {}) \
+                if cluster == self._cluster(target) else {}
+            if (source, target) not in segments:
+                parent = self._bfs(root=source, area=self._area(cluster, self._cluster(target)),
+                                   allow_diagonal=allow_diagonal, stop=target)
+                segment: List[Location] = []
+                location = target
+                while location != source:
+                    segment.append(location)
+                    location = parent[location]
+                segments[(source, target)] = segment[::-1]
+            path += segments[(source, target)]
+        return path
+
+    def _area(self, *clusters: Cluster) -> Area:
+        # the cells of the smallest rectangle holding the clusters
+        size = self._size
+        top, left = min(row for row, _ in clusters) * size, min(column for _, column in clusters) * size
+        bottom = min((max(row for row, _ in clusters) + 1) * size, self._grid.rows)
+        right = min((max(column for _, column in clusters) + 1) * size, self._grid.columns)
+        return top, left, bottom, right
+
+    def _edges_from(self, roots: List[Location], area: Area, allow_diagonal: bool,
+                    targets: List[Location]) -> Dict[Location, List[Tuple[Location, int]]]:
+        """
+        :return: for every root, the targets reachable from it inside the area, with their distance
+        """
+        distances = self._distances(roots=roots, area=area, allow_diagonal=allow_diagonal, targets=targets)
+        return {root: [(target, distance) for target, distance in zip(targets, row)
+                       if distance > 0]
+                for root, row in zip(roots, distances.tolist())}
+
+    def _distances(self, roots: List[Location], area: Area, allow_diagonal: bool,
+                   targets: List[Location]) -> np.ndarray:
+        """
+        Breadth first search from all the roots at once, every search is a layer of a boolean array
+        which grow by one move per step, limited to the passable cells of the area
+        :return: array roots x targets of the distances, -1 if the target is not reachable
+        """
+        top, left, bottom, right = area
+        cells = self._grid.grid[top:bottom, left:right]
+        height, width = cells.shape
+        # padded with blocked cells, so the moves never leave the area
+        passable = np.zeros((height + 2, width + 2), dtype=bool)
+        passable[1:-1, 1:-1] = cells != BLOCK
+        reached = np.zeros((len(roots), height + 2, width + 2), dtype=bool)
+        reached[np.arange(len(roots)), [root.row - top + 1 for root in roots],
+                [root.column - left + 1 for root in roots]] = True
+        target_rows = np.array([target.row - top + 1 for target in targets], dtype=np.intp)
+        target_columns = np.array([target.column - left + 1 for target in targets], dtype=np.intp)
+        distances = np.where(reached[:, target_rows, target_columns], 0, -1)
+        step = 0
+        while (distances < 0).any():
+            grown = reached.copy()
+            center = grown[:, 1:-1, 1:-1]
+            center |= reached[:, :-2, 1:-1]
+            center |= reached[:, 2:, 1:-1]
+            center |= reached[:, 1:-1, :-2]
+            center |= reached[:, 1:-1, 2:]
+            if allow_diagonal:
+                center |= reached[:, :-2, :-2]
+                center |= reached[:, :-2, 2:]
+                center |= reached[:, 2:, :-2]
+                center |= reached[:, 2:, 2:]
+            grown &= passable
+            if np.array_equal(grown, reached):
+                break
+            step += 1
+            distances[(distances < 0) & grown[:, target_rows, target_columns]] = step
+            reached = grown
+        return distances
+
+    def _bfs(self, root: Location, area: Area, allow_diagonal: bool,
+             stop: Union[Location, None] = None) -> Dict[Location, Location]:
+        # every move cost 1, so the breadth first search give the shortest distances inside the area
+        top, left, bottom, right = area
+        successor = self._grid.successor
+        parent: Dict[Location, Location] = {root: root}
+        queue = deque([root])
+        while queue:
+            location = queue.popleft()
+            if location == stop:
+                break
+            for child in successor(location, allow_diagonal):
+                if child not in parent and top <= child.row < bottom and left <= child.column < right:
+                    parent[child] = location
+                    queue.append(child)
+        return parent
+
+    def _cluster_edges(self, cluster: Cluster, allow_diagonal: bool) -> Dict[Location, List[Tuple[Location, int]]]:
+        # the moves across the borders, then the distances to the other entrances of the cluster
+        key = (cluster, allow_diagonal)
+        if key not in self._edges:
+            entrances = self._cluster_entrances(cluster, allow_diagonal)
+            inside = self._edges_from(roots=list(entrances), area=self._area(cluster),
+                                      allow_diagonal=allow_diagonal, targets=list(entrances))
+            self._edges[key] = {entrance: [(across, 1) for across in crossings] + inside[entrance]
+                                for entrance, crossings in entrances.items()}
+        return self._edges[key]
+
+    def _cluster_entrances(self, cluster: Cluster, allow_diagonal: bool) -> Dict[Location, List[Location]]:
+        key = (cluster, allow_diagonal)
+        if key not in self._entrances:
+            row, column = cluster
+            entrances: Dict[Location, List[Location]] = {}
+            for inside, outside in self._border(row, column, EAST, allow_diagonal) + \
+                    self._border(row, column, SOUTH, allow_diagonal):
+                entrances.setdefault(inside, []).append(outside)
+            for outside, inside in self._border(row, column - 1, EAST, allow_diagonal) + \
+                    self._border(row - 1, column, SOUTH, allow_diagonal):
+                entrances.setdefault(inside, []).append(outside)
+            if allow_diagonal:
+                for inside, outside in self._corners(cluster):
+                    entrances.setdefault(inside, []).append(outside)
+            self._entrances[key] = entrances
+        return self._entrances[key]
+
+    def _border(self, row: int, column: int, side: int, allow_diagonal: bool) -> List[Tuple[Location, Location]]:
+        key = (row, column, side, allow_diagonal)
+        if key not in self._borders:
+            self._borders[key] = self._transitions(row, column, side, allow_diagonal)
+        return self._borders[key]
+
+    def _transitions(self, row: int, column: int, side: int, allow_diagonal: bool) -> List[Tuple[Location, Location]]:
+        size = self._size
+        rows, columns = self._grid.rows, self._grid.columns
+        top, left = row * size, column * size
+        if row < 0 or column < 0 or top >= rows or left >= columns:
+            return []
+        grid = self._grid.grid
+        if side == EAST:
+            line = left + size
+            if line >= columns:
+                return []
+            inside, outside = grid[top:top + size, line - 1], grid[top:top + size, line]
+        else:
+            line = top + size
+            if line >= rows:
+                return []
+            inside, outside = grid[line - 1, left:left + size], grid[line, left:left + size]
+        inside_open, outside_open = inside != BLOCK, outside != BLOCK
+        straight = inside_open & outside_open
+        open_cells = np.concatenate(([False], straight, [False]))
+        changes = np.flatnonzero(open_cells[1:] != open_cells[:-1])
+        pairs: List[Tuple[int, int]] = []
+        for begin, end in zip(changes[::2].tolist(), changes[1::2].tolist()):
+            # a short segment get one transition in its middle, a long one a transition at each end
+            offsets = [(begin + end - 1) // 2] if end - begin < 6 else [begin, end - 1]
+            pairs += [(offset, offset) for offset in offsets]
+        if allow_diagonal:
+            # a diagonal move between two cells without a straight move is the only way across there,
+            # next to a straight move it can be replaced by the straight move and a move along the border
+            lonely = ~straight[:-1] & ~straight[1:]
+            forward = np.flatnonzero(lonely & inside_open[:-1] & outside_open[1:]).tolist()
+            backward = np.flatnonzero(lonely & inside_open[1:] & outside_open[:-1]).tolist()
+            pairs += [(offset, offset + 1) for offset in forward] + [(offset + 1, offset) for offset in backward]
+        if side == EAST:
+            return [(Location(top + inside_offset, line - 1), Location(top + outside_offset, line))
+                    for inside_offset, outside_offset in pairs]
+        return [(Location(line - 1, left + inside_offset), Location(line, left + outside_offset))
+                for inside_offset, outside_offset in pairs]
+
+    def _corners(self, cluster: Cluster) -> List[Tuple[Location, Location]]:
+        # the diagonal moves from a corner of the cluster to the cluster diagonally next to it, only when
+        # the two cells beside the move are blocked: otherwise the way through one of them cross the borders
+        size = self._size
+        rows, columns = self._grid.rows, self._grid.columns
+        grid = self._grid.grid
+        top, left = cluster[0] * size, cluster[1] * size
+        bottom, right = min(top + size, rows) - 1, min(left + size, columns) - 1
+        corners: List[Tuple[Location, Location]] = []
+        for row, d_row in ((top, -1), (bottom, 1)):
+            for column, d_column in ((left, -1), (right, 1)):
+                across = Location(row + d_row, column + d_column)
+                if 0 <= across.row < rows and 0 <= across.column < columns \
+                        and grid[row, column] != BLOCK and grid[across.row, across.column] != BLOCK \
+                        and grid[row, across.column] == BLOCK and grid[across.row, column] == BLOCK:
+                    corners.append((Location(row, column), across))
+        return corners
+
+    def _on_change(self, location: Union[Location, None]):
+        if location is None:
+            self._borders.clear()
+            self._entrances.clear()
+            self._edges.clear()
+            self._segments.clear()
+            return
+        row, column = self._cluster(location)
+        touched = [(row, column)]
+        local_row, local_column = location.row % self._size, location.column % self._size
+        # a cell on the edge of the cluster change the border it share with a neighbor cluster
+        borders: List[Tuple[int, int, int]] = []
+        if local_row == 0:
+            borders.append((row - 1, column, SOUTH))
+            touched.append((row - 1, column))
+        if local_row == self._size - 1:
+            borders.append((row, column, SOUTH))
+            touched.append((row + 1, column))
+        if local_column == 0:
+            borders.append((row, column - 1, EAST))
+            touched.append((row, column - 1))
+        if local_column == self._size - 1:
+            borders.append((row, column, EAST))
+            touched.append((row, column + 1))
+        # and a corner cell the diagonal moves across the corner, of its cluster and of the 3 others around it
+        for on_row, d_row in ((local_row == 0, -1), (local_row == self._size - 1, 1)):
+            for on_column, d_column in ((local_column == 0, -1), (local_column == self._size - 1, 1)):
+                if on_row and on_column:
+                    touched += [(row + d_row, column), (row, column + d_column), (row + d_row, column + d_column)]
+        for allow_diagonal in (False, True):
+            for border in borders:
+                self._borders.pop(border + (allow_diagonal,), None)
+            for cluster in touched:
+                self._entrances.pop((cluster, allow_diagonal), None)
+                self._edges.pop((cluster, allow_diagonal), None)
+                self._segments.pop((cluster, allow_diagonal), None)
+
+    def _cluster(self, location: Location) -> Cluster:
+        return location.row // self._size, location.column // self._size
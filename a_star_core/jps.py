@@ -0,0 +1,215 @@
+from heapq import heappop, heappush
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+from a_star_core.engine import SearchEngine
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+
+class JumpPointSearch(SearchEngine):
+    """
+    Jump Point Search over a uniform cost grid, the same model as Grid.successor:
+    every move cost 1 and diagonal moves are allowed next to blocks.
+    Instead of pushing every neighbor, the search jumps along straight and diagonal lines and
+    only push the cells where the path may turn (jump points), so open areas are crossed
+    without expanding them
+    """
+
+    def __init__(self, passable: np.ndarray, observer: Union[SearchObserver, None] = None):
+        """
+        :param passable: boolean array of the passable cells of the maze
+        :param observer: receive the expanded jump points and the final path
+        """
+        super().__init__(observer=observer)
+        rows, columns = passable.shape
+        # the grid is padded with blocked cells, so the jumps never check the boundary
+        self._width: int = columns + 2
+        padded = np.zeros((rows + 2, columns + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = passable
+        self._walkable: bytes = padded.tobytes()
+
+    def search(self, start: Location, goal: Location, heuristic: Callable[[Location], float],
+               allow_diagonal: bool) -> Union[List[Location], None]:
+        def search() -> List[Location]:
+            jump_points = self._search(start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+            return self._expand_path(jump_points) if jump_points else []
+
+        return self._timed_search(search)
+
+    def _search(self, start: Location, goal: Location, heuristic: Callable[[Location], float],
+                allow_diagonal: bool) -> List[Location]:
+        width = self._width
+        start_index = self._index(start)
+        goal_index = self._index(goal)
+        distance = max if allow_diagonal else _manhattan
+        observer = self._observer
+        cost: Dict[int, int] = {start_index: 0}
+        parent: Dict[int, int] = {}
+        closed = set()
+        h = heuristic(start)
+        frontier: List[Tuple[float, float, int]] = [(h, h, start_index)]
+        self._expanded = 0
+        self._peak_frontier = 1
+        while frontier:
+            self._peak_frontier = max(self._peak_frontier, len(frontier))
+            _, _, index = heappop(frontier)
+            if index in closed:
+                continue
+            closed.add(index)
+            self._expanded += 1
+            row, column = divmod(index, width)
+            if observer:
+                observer.on_expand(Location(row - 1, column - 1))
+            if index == goal_index:
+                return self._jump_points_to(parent=parent, index=goal_index)
+            for jump_point in self._successors(index=index, parent=parent.get(index), goal=goal_index,
+                                               allow_diagonal=allow_diagonal):
+                jump_row, jump_column = divmod(jump_point, width)
+                new_cost = cost[index] + distance(abs(jump_row - row), abs(jump_column - column))
+                if jump_point not in cost or cost[jump_point] > new_cost:
+                    cost[jump_point] = new_cost
+                    parent[jump_point] = index
+                    closed.discard(jump_point)
+                    h = heuristic(Location(jump_row - 1, jump_column - 1))
+                    heappush(frontier, (new_cost + h, h, jump_point))
+        return []
+
+    def _successors(self, index: int, parent: Union[int, None], goal: int, allow_diagonal: bool) -> List[int]:
+        jump_points: List[int] = []
+        jump = self._jump_diagonal if allow_diagonal else self._jump_straight
+        for d_row, d_column in self._pruned_directions(index=index, parent=parent, allow_diagonal=allow_diagonal):
+            jump_point = jump(index, d_row, d_column, goal)
+            if jump_point >= 0:
+                jump_points.append(jump_point)
+        return jump_points
+
+    def _pruned_directions(self, index: int, parent: Union[int, None],
+                           allow_diagonal: bool) -> List[Tuple[int, int]]:
+        walkable, width = self._walkable, self._width
+        if parent is None:
+            # the start location, every direction is explored
+            if allow_diagonal:
+                return [(0, -1), (1, 0), (0, 1), (-1, 0), (1, -1), (1, 1), (-1, 1), (-1, -1)]
+            return [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        row, column = divmod(index, width)
+        parent_row, parent_column = divmod(parent, width)
+        d_row = (row > parent_row) - (row < parent_row)
+        d_column = (column > parent_column) - (column < parent_column)
+        directions: List[Tuple[int, int]] = []
+        if not allow_diagonal:
+            if d_row:
+                directions += [(d_row, 0), (0, 1), (0, -1)]
+            else:
+                directions += [(0, d_column), (1, 0), (-1, 0)]
+            return directions
+        if d_row and d_column:
+            directions += [(0, d_column), (d_row, 0), (d_row, d_column)]
+            if not walkable[index - d_row * width]:
+                directions.append((-d_row, d_column))
+            if not walkable[index - d_column]:
+                directions.append((d_row, -d_column))
+        elif d_row:
+            directions.append((d_row, 0))
+            if not walkable[index + 1]:
+                directions.append((d_row, 1))
+            if not walkable[index - 1]:
+                directions.append((d_row, -1))
+        else:
+            directions.append((0, d_column))
+            if not walkable[index + width]:
+                directions.append((1, d_column))
+            if not walkable[index - width]:
+                directions.append((-1, d_column))
+        return directions
+
+    def _jump_straight(self, index: int, d_row: int, d_column: int, goal: int) -> int:
+        """
+        Jump along a row or a column for the 4 directions movement,
+        moving along a column also check for jump points along the rows
+        :return: the jump point, -1 if the line reach a block
+        """
+        walkable, width = self._walkable, self._width
+        step = d_row * width + d_column
+        while True:
+            index += step
+            if not walkable[index]:
+                return -1
+            if index == goal:
+                return index
+            if d_row:
+                if (walkable[index + 1] and not walkable[index + 1 - step]) or \
+                        (walkable[index - 1] and not walkable[index - 1 - step]):
+                    return index
+            else:
+                if (walkable[index + width] and not walkable[index + width - step]) or \
+                        (walkable[index - width] and not walkable[index - width - step]):
+                    return index
+                if self._jump_straight(index, 1, 0, goal) >= 0 or self._jump_straight(index, -1, 0, goal) >= 0:
+                    return index
+
+    def _jump_diagonal(self, index: int, d_row: int, d_column: int, goal: int) -> int:
+        """
+        Jump for the 8 directions movement, moving diagonally also check for jump points
+        along the row and the column
+        :return: the jump point, -1 if the line reach a block
+        """
+        walkable, width = self._walkable, self._width
+        if d_row and d_column:
+            step = d_row * width + d_column
+            while True:
+                index += step
+                if not walkable[index]:
+                    return -1
+                if index == goal:
+                    return index
+                if (walkable[index - d_row * width + d_column] and not walkable[index - d_row * width]) or \
+                        (walkable[index + d_row * width - d_column] and not walkable[index - d_column]):
+                    return index
+                if self._jump_diagonal(index, d_row, 0, goal) >= 0 or \
+                        self._jump_diagonal(index, 0, d_column, goal) >= 0:
+                    return index
+        step = d_row * width + d_column
+        while True:
+            index += step
+            if not walkable[index]:
+                return -1
+            if index == goal:
+                return index
+            if d_row:
+                if (walkable[index + step + 1] and not walkable[index + 1]) or \
+                        (walkable[index + step - 1] and not walkable[index - 1]):
+                    return index
+            else:
+                if (walkable[index + step + width] and not walkable[index + width]) or \
+                        (walkable[index + step - width] and not walkable[index - width]):
+                    return index
+
+    def _jump_points_to(self, parent: Dict[int, int], index: int) -> List[Location]:
+        jump_points: List[Location] = []
+        while index is not None:
+            row, column = divmod(index, self._width)
+            jump_points.append(Location(row - 1, column - 1))
+            index = parent.get(index)
+        return jump_points[::-1]
+
+    def _index(self, location: Location) -> int:
+        return (location.row + 1) * self._width + location.column + 1
+
+    @staticmethod
+    def _expand_path(jump_points: List[Location]) -> List[Location]:
+        # every jump is a straight or a diagonal line, walk it cell by cell
+        path: List[Location] = [jump_points[0]]
+        for target in jump_points[1:]:
+            row, column = path[-1]
+            d_row = (target.row > row) - (target.row < row)
+            d_column = (target.column > column) - (target.column < column)
+            while (row, column) != target:
+                row, column = row + d_row, column + d_column
+                path.append(Location(row, column))
+        return path
+
+
+def _manhattan(d_row: int, d_column: int) -> int:
+    return d_row + d_column
@@ -0,0 +1,204 @@
+import hashlib
+import os
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+from a_star_core.grid import DIRECTIONS, Grid, BLOCK
+from a_star_core.utils import Location
+
+# the tables of the mazes already seen, named by the blocks of the maze
+CACHE_DIRECTORY: str = os.path.join(os.path.expanduser("~"), ".cache", "a_star", "landmarks")
+
+
+def bfs_distances(passable: np.ndarray, root: Location, allow_diagonal: bool, dtype=np.uint32) -> np.ndarray:
+    """
+    Breadth first search from the root on the whole grid, every layer of the search is expanded at once
+    on the flat indices of the cells
+    :param passable: boolean array of the passable cells
+    :return: array of the number of moves from the root, the maximum of the dtype if a cell is not reachable
+    """
+    rows, columns = passable.shape
+    width = columns + 2
+    # padded with blocked cells, so the moves never leave the grid
+    unvisited = np.zeros((rows + 2, width), dtype=bool)
+    unvisited[1:-1, 1:-1] = passable
+    unvisited = unvisited.ravel()
+    distances = np.full(unvisited.size, np.iinfo(dtype).max, dtype=dtype)
+    directions = DIRECTIONS if allow_diagonal else DIRECTIONS[:4]
+    offsets = np.array([d_row * width + d_column for d_row, d_column in directions], dtype=np.intp)
+    frontier = np.array([(root.row + 1) * width + root.column + 1], dtype=np.intp)
+    distances[frontier] = 0
+    unvisited[frontier] = False
+    step = 0
+    while frontier.size:
+        step += 1
+        candidates = (frontier[:, None] + offsets).ravel()
+        frontier = np.unique(candidates[unvisited[candidates]])
+        unvisited[frontier] = False
+        distances[frontier] = step
+    return distances.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+class LandmarkTable:
+    """
+    Exact distances from a few landmarks to every cell of a maze. By the triangle inequality,
+    |d(landmark, goal) - d(landmark, location)| is never more than d(location, goal), so the largest of these
+    differences is an admissible heuristic which, unlike the geometric distances, knows about the walls.
+    The table is a heuristic factory like manhattan_distance, for the maze and the movement it was built for
+    """
+
+    def __init__(self, landmarks: List[Location], distances: np.ndarray, allow_diagonal: bool):
+        """
+        :param distances: array landmarks x rows x columns, the maximum of its dtype if a cell is not reachable
+        """
+        self._landmarks = landmarks
+        self._distances = distances
+        self._allow_diagonal = allow_diagonal
+        self._unreachable = np.iinfo(distances.dtype).max
+        # shown in the heuristic panel, like the name of the heuristic functions
+        self.__name__ = "landmark_distance"
+
+    @classmethod
+    def build(cls, passable: np.ndarray, allow_diagonal: bool, count: int = 8) -> "LandmarkTable":
+        """
+        The landmarks are spread by farthest point selection: every landmark is the reachable cell
+        the farthest from the landmarks already selected, so they end up on the borders of the maze
+        """
+        rows, columns = passable.shape
+        # the distances are at most the number of cells, the smallest dtype holding them is used
+        dtype = np.uint16 if rows * columns < np.iinfo(np.uint16).max else np.uint32
+        landmarks: List[Location] = []
+        tables: List[np.ndarray] = []
+        if passable.any():
+            unreachable = np.iinfo(dtype).max
+            nearest = cls._root_distances(passable=passable, allow_diagonal=allow_diagonal, dtype=dtype,
+                                          attempts=count)
+            while len(landmarks) < count:
+                # the cells not reachable from the root are left out, they are not worth a landmark
+                candidates = np.where(nearest != unreachable, nearest, 0)
+                index = int(np.argmax(candidates))
+                if landmarks and candidates.flat[index] == 0:
+                    break
+                landmark = Location(*map(int, np.unravel_index(index, passable.shape)))
+                table = bfs_distances(passable=passable, root=landmark, allow_diagonal=allow_diagonal, dtype=dtype)
+                landmarks.append(landmark)
+                tables.append(table)
+                nearest = table if len(landmarks) == 1 else np.minimum(nearest, table)
+        distances = np.stack(tables) if tables else np.zeros((0, rows, columns), dtype=dtype)
+        return cls(landmarks=landmarks, distances=distances, allow_diagonal=allow_diagonal)
+
+    @staticmethod
+    def _root_distances(passable: np.ndarray, allow_diagonal: bool, dtype, attempts: int) -> np.ndarray:
+        # the first root may be walled in, a few roots are tried until one reach most of the maze
+        unreachable = np.iinfo(dtype).max
+        unexplored = passable.copy()
+        best, best_reached = None, 0
+        for _ in range(attempts):
+            root = Location(*map(int, np.unravel_index(np.argmax(unexplored), passable.shape)))
+            distances = bfs_distances(passable=passable, root=root, allow_diagonal=allow_diagonal, dtype=dtype)
+            reached = distances != unreachable
+            if best is None or reached.sum() > best_reached:
+                best, best_reached = distances, reached.sum()
+            unexplored &= ~reached
+            if best_reached * 2 >= passable.sum() or not unexplored.any():
+                break
+        return best
+
+    @classmethod
+    def load(cls, path: str) -> "LandmarkTable":
+        with np.load(path) as file:
+            return cls(landmarks=[Location(int(row), int(column)) for row, column in file["landmarks"]],
+                       distances=file["distances"], allow_diagonal=bool(file["allow_diagonal"]))
+
+    def save(self, path: str):
+        np.savez_compressed(path, landmarks=np.array(self._landmarks, dtype=np.int64).reshape(-1, 2),
+                            distances=self._distances, allow_diagonal=self._allow_diagonal)
+
+    def __call__(self, goal: Location) -> Callable[[Location], float]:
+        # the heuristic of every cell is computed at once, the search only read it
+        field = self.field(goal)
+
+        def distance(location: Location):
+            return field.item(location)
+
+        return distance
+
+    def field(self, goal: Location) -> np.ndarray:
+        """
+        :return: the heuristic of every cell to the goal, never lower than the manhattan (or chebyshev) distance
+        """
+        rows, columns = self._distances.shape[1:]
+        d_row = np.abs(np.arange(rows, dtype=np.int32) - goal.row)[:, None]
+        d_column = np.abs(np.arange(columns, dtype=np.int32) - goal.column)[None, :]
+        field = np.maximum(d_row, d_column) if self._allow_diagonal else d_row + d_column
+        to_goal = self._distances[:, goal.row, goal.column]
+        for landmark in np.flatnonzero(to_goal != self._unreachable):
+            distances = self._distances[landmark]
+            difference = np.abs(distances.astype(np.int32) - int(to_goal[landmark]))
+            # a cell the landmark can't reach tells nothing about its distance to the goal
+            difference[distances == self._unreachable] = 0
+            np.maximum(field, difference, out=field)
+        return field
+
+    @property
+    def landmarks(self) -> List[Location]:
+        return self._landmarks
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self._distances
+
+    @property
+    def allow_diagonal(self) -> bool:
+        return self._allow_diagonal
+
+
+class LandmarkStore:
+    """
+    Landmark tables of a grid, built again when the blocks of the maze change. The tables are saved
+    in the directory under a hash of the blocks, so a maze seen before doesn't pay the precomputation again
+    """
+
+    def __init__(self, grid: Grid, count: int = 8, directory: Union[str, None] = CACHE_DIRECTORY):
+        """
+        :param directory: where the tables are saved, None to keep them only in memory
+        """
+        self._grid = grid
+        self._count = count
+        self._directory = directory
+        # per movement: the table, the hash of the blocks and the grid version it was checked on
+        self._tables: Dict[bool, LandmarkTable] = {}
+        self._digests: Dict[bool, str] = {}
+        self._versions: Dict[bool, int] = {}
+
+    def table(self, allow_diagonal: bool) -> LandmarkTable:
+        version = self._grid.version
+        if self._versions.get(allow_diagonal) == version:
+            return self._tables[allow_diagonal]
+        passable = self._grid.grid != BLOCK
+        digest = self._digest(passable)
+        if self._digests.get(allow_diagonal) != digest:
+            self._tables[allow_diagonal] = self._load_or_build(passable=passable, digest=digest,
+                                                               allow_diagonal=allow_diagonal)
+            self._digests[allow_diagonal] = digest
+        # the start and the goal moved, the blocks are the same
+        self._versions[allow_diagonal] = version
+        return self._tables[allow_diagonal]
+
+    def _load_or_build(self, passable: np.ndarray, digest: str, allow_diagonal: bool) -> LandmarkTable:
+        if self._directory is None:
+            return LandmarkTable.build(passable=passable, allow_diagonal=allow_diagonal, count=self._count)
+        path = os.path.join(self._directory, f"{digest}-{8 if allow_diagonal else 4}-{self._count}.npz")
+        if os.path.exists(path):
+            return LandmarkTable.load(path)
+        table = LandmarkTable.build(passable=passable, allow_diagonal=allow_diagonal, count=self._count)
+        os.makedirs(self._directory, exist_ok=True)
+        table.save(path)
+        return table
+
+    @staticmethod
+    def _digest(passable: np.ndarray) -> str:
+        digest = hashlib.sha1(np.array(passable.shape, dtype=np.int64).tobytes())
+        digest.update(np.packbits(passable).tobytes())
+        return digest.hexdigest()
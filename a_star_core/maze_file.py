@@ -0,0 +1,215 @@
+"""
+Compact binary maze file: a 32 bytes header followed by one bit per cell (1 = BLOCK), every row is packed
+on whole bytes, so a row or a window of the maze can be read without reading the rest of the file.
+
+Convert the ASCII form printed by a_star_terminal.maze.Maze to the binary form, and back:
+    python -m a_star_core.maze_file pack maze.txt maze.maze --connectivity 8
+    python -m a_star_core.maze_file unpack maze.maze maze.txt
+"""
+import argparse
+import mmap
+import struct
+import sys
+from typing import List, Union
+
+import numpy as np
+
+from a_star_core.grid import Grid, EMPTY, BLOCK, START, GOAL, PATH
+from a_star_core.utils import Location
+
+MAGIC: bytes = b"AMAZ"
+FORMAT_VERSION: int = 1
+# magic, format version, connectivity (4 or 8), rows, columns, start row and column, goal row and column (-1 if unset)
+HEADER = struct.Struct("<4sHHIIiiii")
+# rows packed at once when the file is written, so a huge grid doesn't need a second copy in memory
+_CHUNK_ROWS: int = 4096
+
+# characters of the ASCII form, the same as a_star_terminal.utils.Cell
+ASCII_BLOCK: str = "#"
+ASCII_START: str = "S"
+ASCII_GOAL: str = "G"
+ASCII_PATH: str = "*"
+ASCII_EMPTY: str = " "
+
+
+def save_maze(path: str, grid: Grid, connectivity: int = 4):
+    """
+    Write the grid in the binary format, only the blocks, the start and the goal are kept
+    :param connectivity: 4 or 8, the movement the maze is made for
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"connectivity should be 4 or 8, not {connectivity}")
+    start = grid.start if grid.start is not None else Location(-1, -1)
+    goal = grid.goal if grid.goal is not None else Location(-1, -1)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, connectivity, grid.rows, grid.columns,
+                               start.row, start.column, goal.row, goal.column))
+        for top in range(0, grid.rows, _CHUNK_ROWS):
+            file.write(np.packbits(grid.grid[top:top + _CHUNK_ROWS] == BLOCK, axis=1).tobytes())
+
+
+def load_maze(path: str) -> Grid:
+    """
+    Read the whole file in a new grid
+    """
+    with MappedMaze(path) as maze:
+        return maze.to_grid()
+
+
+class MappedMaze:
+    """
+    Maze file mapped in memory: opening it only read the header, the pages of the file are read by the system
+    when the cells are accessed. Close it (or use it as a context manager) once the arrays returned by packed
+    are not used anymore
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a maze file")
+        magic, version, connectivity, rows, columns, start_row, start_column, goal_row, goal_column = \
+            HEADER.unpack_from(self._mmap)
+        row_bytes = (columns + 7) // 8
+        if magic != MAGIC or version != FORMAT_VERSION or len(self._mmap) < HEADER.size + rows * row_bytes:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a maze file of version {FORMAT_VERSION}")
+        self._rows: int = rows
+        self._columns: int = columns
+        self._connectivity: int = connectivity
+        self._start: Union[Location, None] = Location(start_row, start_column) if start_row >= 0 else None
+        self._goal: Union[Location, None] = Location(goal_row, goal_column) if goal_row >= 0 else None
+        # view on the file, no byte is read until it is used
+        self._packed: np.ndarray = np.frombuffer(self._mmap, dtype=np.uint8, count=rows * row_bytes,
+                                                 offset=HEADER.size).reshape(rows, row_bytes)
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @property
+    def connectivity(self) -> int:
+        return self._connectivity
+
+    @property
+    def allow_diagonal(self) -> bool:
+        return self._connectivity == 8
+
+    @property
+    def start(self) -> Union[Location, None]:
+        return self._start
+
+    @property
+    def goal(self) -> Union[Location, None]:
+        return self._goal
+
+    @property
+    def packed(self) -> np.ndarray:
+        """
+        The bits of the file, one row of bytes per row of the maze
+        """
+        return self._packed
+
+    def is_blocked(self, location: Location) -> bool:
+        return bool(self._packed[location.row, location.column >> 3] >> (7 - (location.column & 7)) & 1)
+
+    def window(self, top: int, left: int, bottom: int, right: int) -> np.ndarray:
+        """
+        Unpack a part of the maze, only the pages of its rows are read
+        :return: uint8 array of EMPTY and BLOCK, rows top to bottom (excluded), columns left to right (excluded)
+        """
+        packed = self._packed[top:bottom, left >> 3:(right + 7) >> 3]
+        cells = np.unpackbits(packed, axis=1)
+        offset = left & ~7
+        return cells[:, left - offset:right - offset]
+
+    def to_grid(self) -> Grid:
+        cells = np.unpackbits(self._packed, axis=1, count=self._columns)
+        # the unpacked bits are already EMPTY (0) and BLOCK (1)
+        if self._start is not None:
+            cells[self._start.row, self._start.column] = START
+        if self._goal is not None:
+            cells[self._goal.row, self._goal.column] = GOAL
+        return Grid.from_array(grid=cells)
+
+    def close(self):
+        # the view must be released before the map is closed
+        del self._packed
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedMaze":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def to_ascii(grid: Grid) -> str:
+    """
+    The same representation as a_star_terminal.maze.Maze.__str__, the explored cells are empty
+    """
+    characters = np.full(256, ord(ASCII_EMPTY), dtype=np.uint8)
+    characters[BLOCK] = ord(ASCII_BLOCK)
+    characters[START] = ord(ASCII_START)
+    characters[GOAL] = ord(ASCII_GOAL)
+    characters[PATH] = ord(ASCII_PATH)
+    output = np.empty((grid.rows, grid.columns + 1), dtype=np.uint8)
+    output[:, :-1] = characters[grid.grid]
+    output[:, -1] = ord("\n")
+    return output.tobytes().decode("ascii")
+
+
+def from_ascii(text: str) -> Grid:
+    """
+    Parse the representation printed by a_star_terminal.maze.Maze, the short lines are completed by empty cells
+    and the path is read as empty cells
+    """
+    lines: List[str] = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    columns = max((len(line) for line in lines), default=0)
+    characters = np.frombuffer("".join(line.ljust(columns) for line in lines).encode("ascii"), dtype=np.uint8)
+    states = np.full(256, 255, dtype=np.uint8)
+    states[ord(ASCII_EMPTY)] = EMPTY
+    states[ord(ASCII_PATH)] = EMPTY
+    states[ord(ASCII_BLOCK)] = BLOCK
+    states[ord(ASCII_START)] = START
+    states[ord(ASCII_GOAL)] = GOAL
+    cells = states[characters].reshape(len(lines), columns)
+    if (cells == 255).any():
+        unknown = chr(characters[np.argmax(cells.ravel() == 255)])
+        raise ValueError(f"unknown maze character {unknown!r}")
+    return Grid.from_array(grid=cells)
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Convert mazes between the ASCII and the binary form")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = commands.add_parser("pack", help="ASCII to binary")
+    pack_parser.add_argument("source")
+    pack_parser.add_argument("destination")
+    pack_parser.add_argument("--connectivity", type=int, choices=[4, 8], default=4)
+
+    unpack_parser = commands.add_parser("unpack", help="binary to ASCII")
+    unpack_parser.add_argument("source")
+    unpack_parser.add_argument("destination")
+
+    options = parser.parse_args(arguments)
+    if options.command == "pack":
+        with open(options.source) as file:
+            grid = from_ascii(file.read())
+        save_maze(options.destination, grid=grid, connectivity=options.connectivity)
+    else:
+        with open(options.destination, "w") as file:
+            file.write(to_ascii(load_maze(options.source)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,126 @@
+from math import inf, isqrt
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from a_star_core.astar import AStar
+from a_star_core.observer import SearchObserver
+from a_star_core.utils import Location
+
+
+class GoalIndex:
+    """
+    Goals bucketed in square cells of the grid, so the closest goal to a location is found by looking at the
+    buckets around it, ring by ring, instead of at every goal.
+    A goal in the ring r of buckets is at least (r - 1) * bucket_size + 1 moves away on one axis, so the search
+    stop as soon as the closest goal found is nearer than the next ring. This hold for every heuristic at least
+    as large as the chebyshev distance, like the heuristics of utils
+    """
+
+    def __init__(self, goals: Iterable[Location], heuristic: Callable[[Location], Callable[[Location], float]],
+                 bucket_size: Union[int, None] = None):
+        """
+        :param heuristic: the heuristic factory, called once per goal
+        :param bucket_size: side of the buckets, by default about one goal per bucket over the area of the goals
+        """
+        self._goals: List[Location] = list(dict.fromkeys(goals))
+        if not self._goals:
+            raise ValueError("at least one goal is needed")
+        self._goal_set = frozenset(self._goals)
+        top = min(goal.row for goal in self._goals)
+        bottom = max(goal.row for goal in self._goals)
+        left = min(goal.column for goal in self._goals)
+        right = max(goal.column for goal in self._goals)
+        if bucket_size is None:
+            bucket_size = max(1, isqrt((bottom - top + 1) * (right - left + 1) // len(self._goals)))
+        self._size = bucket_size
+        self._buckets: Dict[Tuple[int, int], List[Tuple[Location, Callable[[Location], float]]]] = {}
+        for goal in self._goals:
+            self._buckets.setdefault((goal.row // bucket_size, goal.column // bucket_size), []).append(
+                (goal, heuristic(goal)))
+        # the buckets holding goals, the rings outside of them are empty
+        self._top, self._bottom = top // bucket_size, bottom // bucket_size
+        self._left, self._right = left // bucket_size, right // bucket_size
+
+    def nearest(self, location: Location) -> Tuple[Location, float]:
+        """
+        :return: the goal with the lowest heuristic from the location, and the heuristic
+        """
+        size = self._size
+        row, column = location.row // size, location.column // size
+        # the rings closer than the goals are empty
+        ring = max(0, self._top - row, row - self._bottom, self._left - column, column - self._right)
+        last = max(row - self._top, self._bottom - row, column - self._left, self._right - column)
+        best_goal, best = self._goals[0], inf
+        buckets = self._buckets
+        while ring <= last and (ring == 0 or (ring - 1) * size + 1 < best):
+            for key in self._ring(row=row, column=column, ring=ring):
+                for goal, distance in buckets.get(key, ()):
+                    value = distance(location)
+                    if value < best:
+                        best_goal, best = goal, value
+            ring += 1
+        return best_goal, best
+
+    def distance(self, location: Location) -> float:
+        """
+        The lowest heuristic to the goals, it is admissible for the closest goal
+        """
+        return self.nearest(location)[1]
+
+    @staticmethod
+    def _ring(row: int, column: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield row, column
+            return
+        for ring_column in range(column - ring, column + ring + 1):
+            yield row - ring, ring_column
+            yield row + ring, ring_column
+        for ring_row in range(row - ring + 1, row + ring):
+            yield ring_row, column - ring
+            yield ring_row, column + ring
+
+    def __contains__(self, location: Location) -> bool:
+        return location in self._goal_set
+
+    def __len__(self) -> int:
+        return len(self._goals)
+
+    @property
+    def goals(self) -> List[Location]:
+        return self._goals
+
+    @property
+    def bucket_size(self) -> int:
+        return self._size
+
+
+class MultiGoalAStar(AStar):
+    """
+    A* to the closest of many goals in one search: the search stop at the first goal it expand,
+    with the lowest heuristic to the goals as heuristic, so the path is the shortest to any of them
+    """
+
+    def __init__(self, heuristic: Callable[[Location], Callable[[Location], float]],
+                 successor: Callable[[Location, bool], List[Location]],
+                 start: Location,
+                 goals: Iterable[Location],
+                 allow_diagonal: bool,
+                 observer: Union[SearchObserver, None] = None,
+                 profile: bool = False,
+                 bucket_size: Union[int, None] = None):
+        """
+        :param heuristic: the heuristic factory, like manhattan_distance
+        """
+        self._index = GoalIndex(goals=goals, heuristic=heuristic, bucket_size=bucket_size)
+        super().__init__(heuristic=self._index.distance, successor=successor, goal_check=self._index.__contains__,
+                         start=start, allow_diagonal=allow_diagonal, observer=observer, profile=profile)
+
+    @property
+    def goal(self) -> Union[Location, None]:
+        """
+        The goal reached by the search, None if no goal can be reached
+        """
+        return self.path[-1] if self.path else None
+
+    @property
+    def goals(self) -> List[Location]:
+        return self._index.goals
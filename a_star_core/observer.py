@@ -0,0 +1,89 @@
+import time
+from typing import Callable, List
+
+from a_star_core.utils import Location, Cell
+
+
+class SearchObserver:
+    """
+    Receives the events of a running search, the default implementation ignores all of them.
+    Subclass it and override the events you are interested in
+    """
+
+    def __init__(self):
+        # time spent inside the observer, it is not counted as search time
+        self.elapsed: float = 0.0
+
+    def on_expand(self, location: Location) -> None:
+        pass
+
+    def on_expand_backward(self, location: Location) -> None:
+        # expansion of the search from the goal, when the search is bidirectional
+        self.on_expand(location)
+
+    def on_push(self, location: Location) -> None:
+        # a location is added to the frontier, or its cost is lowered
+        pass
+
+    def on_goal(self, location: Location) -> None:
+        # the goal is reached, on_path follow once the path is built
+        pass
+
+    def on_path(self, path: List[Location]) -> None:
+        pass
+
+    def flush(self) -> None:
+        # called once the search is over
+        pass
+
+
+class ThrottledObserver(SearchObserver):
+    """
+    Collect the expanded locations and repaint the maze at most every `every_n` expansions
+    or every `every_ms` milliseconds, whichever comes first
+    """
+
+    def __init__(self, mark: Callable[[Location, Cell], None], repaint: Callable[[], None],
+                 every_n: int = 500, every_ms: float = 16.0):
+        super().__init__()
+        self._mark = mark
+        self._repaint = repaint
+        self._every_n = every_n
+        self._every_s = every_ms / 1000
+        self._pending: List[Location] = []
+        self._pending_backward: List[Location] = []
+        self._last_repaint: float = time.perf_counter()
+
+    def on_expand(self, location: Location) -> None:
+        self._pending.append(location)
+        self._throttle()
+
+    def on_expand_backward(self, location: Location) -> None:
+        self._pending_backward.append(location)
+        self._throttle()
+
+    def on_path(self, path: List[Location]) -> None:
+        self.flush()
+        t1 = time.perf_counter()
+        for location in path:
+            self._mark(location, Cell.PATH)
+        self._repaint()
+        self._last_repaint = time.perf_counter()
+        self.elapsed += self._last_repaint - t1
+
+    def flush(self) -> None:
+        t1 = time.perf_counter()
+        for location in self._pending:
+            self._mark(location, Cell.EXPLORE)
+        for location in self._pending_backward:
+            self._mark(location, Cell.EXPLORE_BACKWARD)
+        self._pending.clear()
+        self._pending_backward.clear()
+        self._repaint()
+        self._last_repaint = time.perf_counter()
+        self.elapsed += self._last_repaint - t1
+
+    def _throttle(self) -> None:
+        if len(self._pending) + len(self._pending_backward) >= self._every_n or \
+                time.perf_counter() - self._last_repaint >= self._every_s:
+            self.flush()
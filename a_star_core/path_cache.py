@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Tuple, Union
+
+from a_star_core.grid import Grid
+from a_star_core.utils import Location
+
+
+class CachedPath(NamedTuple):
+    path: List[Location]
+    len_of_path: int
+    # time of the search which found the path
+    time: float
+
+
+class PathCache:
+    """
+    Bounded cache of the search results of one grid, the least recently used path is evicted first.
+    The results are keyed by the version of the grid, so any change of the maze invalidate them
+    """
+
+    def __init__(self, grid: Grid, maxsize: int = 128):
+        self._grid = grid
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, CachedPath]" = OrderedDict()
+        self._version: int = grid.version
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def get(self, start: Location, goal: Location, heuristic: Callable[[Location], Callable[[Location], float]],
+            allow_diagonal: bool) -> Union[CachedPath, None]:
+        key = self._key(start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+        cached = self._entries.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return cached
+
+    def put(self, start: Location, goal: Location, heuristic: Callable[[Location], Callable[[Location], float]],
+            allow_diagonal: bool, path: List[Location], time: float) -> CachedPath:
+        """
+        :param path: the path found by the search, empty if there is no solution
+        """
+        key = self._key(start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+        cached = CachedPath(path=list(path), len_of_path=len(path), time=time)
+        self._entries[key] = cached
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return cached
+
+    def clear(self):
+        self._entries.clear()
+
+    def _key(self, start: Location, goal: Location, heuristic: Callable[[Location], Callable[[Location], float]],
+             allow_diagonal: bool) -> Tuple:
+        version = self._grid.version
+        if version != self._version:
+            # the version only grow, the entries of the previous versions can't be hit anymore
+            self._entries.clear()
+            self._version = version
+        return version, start, goal, heuristic, allow_diagonal
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
@@ -0,0 +1,135 @@
+import multiprocessing
+from queue import Empty
+from typing import Callable, List, NamedTuple, Union
+
+import numpy as np
+
+from a_star_core.astar import AStar
+from a_star_core.grid import Grid
+from a_star_core.observer import SearchObserver
+from a_star_core.stats import SearchStats
+from a_star_core.utils import Location
+
+
+class Progress(NamedTuple):
+    # locations expanded since the previous message
+    expanded: List[Location]
+    # the last message of the search, with its result
+    done: bool = False
+    path: Union[List[Location], None] = None
+    time: float = 0.0
+    stats: Union[SearchStats, None] = None
+
+
+class SearchWorker:
+    """
+    A* search in a separate process, on a snapshot of the grid taken when the worker is created,
+    so the process of the GUI only has to read the progress from a queue every frame.
+    The expanded locations are sent in batches, then the path in the last message
+    """
+
+    def __init__(self, grid: Grid, start: Location, goal: Location,
+                 heuristic: Callable[[Location], Callable[[Location], float]], allow_diagonal: bool,
+                 batch_size: int = 500):
+        """
+        :param heuristic: module level heuristic factory (it is sent to the worker), like manhattan_distance
+        :param batch_size: number of expanded locations per message
+        """
+        self._queue = multiprocessing.Queue()
+        self._cancelled = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_work, daemon=True,
+            args=(grid.grid.copy(), grid.neighbors.copy(), start, goal, heuristic, allow_diagonal, batch_size,
+                  self._queue, self._cancelled))
+        self._process.start()
+        self._done = False
+        self._path: List[Location] = []
+        self._time: float = 0.0
+        self._len_of_path: int = 0
+        self._stats: Union[SearchStats, None] = None
+
+    def poll(self) -> List[Progress]:
+        """
+        Read the messages already sent by the worker, without waiting
+        """
+        messages: List[Progress] = []
+        while not self._done:
+            try:
+                progress: Progress = self._queue.get_nowait()
+            except Empty:
+                break
+            messages.append(progress)
+            if progress.done:
+                self._finish(progress)
+        return messages
+
+    def cancel(self):
+        if self._done:
+            return
+        self._done = True
+        self._cancelled.set()
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._queue.close()
+
+    def _finish(self, progress: Progress):
+        self._done = True
+        self._path = progress.path or []
+        self._len_of_path = len(self._path)
+        self._time = progress.time
+        self._stats = progress.stats
+        self._process.join()
+        self._queue.close()
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def time(self):
+        return self._time
+
+    @property
+    def len_of_path(self):
+        return self._len_of_path
+
+    @property
+    def path(self) -> List[Location]:
+        return self._path
+
+    @property
+    def stats(self) -> Union[SearchStats, None]:
+        return self._stats
+
+
+class _BatchObserver(SearchObserver):
+    # collect the expanded locations, the worker send them after every step
+    def __init__(self):
+        super().__init__()
+        self.expanded: List[Location] = []
+
+    def on_expand(self, location: Location) -> None:
+        self.expanded.append(location)
+
+
+def _work(cells: np.ndarray, neighbors: np.ndarray, start: Location, goal: Location,
+          heuristic: Callable[[Location], Callable[[Location], float]], allow_diagonal: bool, batch_size: int,
+          queue: multiprocessing.Queue, cancelled):
+    grid = Grid.from_array(grid=cells, neighbors=neighbors)
+    observer = _BatchObserver()
+    search = AStar(heuristic=heuristic(goal), successor=grid.successor,
+                   goal_check=lambda location: location == goal,
+                   start=start, allow_diagonal=allow_diagonal, observer=observer)
+    search.begin()
+    while not search.step(expansions=batch_size):
+        if cancelled.is_set():
+            search.cancel()
+            # nobody read the queue anymore, don't wait for it before exiting
+            queue.cancel_join_thread()
+            return
+        queue.put(Progress(expanded=observer.expanded))
+        observer.expanded = []
+    queue.put(Progress(expanded=observer.expanded, done=True, path=search.path or None, time=search.time,
+                       stats=search.stats))
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchStats:
+    """
+    Counters and timings of one search run.
+    The successor and heuristic times are only measured when the search is profiled,
+    they are part of the search time; the rendering time is not
+    """
+    expanded: int = 0
+    pushes: int = 0
+    # locations pushed again after they were expanded, because a shorter way to them was found
+    reopened: int = 0
+    heuristic_calls: int = 0
+    peak_frontier: int = 0
+    peak_explored: int = 0
+    search_time: float = 0.0
+    successor_time: float = 0.0
+    heuristic_time: float = 0.0
+    render_time: float = 0.0
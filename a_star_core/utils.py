@@ -17,6 +17,7 @@ class Cell(Tuple, Enum):
     GARY = (220, 220, 220)
     PATH = (119, 214, 140)
     EXPLORE = (121, 119, 214)
+    EXPLORE_BACKWARD = (119, 189, 214)
     GOAL = (204, 60, 100)
     START = (255, 153, 0)
 
@@ -1,12 +1,15 @@
-from typing import Callable, List, Dict
+from typing import Callable, List, Union
 
-from a_star_terminal.utils import (PriorityQueue, Node,
+import numpy as np
+
+from a_star_core import AStar, BidirectionalAStar, Frontier, BinaryHeapFrontier, JumpPointSearch
+from a_star_terminal.utils import (Node,
                                    Location)
 
 
 def a_star(start: Location, goal_check: Callable[[Location], bool],
            successor: Callable[[Location, bool], List[Location]], heuristic: Callable[[Location], float],
-           allow_diagonal: bool):
+           allow_diagonal: bool, frontier: Callable[[], Frontier] = BinaryHeapFrontier):
     """
     Implementation of A* algorithms
     :param start: start location
@@ -14,19 +17,58 @@ def a_star(start: Location, goal_check: Callable[[Location], bool],
     :param successor: reference of method to get all the available location from giving location
     :param heuristic: reference of method to get the heuristic cost of giving location to goal location
     :param allow_diagonal: allow for diagonal movement
-    :return:
-    """
-    frontier = PriorityQueue()
-    node = Node(start, None, 0, heuristic(start))
-    frontier.push(node)
-    explored: Dict[Location, int] = {start: 0}
-    while not frontier.empty:
-        current_node = frontier.pop()
-        if goal_check(current_node.location):
-            return current_node
-        for child in successor(current_node.location, allow_diagonal=allow_diagonal):
-            new_cost = current_node.cost + 1
-            if child not in explored or explored[child] > new_cost:
-                frontier.push(Node(child, current_node, new_cost, heuristic(child)))
-                explored[child] = new_cost
-    return None
+    :param frontier: the open list implementation, BinaryHeapFrontier, BucketFrontier or IndexedHeapFrontier
+    :return: the goal Node, path_to_node give the full path
+    """
+    search = AStar(heuristic=heuristic, successor=successor, goal_check=goal_check, start=start,
+                   allow_diagonal=allow_diagonal, frontier=frontier)
+    search.start()
+    return _path_to_node(search.path or None, heuristic)
+
+
+def jump_point_search(start: Location, goal: Location, passable: np.ndarray,
+                      heuristic: Callable[[Location], float], allow_diagonal: bool):
+    """
+    Jump Point Search, give the same path length as a_star on the uniform cost maze
+    :param start: start location
+    :param goal: goal location
+    :param passable: boolean array of the cells which are not BLOCK
+    :param heuristic: reference of method to get the heuristic cost of giving location to goal location
+    :param allow_diagonal: allow for diagonal movement
+    :return: the goal Node, path_to_node give the full path
+    """
+    path = JumpPointSearch(passable=passable).search(start=start, goal=goal, heuristic=heuristic,
+                                                     allow_diagonal=allow_diagonal)
+    return _path_to_node(path, heuristic)
+
+
+def bidirectional_a_star(start: Location, goal: Location,
+                         successor: Callable[[Location, bool], List[Location]],
+                         heuristic: Callable[[Location], Callable[[Location], float]],
+                         allow_diagonal: bool):
+    """
+    A* from the start and from the goal at the same time, give the same path length as a_star
+    :param start: start location
+    :param goal: goal location
+    :param successor: reference of method to get all the available location from giving location
+    :param heuristic: heuristic factory like manhattan_distance, it is built for the start and the goal
+    :param allow_diagonal: allow for diagonal movement
+    :return: the goal Node, path_to_node give the full path
+    """
+    search = BidirectionalAStar(heuristic=heuristic, successor=successor, start=start, goal=goal,
+                                allow_diagonal=allow_diagonal)
+    search.start()
+    return _path_to_node(search.path or None, heuristic(goal))
+
+
+def _path_to_node(path: Union[List[Location], None], heuristic: Callable[[Location], float]):
+    """
+    Chain the locations of the path into Nodes
+    :return: the goal Node
+    """
+    if path is None:
+        return None
+    node = None
+    for cost, location in enumerate(path):
+        node = Node(location, node, cost, heuristic(location))
+    return node
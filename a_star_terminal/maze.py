@@ -1,21 +1,19 @@
-import random
 from typing import List
 
+import numpy as np
+
 from a_star_terminal.a_star import a_star
-from a_star_terminal.utils import (Location, Cell, euclidean_distance,
-                                   manhattan_distance, Node, path_to_node, chebyshev_distance)
+from a_star_terminal.utils import (Location, euclidean_distance,
+                                   manhattan_distance, Node, path_to_node, chebyshev_distance,
+                                   CELLS, Grid, BLOCK, PATH)
 
 
 class Maze:
     def __init__(self, rows: int, columns: int, start_location: Location, goal_location: Location):
-        self._rows = rows
-        self._columns = columns
-        self._start: Location = start_location
-        self._goal: Location = goal_location
-        self._grid = [[Cell.EMPTY for _ in range(columns)]
-                      for _ in range(rows)]
-        self._grid[start_location.row][start_location.column] = Cell.START
-        self._grid[goal_location.row][goal_location.column] = Cell.GOAL
+        # the cells and their neighbors are the ones of the core grid, the terminal only print it
+        self._grid: Grid = Grid(rows=rows, columns=columns)
+        self._grid.start = start_location
+        self._grid.goal = goal_location
         self._fill_random()
 
     def successor(self, location: Location, allow_diagonal=False) -> List[Location]:
@@ -25,35 +23,15 @@ class Maze:
         :param location
         :return: list of available location
         """
-        list_of_neighbor: List[Location] = []
-        if location.column - 1 >= 0 and self._grid[location.row][location.column - 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row, location.column - 1))
-        if location.row + 1 < self._rows and self._grid[location.row + 1][location.column] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row + 1, location.column))
-        if location.column + 1 < self._columns and self._grid[location.row][location.column + 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row, location.column + 1))
-        if location.row - 1 >= 0 and self._grid[location.row - 1][location.column] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row - 1, location.column))
-            # Check for diagonal neighbor if possible
-        if not allow_diagonal:
-            return list_of_neighbor
-        # top-right
-        if (location.column - 1 >= 0 and location.row + 1 < self._rows) and self._grid[
-            location.row + 1][location.column - 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row + 1, location.column - 1))
-        # bottom-right
-        if (location.column + 1 < self._columns and location.row + 1 < self._rows) and self._grid[
-            location.row + 1][location.column + 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row + 1, location.column + 1))
-        # bottom - left
-        if (location.column + 1 < self._columns and location.row - 1 >= 0) and self._grid[
-            location.row - 1][location.column + 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row - 1, location.column + 1))
-        # top-left
-        if (location.column - 1 >= 0 and location.row - 1 >= 0) and self._grid[
-            location.row - 1][location.column - 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row - 1, location.column - 1))
-        return list_of_neighbor
+        return self._grid.successor(location, allow_diagonal)
+
+    @property
+    def passable(self) -> np.ndarray:
+        """
+        Boolean array of the cells which are not BLOCK
+        :return: np.ndarray
+        """
+        return self._grid.grid != BLOCK
 
     def goal_check(self, location: Location) -> bool:
         """
@@ -61,36 +39,33 @@ class Maze:
         :param location
         :return: bool
         """
-        return self._goal == location
+        return self._grid.check_goal(location)
 
     def mark(self, paths: List[Location]):
         """
-        Mark all the location in path as PATH
+        Mark all the location in path as PATH, the start and the goal are kept
         :param paths: List of location
         """
         for location in paths:
-            self._grid[location.row][location.column] = Cell.PATH
-        self._grid[self._start.row][self._start.column] = Cell.START
-        self._grid[self._goal.row][self._goal.column] = Cell.GOAL
+            self._grid.mark(location, PATH)
 
     def __str__(self):
         """
         represent maze in the terminal
         :return: maze representation: str
         """
-        output = ""
-        for row in self._grid:
-            output += "".join([cell.value for cell in row]) + "\n"
-        return output
+        grid = self._grid.grid
+        characters = np.array([ord(cell.value) for cell in CELLS], dtype=np.uint8)
+        output = np.empty((grid.shape[0], grid.shape[1] + 1), dtype=np.uint8)
+        output[:, :-1] = characters[grid]
+        output[:, -1] = ord("\n")
+        return output.tobytes().decode("ascii")
 
     def _fill_random(self):
         """
         Create random block, each cell have 0.2 chance to be BLOCK
         """
-        for i, row in enumerate(self._grid):
-            for j, value in enumerate(row):
-                if value == Cell.EMPTY and random.uniform(0, 1) < 0.2:
-                    self._grid[i][j] = Cell.BLOCK
+        self._grid.fill_random(spread=0.2)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,224 @@
+"""
+Headless and reproducible benchmark of the search engines.
+
+Run the matrix of seeded mazes and save the result:
+    python benchmark.py run --output baseline.json
+Compare a new run against a saved baseline, the exit code is 1 if a case regressed:
+    python benchmark.py run --output current.json
+    python benchmark.py compare baseline.json current.json --threshold 0.2
+"""
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from a_star_core.astar import AStar
+from a_star_core.bidirectional import BidirectionalAStar
+from a_star_core.bitset_bfs import BitsetBFS
+from a_star_core.flat_astar import FlatAStar
+from a_star_core.grid import Grid, BLOCK
+from a_star_core.hpa import HierarchicalAStar
+from a_star_core.jps import JumpPointSearch
+from a_star_core.utils import Location, manhattan_distance, euclidean_distance, chebyshev_distance
+
+HEURISTICS: Dict[str, Callable[[Location], Callable[[Location], float]]] = {
+    "manhattan": manhattan_distance,
+    "euclidean": euclidean_distance,
+    "chebyshev": chebyshev_distance,
+}
+
+
+def _run_astar(grid: Grid, heuristic: str, allow_diagonal: bool):
+    search = AStar(heuristic=HEURISTICS[heuristic](grid.goal), successor=grid.successor,
+                   goal_check=grid.check_goal, start=grid.start, allow_diagonal=allow_diagonal)
+    search.start()
+    return search
+
+
+def _run_flat(grid: Grid, heuristic: str, allow_diagonal: bool):
+    search = FlatAStar(grid)
+    search.search(start=grid.start, goal=grid.goal, heuristic=HEURISTICS[heuristic](grid.goal),
+                  allow_diagonal=allow_diagonal)
+    return search
+
+
+def _run_jps(grid: Grid, heuristic: str, allow_diagonal: bool):
+    search = JumpPointSearch(passable=grid.grid != BLOCK)
+    search.search(start=grid.start, goal=grid.goal, heuristic=HEURISTICS[heuristic](grid.goal),
+                  allow_diagonal=allow_diagonal)
+    return search
+
+
+def _run_bidirectional(grid: Grid, heuristic: str, allow_diagonal: bool):
+    search = BidirectionalAStar(heuristic=HEURISTICS[heuristic], successor=grid.successor,
+                                start=grid.start, goal=grid.goal, allow_diagonal=allow_diagonal)
+    search.start()
+    return search
+
+
+def _run_hpa(grid: Grid, heuristic: str, allow_diagonal: bool):
+    # the abstraction is built by the search, so its cost is part of every run
+    search = HierarchicalAStar(grid)
+    search.search(start=grid.start, goal=grid.goal, heuristic=HEURISTICS[heuristic](grid.goal),
+                  allow_diagonal=allow_diagonal)
+    search.close()
+    return search
+
+
+def _run_bitset(grid: Grid, heuristic: str, allow_diagonal: bool):
+    # every move cost 1, the breadth first search doesn't use the heuristic
+    search = BitsetBFS(passable=grid.grid != BLOCK)
+    search.search(start=grid.start, goal=grid.goal, allow_diagonal=allow_diagonal)
+    return search
+
+
+# the HierarchicalAStar of the last maze, kept between the runs
+_hpa_search: Dict[str, Tuple[Grid, HierarchicalAStar]] = {}
+
+
+def _run_hpa_warm(grid: Grid, heuristic: str, allow_diagonal: bool):
+    # the abstraction is kept between the runs, like an application answering many queries on the same maze:
+    # only the first run of a case pay for it, the wall time (the fastest run) is the one of a warm search
+    if "last" not in _hpa_search or _hpa_search["last"][0] is not grid:
+        if "last" in _hpa_search:
+            _hpa_search["last"][1].close()
+        _hpa_search["last"] = grid, HierarchicalAStar(grid)
+    search = _hpa_search["last"][1]
+    search.search(start=grid.start, goal=grid.goal, heuristic=HEURISTICS[heuristic](grid.goal),
+                  allow_diagonal=allow_diagonal)
+    return search
+
+
+ENGINES: Dict[str, Callable] = {
+    "astar": _run_astar,
+    "flat": _run_flat,
+    "jps": _run_jps,
+    "bidirectional": _run_bidirectional,
+    "hpa": _run_hpa,
+    "hpa_warm": _run_hpa_warm,
+    "bitset": _run_bitset,
+}
+
+
+def make_grid(size: int, density: float, seed: int) -> Grid:
+    """
+    Square maze with seeded random blocks, the search goes from the top left to the bottom right corner
+    """
+    grid = Grid(rows=size, columns=size)
+    grid.fill_random(spread=density, seed=seed)
+    grid.start = Location(0, 0)
+    grid.goal = Location(size - 1, size - 1)
+    return grid
+
+
+def run_case(grid: Grid, engine: str, heuristic: str, allow_diagonal: bool, repeat: int) -> Dict:
+    run = ENGINES[engine]
+    times: List[float] = []
+    search = None
+    for _ in range(repeat):
+        t1 = time.perf_counter()
+        search = run(grid, heuristic, allow_diagonal)
+        times.append(time.perf_counter() - t1)
+    # tracemalloc slow down the search, so the memory is measured by its own run
+    tracemalloc.start()
+    run(grid, heuristic, allow_diagonal)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_time": min(times),
+        "median_time": statistics.median(times),
+        "expanded": search.expanded,
+        "peak_frontier": search.peak_frontier,
+        "peak_memory": peak_memory,
+        "len_of_path": search.len_of_path,
+    }
+
+
+def run(sizes: List[int], densities: List[float], heuristics: List[str], diagonals: List[bool],
+        engines: List[str], seed: int, repeat: int) -> Dict:
+    cases: List[Dict] = []
+    for size, density in itertools.product(sizes, densities):
+        grid = make_grid(size=size, density=density, seed=seed)
+        for heuristic, allow_diagonal, engine in itertools.product(heuristics, diagonals, engines):
+            case = {"size": size, "density": density, "heuristic": heuristic,
+                    "allow_diagonal": allow_diagonal, "engine": engine}
+            case.update(run_case(grid=grid, engine=engine, heuristic=heuristic,
+                                 allow_diagonal=allow_diagonal, repeat=repeat))
+            print(json.dumps(case), file=sys.stderr)
+            cases.append(case)
+    return {"seed": seed, "repeat": repeat, "python": platform.python_version(),
+            "machine": platform.machine(), "cases": cases}
+
+
+def _case_key(case: Dict) -> Tuple:
+    return case["size"], case["density"], case["heuristic"], case["allow_diagonal"], case["engine"]
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """
+    :return: description of every case slower than the baseline by more than threshold (0.2 = 20%),
+    or expanding more nodes
+    """
+    regressions: List[str] = []
+    baseline_cases = {_case_key(case): case for case in baseline["cases"]}
+    for case in current["cases"]:
+        previous = baseline_cases.get(_case_key(case))
+        if previous is None:
+            continue
+        name = "size={} density={} heuristic={} diagonal={} engine={}".format(*_case_key(case))
+        if case["wall_time"] > previous["wall_time"] * (1 + threshold):
+            regressions.append(f"{name}: wall time {previous['wall_time']:.4f}s -> {case['wall_time']:.4f}s")
+        if case["expanded"] > previous["expanded"]:
+            regressions.append(f"{name}: expanded {previous['expanded']} -> {case['expanded']}")
+    return regressions
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the search engines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark matrix")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300])
+    run_parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.3])
+    run_parser.add_argument("--heuristics", nargs="+", choices=list(HEURISTICS), default=list(HEURISTICS))
+    run_parser.add_argument("--diagonal", choices=["no", "yes", "both"], default="both")
+    run_parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", help="json file of the result, stdout by default")
+
+    compare_parser = commands.add_parser("compare", help="compare a result with a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    options = parser.parse_args(arguments)
+    if options.command == "run":
+        diagonals = {"no": [False], "yes": [True], "both": [False, True]}[options.diagonal]
+        result = run(sizes=options.sizes, densities=options.densities, heuristics=options.heuristics,
+                     diagonals=diagonals, engines=options.engines, seed=options.seed, repeat=options.repeat)
+        if options.output:
+            with open(options.output, "w") as file:
+                json.dump(result, file, indent=2)
+        else:
+            print(json.dumps(result, indent=2))
+        return 0
+
+    with open(options.baseline) as file:
+        baseline = json.load(file)
+    with open(options.current) as file:
+        current = json.load(file)
+    regressions = compare(baseline=baseline, current=current, threshold=options.threshold)
+    for regression in regressions:
+        print(regression)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
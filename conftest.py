@@ -0,0 +1 @@
+# the packages are at the root of the repository, pytest put this directory on the path for the tests
@@ -1,42 +1,48 @@
-import pygame
+WIDTH = 1200
+HEIGHT = 800
+FPS = 60
 
-from maze import Maze
-from maze_controller import MazeController
-from search_controller import SearchController
-from utils import Cell
 
-# init
+def main():
+    # pygame is only imported by the interface, the worker processes started from it (which import
+    # this module again on the platforms spawning them) don't load it
+    import pygame
 
-pygame.init()
-WIDTH = 1200
-HEIGHT = 800
-display_surface = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("A Star Algorithms")
+    from maze import Maze
+    from maze_controller import MazeController
+    from search_controller import SearchController
 
-FPS = 60
-clock = pygame.time.Clock()
+    # init
+
+    pygame.init()
+    display_surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("A Star Algorithms")
+
+    clock = pygame.time.Clock()
+
+    maze: Maze = Maze(rows=600, columns=1200, grid_size=20,
+                      x_offset=0, y_offset=200, display_surface=display_surface)
+    maze_controller: MazeController = MazeController(maze=maze, display_surface=display_surface)
+    search_controller: SearchController = SearchController(maze=maze, display_surface=display_surface)
 
-maze: Maze = Maze(rows=600, columns=1200, grid_size=20,
-                  x_offset=0, y_offset=200, display_surface=display_surface)
-maze_controller: MazeController = MazeController(maze=maze, display_surface=display_surface)
-search_controller: SearchController = SearchController(maze=maze, display_surface=display_surface)
+    # main loop
+    running = True
+    while running:
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
 
-# main loop
-running = True
-while running:
-    events = pygame.event.get()
-    for event in events:
-        if event.type == pygame.QUIT:
-            running = False
+        search_controller.update(events=events)
+        maze_controller.update(events=events)
 
-    search_controller.update(events=events)
-    maze_controller.update(events=events)
+        # only the panel and the changed cells of the maze are pushed to the screen
+        panel_rect = search_controller.draw()
+        pygame.display.update([panel_rect] + maze.draw())
+        clock.tick(FPS)
 
-    display_surface.fill(Cell.WHITE)
-    search_controller.draw()
-    maze.draw()
+    pygame.quit()
 
-    pygame.display.update()
-    clock.tick(FPS)
 
-pygame.quit()
+if __name__ == '__main__':
+    main()
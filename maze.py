@@ -1,12 +1,22 @@
-import random
-from typing import List
+from typing import Dict, List, Set, Union
 
+import numpy as np
 import pygame
 
-from utils import Cell, Location
+from a_star_core import grid
+from a_star_core.grid import Grid
+from a_star_core.utils import Cell, Location
 
+# the color of every state stored in the grid
+CELLS: List[Cell] = [Cell.WHITE, Cell.BLOCK, Cell.START, Cell.GOAL,
+                     Cell.EXPLORE, Cell.PATH, Cell.EXPLORE_BACKWARD]
+CELL_STATES: Dict[Cell, int] = {Cell.WHITE: grid.EMPTY, Cell.BLOCK: grid.BLOCK,
+                                Cell.START: grid.START, Cell.GOAL: grid.GOAL,
+                                Cell.EXPLORE: grid.EXPLORE, Cell.PATH: grid.PATH,
+                                Cell.EXPLORE_BACKWARD: grid.EXPLORE_BACKWARD}
 
-class Maze:
+
+class Maze(Grid):
     """
     Representing Maze in pygame
     """
@@ -18,65 +28,41 @@ class Maze:
         self.x = columns
         self.y = rows
         self._grid_size: int = grid_size
-        self._rows: int = self.x // self._grid_size
-        self._columns: int = self.y // self._grid_size
+        super().__init__(rows=self.x // self._grid_size, columns=self.y // self._grid_size)
         self._x_offset: int = x_offset
         self._y_offset: int = y_offset
         self._start: Location = start
         self._goal: Location = goal
         self.display_surface = display_surface
-
-        self._grid = [[Cell.WHITE for _ in range(self._columns)]
-                      for _ in range(self._rows)]
-
-    def check_goal(self, location: Location) -> bool:
-        return self._goal == location
-
-    def successor(self, location: Location, allow_diagonal=False) -> List[Location]:
-        list_of_neighbor: List[Location] = []
-        # the order: Top, Right, Bottom, Left
-        if location.column - 1 >= 0 and self._grid[location.row][location.column - 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row, location.column - 1))
-        if location.row + 1 < self._rows and self._grid[location.row + 1][location.column] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row + 1, location.column))
-        if location.column + 1 < self._columns and self._grid[location.row][location.column + 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row, location.column + 1))
-        if location.row - 1 >= 0 and self._grid[location.row - 1][location.column] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row - 1, location.column))
-        # Check for diagonal neighbor if possible
-        if not allow_diagonal:
-            return list_of_neighbor
-        # top-right
-        if (location.column - 1 >= 0 and location.row + 1 < self._rows) and self._grid[
-            location.row + 1][location.column - 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row + 1, location.column - 1))
-        # bottom-right
-        if (location.column + 1 < self._columns and location.row + 1 < self._rows) and self._grid[
-            location.row + 1][location.column + 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row + 1, location.column + 1))
-        # bottom - left
-        if (location.column + 1 < self._columns and location.row - 1 >= 0) and self._grid[
-            location.row - 1][location.column + 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row - 1, location.column + 1))
-        # top-left
-        if (location.column - 1 >= 0 and location.row - 1 >= 0) and self._grid[
-            location.row - 1][location.column - 1] != Cell.BLOCK:
-            list_of_neighbor.append(Location(location.row - 1, location.column - 1))
-
-        return list_of_neighbor
+        # the grid lines never change, so they are drawn once on the background
+        self._background: pygame.Surface = pygame.Surface((self.x + 1, self.y + 1))
+        self._background.fill(Cell.WHITE)
+        self._draw_vertical_line(surface=self._background)
+        self._draw_horizontal_line(surface=self._background)
+        # cells changed since the last draw
+        self._dirty: Set[Location] = set()
+        self._redraw_all: bool = True
 
     def mark(self, location: Location, color: Cell) -> None:
-        value = self._grid[location.row][location.column]
-        if value != Cell.START and value != Cell.GOAL:
-            self._grid[location.row][location.column] = color
-
-    def draw(self):
-        # vertical line
-        self._draw_vertical_line()
-        # horizontal line
-        self._draw_horizontal_line()
-
-        self._draw_occupied_place()
+        super().mark(location=location, state=CELL_STATES[color])
+        self._dirty.add(location)
+
+    def draw(self) -> List[pygame.Rect]:
+        """
+        Draw the cells changed since the last draw, or the whole maze after a bulk change
+        :return: the changed rectangles of the screen, to be passed to pygame.display.update
+        """
+        if self._redraw_all:
+            self._redraw_all = False
+            self._dirty.clear()
+            self.display_surface.blit(self._background, (self._x_offset, self._y_offset))
+            self._draw_occupied_place()
+            return [pygame.Rect(self._x_offset, self._y_offset, self.x + 1, self.y + 1)]
+        rects: List[pygame.Rect] = [self._draw_rect(x=location.row, y=location.column,
+                                                    value=CELLS[self._grid.item(location.row, location.column)])
+                                    for location in self._dirty]
+        self._dirty.clear()
+        return rects
 
     @property
     def start(self) -> Location:
@@ -84,14 +70,9 @@ class Maze:
 
     @start.setter
     def start(self, location: Location):
-        start: Location = self._normalize_location(location=location)  # Location will
-        # Check the boundary before assign
-        if not self._check_boundary(location=start):
-            return None
-        self._start = start
-        # check if there are start point in grid before adding the new one
-        self._change_location_state(from_state=Cell.START, to=Cell.WHITE)
-        self._grid[self._start.row][self._start.column] = Cell.START
+        previous: Location = self._start
+        Grid.start.fset(self, self._normalize_location(location=location))
+        self._add_dirty(previous, self._start)
 
     @property
     def goal(self) -> Location:
@@ -99,59 +80,57 @@ class Maze:
 
     @goal.setter
     def goal(self, location: Location):
+        previous: Location = self._goal
+        Grid.goal.fset(self, self._normalize_location(location=location))
+        self._add_dirty(previous, self._goal)
+
+    def add_goal(self, location: Location):
+        goal: Location = self._normalize_location(location=location)
+        super().add_goal(location=goal)
+        if self._check_boundary(location=goal):
+            self._dirty.add(goal)
+
+    def remove_goal(self, location: Location) -> bool:
         goal: Location = self._normalize_location(location=location)
-        # check for boundary before assign
-        if not self._check_boundary(location=goal):
-            return None
-        self._goal = goal
-        self._change_location_state(from_state=Cell.GOAL, to=Cell.WHITE)
-        self._grid[self._goal.row][self._goal.column] = Cell.GOAL
+        removed = super().remove_goal(location=goal)
+        if removed:
+            self._dirty.add(goal)
+        return removed
 
     def block(self, location: Location, to: Cell = Cell.BLOCK):
         block: Location = self._normalize_location(location=location)
-        # check for boundary before assign
-        if not self._check_boundary(location=block):
-            return None
-        if self._grid[block.row][block.column] == Cell.WHITE or self._grid[block.row][block.column] == Cell.BLOCK:
-            self._grid[block.row][block.column] = to
+        super().block(location=block, to=CELL_STATES[to])
+        if self._check_boundary(location=block):
+            self._dirty.add(block)
 
     def erase_maze(self):
-        self._grid = [[Cell.WHITE for _ in range(self._columns)]
-                      for _ in range(self._rows)]
+        super().erase_maze()
+        self._redraw_all = True
 
     def clear_maze(self):
-        for i, row in enumerate(self._grid):
-            for j, value in enumerate(row):
-                if value == Cell.EXPLORE or value == Cell.PATH:
-                    self._grid[i][j] = Cell.WHITE
-
-    def fill_random(self, spread: float = 0.2):
-        for i, row in enumerate(self._grid):
-            for j, value in enumerate(row):
-                if value == Cell.WHITE and random.uniform(0, 1) < spread:
-                    self._grid[i][j] = Cell.BLOCK
-                    self.draw()
-                    pygame.display.update()
-
-    def _draw_horizontal_line(self):
+        super().clear_maze()
+        self._redraw_all = True
+
+    def fill_random(self, spread: float = 0.2, seed: Union[int, None] = None):
+        super().fill_random(spread=spread, seed=seed)
+        self._redraw_all = True
+
+    def _add_dirty(self, *locations: Union[Location, None]):
+        for location in locations:
+            if location is not None:
+                self._dirty.add(location)
+
+    def _draw_horizontal_line(self, surface: pygame.Surface):
         # Draw Horizontal Line
         for i in range(self._columns + 1):
-            pygame.draw.line(self.display_surface, Cell.GARY,
-                             (self._x_offset, i * self._grid_size + self._y_offset),
-                             (self._x_offset + self.x, (i * self._grid_size) + self._y_offset))
+            pygame.draw.line(surface, Cell.GARY,
+                             (0, i * self._grid_size), (self.x, i * self._grid_size))
 
-    def _draw_vertical_line(self):
+    def _draw_vertical_line(self, surface: pygame.Surface):
         # Draw Vertical Line
         for i in range(self._rows + 1):
-            pygame.draw.line(self.display_surface, Cell.GARY,
-                             (i * self._grid_size + self._x_offset, self._y_offset),
-                             (i * self._grid_size + self._x_offset, self._y_offset + self.y))
-
-    def _change_location_state(self, from_state: Cell, to: Cell):
-        for i, row in enumerate(self._grid):
-            for j, value in enumerate(row):
-                if value == from_state:
-                    self._grid[i][j] = to
+            pygame.draw.line(surface, Cell.GARY,
+                             (i * self._grid_size, 0), (i * self._grid_size, self.y))
 
     def _normalize_location(self, location: Location) -> Location:
         x = (location.row - self._x_offset) // self._grid_size
@@ -159,18 +138,13 @@ class Maze:
         return Location(x, y)
 
     def _draw_occupied_place(self):
-        for i, row in enumerate(self._grid):
-            for j, value in enumerate(row):
-                if value is not Cell.WHITE:
-                    self._draw_rect(x=i, y=j, value=value)
+        rows, columns = np.nonzero(self._grid)
+        states = self._grid[rows, columns]
+        for i, j, state in zip(rows.tolist(), columns.tolist(), states.tolist()):
+            self._draw_rect(x=i, y=j, value=CELLS[state])
 
-    def _draw_rect(self, x: int, y: int, value: Cell):
+    def _draw_rect(self, x: int, y: int, value: Cell) -> pygame.Rect:
         rect_x = (x * self._grid_size) + self._x_offset
         rect_y = (y * self._grid_size) + self._y_offset
-        pygame.draw.rect(self.display_surface, value,
-                         (rect_x + 1, rect_y + 1, self._grid_size - 1, self._grid_size - 1))
-
-    def _check_boundary(self, location: Location):
-        if 0 <= location.row < self._rows and 0 <= location.column < self._columns:
-            return True
-        return False
+        return pygame.draw.rect(self.display_surface, value,
+                                (rect_x + 1, rect_y + 1, self._grid_size - 1, self._grid_size - 1))
@@ -2,14 +2,15 @@ from enum import Enum
 
 import pygame
 
+from a_star_core.utils import Location, Cell
 from maze import Maze
-from utils import Location, Cell
 
 
 class MazeControllerCommand(str, Enum):
     BLOCK = "BLOCK"
     START = "START"
     GOAL = "GOAL"
+    MORE_GOALS = "ADD OR REMOVE GOALS"
     ERASE = "ERASE"
     CLEAR = "ERASE EXPLORE AND PATH"
     FILL = "FILL"
@@ -30,6 +31,8 @@ class MazeController:
                 self._check_for_start_point(event=event)
             if self._current_command == MazeControllerCommand.GOAL:
                 self._check_for_goal_point(event=event)
+            if self._current_command == MazeControllerCommand.MORE_GOALS:
+                self._check_for_more_goals(event=event)
             if self._current_command == MazeControllerCommand.BLOCK:
                 self._check_for_block_point(event=event)
             if self._current_command == MazeControllerCommand.ERASE:
@@ -45,6 +48,8 @@ class MazeController:
             self._current_command = MazeControllerCommand.START
         if event.key == pygame.K_g:
             self._current_command = MazeControllerCommand.GOAL
+        if event.key == pygame.K_m:
+            self._current_command = MazeControllerCommand.MORE_GOALS
         if event.key == pygame.K_b:
             self._current_command = MazeControllerCommand.BLOCK
         if event.key == pygame.K_e:
@@ -64,6 +69,13 @@ class MazeController:
         if event.type == pygame.MOUSEBUTTONUP:
             self._maze.goal = (Location(row=event.pos[0], column=event.pos[1]))
 
+    def _check_for_more_goals(self, event: pygame.event):
+        # press 'm' and mouse click, then add a goal to maze, or remove it if it is already a goal
+        if event.type == pygame.MOUSEBUTTONUP:
+            location = Location(row=event.pos[0], column=event.pos[1])
+            if not self._maze.remove_goal(location=location):
+                self._maze.add_goal(location=location)
+
     def _check_for_block_point(self, event: pygame.event):
         if event.type == pygame.MOUSEMOTION and event.buttons[0]:
             self._maze.block(location=Location(event.pos[0], column=event.pos[1]))
@@ -1,12 +1,28 @@
-from typing import Callable, Union, List, Dict
+from typing import Callable, List, Tuple, Union
 
 import pygame
 
-from astar import AStar
+from a_star_core.astar import AStar
+from a_star_core.bidirectional import BidirectionalAStar
+from a_star_core.bitset_bfs import BitsetBFS
+from a_star_core.components import ComponentIndex
+from a_star_core.dstar_lite import DStarLite
+from a_star_core.grid import BLOCK
+from a_star_core.heuristic_field import FieldCache
+from a_star_core.jps import JumpPointSearch
+from a_star_core.landmarks import LandmarkStore
+from a_star_core.multi_goal import GoalIndex, MultiGoalAStar
+from a_star_core.observer import ThrottledObserver
+from a_star_core.path_cache import CachedPath, PathCache
+from a_star_core.search_worker import SearchWorker
+from a_star_core.stats import SearchStats
+from a_star_core.utils import (Cell, manhattan_distance,
+                               euclidean_distance, Location,
+                               chebyshev_distance)
 from maze import Maze
-from utils import (Cell, manhattan_distance,
-                   euclidean_distance, Location,
-                   chebyshev_distance)
+
+# time given to the running A* search every frame, the rest of the frame is left to the rendering
+STEP_MILLISECONDS: float = 8.0
 
 
 class SearchController:
@@ -15,7 +31,29 @@ class SearchController:
         self.display_surface = display_surface
         self._heuristic: Callable[[Location], Callable[[Location], float]] = manhattan_distance
         self._font = pygame.font.SysFont("roboto", 20)
-        self._a_star: Union[AStar, None] = None
+        self._a_star: Union[AStar, JumpPointSearch, BidirectionalAStar, DStarLite, BitsetBFS, CachedPath,
+                            SearchWorker, None] = None
+        self._path_cache = PathCache(grid=maze)
+        # statistics of the last run, only the A* search collect them
+        self._stats: Union[SearchStats, None] = None
+        # kept between the runs, so the next run only repair the search after the maze edits
+        self._planner: Union[DStarLite, None] = None
+        # the A* search advanced a bit every frame, with the query it answer and the maze version it started on
+        self._running: Union[AStar, None] = None
+        self._running_observer: Union[ThrottledObserver, None] = None
+        self._running_query: Union[Tuple[Location, Location, Callable, bool], None] = None
+        self._running_version: int = 0
+        self._paused = False
+        # the A* search sent to another process, with the maze version of its snapshot
+        self._worker: Union[SearchWorker, None] = None
+        self._worker_version: int = 0
+        # tables of the landmark heuristic, built for the maze when the heuristic is used
+        self._landmarks = LandmarkStore(grid=maze)
+        self._use_landmarks = False
+        # heuristic of every cell per goal, the search read it instead of computing it
+        self._fields = FieldCache(rows=maze.rows, columns=maze.columns)
+        # connected parts of the maze, a goal in another part is rejected without searching
+        self._components = ComponentIndex(grid=maze)
 
         self._heuristic_panel = pygame.draw.rect(self.display_surface, Cell.BLOCK, (0, 0, 800, 200))
         self._statistic_panel = pygame.draw.rect(self.display_surface, Cell.BLOCK, (800, 0, 200, 1000))
@@ -32,6 +70,10 @@ class SearchController:
         self._chebyshev_rect = self._chebyshev_text.get_rect()
         self._chebyshev_rect.topleft = (self._manhattan_rect.right + 10, 135)
 
+        self._landmark_text = self._font.render("Landmarks (ALT)", True, Cell.WHITE)
+        self._landmark_rect = self._landmark_text.get_rect()
+        self._landmark_rect.topleft = (10, 165)
+
         self._time_text = self._font.render(f"Time: {0:<{6}}", True, Cell.WHITE)
         self._time_rect = self._time_text.get_rect()
         self._time_rect.topleft = (self._chebyshev_rect.right + 30, 135)
@@ -45,26 +87,78 @@ class SearchController:
         self._allow_diagonal_rect = self._allow_diagonal_text.get_rect()
         self._allow_diagonal_rect.topleft = (self._time_rect.right + 40, 135)
 
-    def draw(self):
+        self._jump_point_search = False
+        self._jump_point_text = self._font.render("Jump point search", True,
+                                                  self._toggle_color(self._jump_point_search))
+        self._jump_point_rect = self._jump_point_text.get_rect()
+        self._jump_point_rect.topleft = (self._time_rect.right + 40, 35)
+
+        self._bidirectional = False
+        self._bidirectional_text = self._font.render("Bidirectional search", True,
+                                                     self._toggle_color(self._bidirectional))
+        self._bidirectional_rect = self._bidirectional_text.get_rect()
+        self._bidirectional_rect.topleft = (self._time_rect.right + 40, 65)
+
+        self._incremental = False
+        self._incremental_text = self._font.render("Incremental (D* Lite)", True,
+                                                   self._toggle_color(self._incremental))
+        self._incremental_rect = self._incremental_text.get_rect()
+        self._incremental_rect.topleft = (self._time_rect.right + 40, 165)
+
+        self._bitset_bfs = False
+        self._bitset_bfs_text = self._font.render("Bit-parallel BFS", True, self._toggle_color(self._bitset_bfs))
+        self._bitset_bfs_rect = self._bitset_bfs_text.get_rect()
+        self._bitset_bfs_rect.topleft = (self._time_rect.right + 40, 107)
+
+    def draw(self) -> pygame.Rect:
         # Draw rect for choosing heuristic
         self._draw_heuristic_panel()
+        return self._heuristic_panel
 
     def update(self, events: pygame.event):
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
                     self._run_search()
-                # if event.key == pygame.K_p:
-                # self._run_performance_search()
+                if event.key == pygame.K_p:
+                    self._paused = not self._paused
+                if event.key == pygame.K_w:
+                    self._run_worker()
+                if event.key == pygame.K_ESCAPE:
+                    self._cancel_search()
+                    self._cancel_worker()
             if event.type == pygame.MOUSEBUTTONUP:
+                heuristic = self._heuristic
                 if self._manhattan_rect.collidepoint(event.pos):
-                    self._heuristic = manhattan_distance
+                    self._heuristic, self._use_landmarks = manhattan_distance, False
                 if self._euclidean_rect.collidepoint(event.pos):
-                    self._heuristic = euclidean_distance
+                    self._heuristic, self._use_landmarks = euclidean_distance, False
                 if self._chebyshev_rect.collidepoint(event.pos):
-                    self._heuristic = chebyshev_distance
+                    self._heuristic, self._use_landmarks = chebyshev_distance, False
+                if self._landmark_rect.collidepoint(event.pos):
+                    self._use_landmarks = True
+                    self._update_landmarks()
+                if self._heuristic is not heuristic:
+                    self._restart_search()
                 if self._allow_diagonal_rect.collidepoint(event.pos):
                     self._diagonal_movement = not self._diagonal_movement
+                    # the table of the other movement is used
+                    self._update_landmarks()
+                # only one search engine can be selected
+                if self._jump_point_rect.collidepoint(event.pos):
+                    self._jump_point_search = not self._jump_point_search
+                    self._bidirectional = self._incremental = self._bitset_bfs = False
+                if self._bidirectional_rect.collidepoint(event.pos):
+                    self._bidirectional = not self._bidirectional
+                    self._jump_point_search = self._incremental = self._bitset_bfs = False
+                if self._incremental_rect.collidepoint(event.pos):
+                    self._incremental = not self._incremental
+                    self._jump_point_search = self._bidirectional = self._bitset_bfs = False
+                if self._bitset_bfs_rect.collidepoint(event.pos):
+                    self._bitset_bfs = not self._bitset_bfs
+                    self._jump_point_search = self._bidirectional = self._incremental = False
+        self._step_search()
+        self._poll_worker()
 
     def _draw_heuristic_panel(self):
         self._heuristic_panel = pygame.draw.rect(self.display_surface, Cell.BLOCK, (0, 0, 1200, 200))
@@ -75,8 +169,22 @@ class SearchController:
         heuristic_rect.topleft = (10, 35)
 
         self._allow_diagonal_text = self._font.render("Allow diagonal movement", True, self._diagonal_color())
+        self._jump_point_text = self._font.render("Jump point search", True,
+                                                  self._toggle_color(self._jump_point_search))
+        self._bidirectional_text = self._font.render("Bidirectional search", True,
+                                                     self._toggle_color(self._bidirectional))
+        self._incremental_text = self._font.render("Incremental (D* Lite)", True,
+                                                   self._toggle_color(self._incremental))
+        self._bitset_bfs_text = self._font.render("Bit-parallel BFS", True, self._toggle_color(self._bitset_bfs))
 
-        if self._a_star:
+        if self._worker:
+            self._time_text = self._font.render("Time: worker", True, Cell.WHITE)
+            self._length_of_path_text = self._font.render(f"Length: {0}", True, Cell.WHITE)
+        elif self._running:
+            state = "paused" if self._paused else "running"
+            self._time_text = self._font.render(f"Time: {state}", True, Cell.WHITE)
+            self._length_of_path_text = self._font.render(f"Length: {0}", True, Cell.WHITE)
+        elif self._a_star:
             self._time_text = self._font.render(f"Time: {round(self._a_star.time, 3)}", True, Cell.WHITE)
             self._length_of_path_text = self._font.render(f"Length: {self._a_star.len_of_path}", True, Cell.WHITE)
         else:
@@ -98,22 +206,232 @@ class SearchController:
         self.display_surface.blit(self._euclidean_text, self._euclidean_rect)
         self.display_surface.blit(self._manhattan_text, self._manhattan_rect)
         self.display_surface.blit(self._chebyshev_text, self._chebyshev_rect)
+        self.display_surface.blit(self._landmark_text, self._landmark_rect)
         self.display_surface.blit(heuristic_text, heuristic_rect)
         self.display_surface.blit(self._time_text, self._time_rect)
         self.display_surface.blit(self._allow_diagonal_text, self._allow_diagonal_rect)
+        self.display_surface.blit(self._jump_point_text, self._jump_point_rect)
+        self.display_surface.blit(self._bidirectional_text, self._bidirectional_rect)
+        self.display_surface.blit(self._incremental_text, self._incremental_rect)
+        self.display_surface.blit(self._bitset_bfs_text, self._bitset_bfs_rect)
         self.display_surface.blit(self._length_of_path_text, self._length_of_path_rect)
+        self._draw_statistics()
+
+    def _draw_statistics(self):
+        # two columns after the search options: the counters and the time split
+        left = self._allow_diagonal_rect.right + 40
+        pygame.draw.line(self.display_surface, Cell.WHITE, (left - 10, 0), (left - 10, 200), 2)
+        stats = self._stats
+        counters = [("Expanded", stats.expanded if stats else "-"),
+                    ("Pushes", stats.pushes if stats else "-"),
+                    ("Reopened", stats.reopened if stats else "-"),
+                    ("Heuristic calls", stats.heuristic_calls if stats else "-"),
+                    ("Peak frontier", stats.peak_frontier if stats else "-"),
+                    ("Peak explored", stats.peak_explored if stats else "-")]
+        timings = [("Search", stats.search_time if stats else None),
+                   ("Successor", stats.successor_time if stats else None),
+                   ("Heuristic", stats.heuristic_time if stats else None),
+                   ("Render", stats.render_time if stats else None)]
+        # the first three lines above the horizontal line, the others below it
+        tops = [10, 35, 60, 110, 135, 160]
+        for (name, value), top in zip(counters, tops):
+            self.display_surface.blit(self._font.render(f"{name}: {value}", True, Cell.WHITE), (left, top))
+        for (name, value), top in zip(timings, tops):
+            milliseconds = f"{value * 1000:.1f} ms" if value is not None else "-"
+            self.display_surface.blit(self._font.render(f"{name}: {milliseconds}", True, Cell.WHITE),
+                                      (left + 190, top))
 
     def _run_search(self):
         # self._maze.goal = Location()
         if not self._can_run():
             print("Enter maze value first")
             return
-        heuristic = self._heuristic(self._maze.goal)
-        self._a_star = AStar(heuristic=heuristic, successor=self._maze.successor,
-                             goal_check=self._maze.check_goal,
-                             start=self._maze.start, maze=self._maze,
-                             allow_diagonal=self._diagonal_movement)
-        self._a_star.start()
+        self._cancel_search()
+        if not self._reachable(goals=self._searched_goals()):
+            return
+        self._update_landmarks()
+        heuristic = self._fields.heuristic(heuristic=self._heuristic, goal=self._maze.goal)
+        observer = ThrottledObserver(mark=self._maze.mark, repaint=self._repaint)
+        self._stats = None
+        if self._jump_point_search:
+            self._a_star = JumpPointSearch(passable=self._maze.grid != BLOCK, observer=observer)
+            self._a_star.search(start=self._maze.start, goal=self._maze.goal,
+                                heuristic=heuristic, allow_diagonal=self._diagonal_movement)
+            return
+        if self._bitset_bfs:
+            # every move cost 1, the breadth first search doesn't need the heuristic
+            self._a_star = BitsetBFS(passable=self._maze.grid != BLOCK, observer=observer)
+            self._a_star.search(start=self._maze.start, goal=self._maze.goal, allow_diagonal=self._diagonal_movement)
+            return
+        if self._bidirectional:
+            self._a_star = BidirectionalAStar(heuristic=self._heuristic, successor=self._maze.successor,
+                                              start=self._maze.start, goal=self._maze.goal,
+                                              allow_diagonal=self._diagonal_movement, observer=observer)
+            self._a_star.start()
+            self._report(self._a_star)
+            return
+        if self._incremental:
+            self._a_star = self._incremental_planner(observer=observer)
+            self._a_star.plan()
+            return
+        cached = self._path_cache.get(start=self._maze.start, goal=self._maze.goal, heuristic=self._heuristic,
+                                      allow_diagonal=self._diagonal_movement)
+        if cached is not None:
+            # the maze didn't change since the same search, show its path again
+            print(f"cached path, hits: {self._path_cache.hits} misses: {self._path_cache.misses}")
+            self._a_star = cached
+            if cached.path:
+                observer.on_path(cached.path)
+            return
+        # the main loop repaint the maze every frame, the observer only mark the cells
+        self._running_observer = ThrottledObserver(mark=self._maze.mark, repaint=lambda: None)
+        goals = self._maze.goals
+        if len(goals) > 1:
+            # one search to the closest of the goals
+            self._a_star = MultiGoalAStar(heuristic=self._heuristic, successor=self._maze.successor,
+                                          start=self._maze.start, goals=goals,
+                                          allow_diagonal=self._diagonal_movement,
+                                          observer=self._running_observer,
+                                          profile=True)
+        else:
+            self._a_star = AStar(heuristic=heuristic, successor=self._maze.successor,
+                                 goal_check=self._maze.check_goal,
+                                 start=self._maze.start,
+                                 allow_diagonal=self._diagonal_movement,
+                                 observer=self._running_observer,
+                                 profile=True)
+        self._a_star.begin()
+        self._running = self._a_star
+        self._running_query = (self._maze.start, self._maze.goal, self._heuristic, self._diagonal_movement)
+        self._running_version = self._maze.version
+        self._paused = False
+
+    def _searched_goals(self) -> List[Location]:
+        # only A* search all the goals at once, the other engines search the main goal
+        if self._jump_point_search or self._bitset_bfs or self._bidirectional or self._incremental:
+            return [self._maze.goal]
+        return self._maze.goals
+
+    def _reachable(self, goals: List[Location]) -> bool:
+        if self._components.reachable(start=self._maze.start, goals=goals, allow_diagonal=self._diagonal_movement):
+            return True
+        print("No solution found, the goal is not connected to the start")
+        self._maze.clear_maze()
+        self._a_star = CachedPath(path=[], len_of_path=0, time=0.0)
+        self._stats = None
+        return False
+
+    @staticmethod
+    def _report(search: Union[AStar, BidirectionalAStar, SearchWorker]):
+        # the engines don't print, the result of the search is shown here
+        print(f"time to take: {search.time}")
+        if not search.path:
+            print("No solution found")
+
+    def _step_search(self):
+        search = self._running
+        if search is None or self._paused:
+            return
+        if self._maze.version != self._running_version:
+            # the maze changed under the search, its result would be wrong
+            print("The maze changed, the search is cancelled")
+            self._cancel_search()
+            return
+        if not search.step(milliseconds=STEP_MILLISECONDS):
+            self._running_observer.flush()
+            return
+        self._running = None
+        self._stats = search.stats
+        self._report(search)
+        if isinstance(search, MultiGoalAStar) and search.goal is not None:
+            print(f"reached goal: {search.goal}")
+        start, goal, heuristic, allow_diagonal = self._running_query
+        self._path_cache.put(start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal,
+                             path=search.path, time=search.time)
+
+    def _run_worker(self):
+        if not self._can_run():
+            print("Enter maze value first")
+            return
+        self._cancel_search()
+        self._cancel_worker()
+        # the worker search the main goal only
+        if not self._reachable(goals=[self._maze.goal]):
+            return
+        self._update_landmarks()
+        self._stats = None
+        self._maze.clear_maze()
+        self._worker = SearchWorker(grid=self._maze, start=self._maze.start, goal=self._maze.goal,
+                                    heuristic=self._heuristic, allow_diagonal=self._diagonal_movement)
+        self._worker_version = self._maze.version
+        self._a_star = self._worker
+
+    def _poll_worker(self):
+        worker = self._worker
+        if worker is None:
+            return
+        if self._maze.version != self._worker_version:
+            # the snapshot of the worker is outdated
+            print("The maze changed, the worker is cancelled")
+            self._cancel_worker()
+            return
+        for progress in worker.poll():
+            for location in progress.expanded:
+                self._maze.mark(location, Cell.EXPLORE)
+            if progress.done:
+                for location in progress.path or []:
+                    self._maze.mark(location, Cell.PATH)
+                self._stats = progress.stats
+                self._report(worker)
+                self._worker = None
+
+    def _cancel_worker(self):
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+
+    def _cancel_search(self):
+        if self._running:
+            self._running.cancel()
+            self._running = None
+
+    def _restart_search(self):
+        # the running search start again with the new heuristic
+        search = self._running
+        if search is None:
+            return
+        search.cancel()
+        self._maze.clear_maze()
+        if isinstance(search, MultiGoalAStar):
+            search.heuristic = GoalIndex(goals=search.goals, heuristic=self._heuristic).distance
+        else:
+            search.heuristic = self._fields.heuristic(heuristic=self._heuristic, goal=self._maze.goal)
+        search.restart()
+        start, goal, _, allow_diagonal = self._running_query
+        self._running_query = (start, goal, self._heuristic, allow_diagonal)
+        self._paused = False
+
+    def _update_landmarks(self):
+        # the landmark table follow the maze and the movement, it is only built again when the blocks changed
+        if self._use_landmarks:
+            self._heuristic = self._landmarks.table(allow_diagonal=self._diagonal_movement)
+
+    def _incremental_planner(self, observer: ThrottledObserver) -> DStarLite:
+        planner = self._planner
+        if planner is None or planner.goal != self._maze.goal or planner.heuristic is not self._heuristic \
+                or planner.allow_diagonal != self._diagonal_movement:
+            # the search tree depend on the goal, a new one is needed
+            if planner:
+                planner.close()
+            planner = DStarLite(grid=self._maze, start=self._maze.start, goal=self._maze.goal,
+                                heuristic=self._heuristic, allow_diagonal=self._diagonal_movement)
+            self._planner = planner
+        planner.move_start(self._maze.start)
+        planner.observer = observer
+        return planner
+
+    def _repaint(self):
+        pygame.display.update(self._maze.draw())
 
     def _can_run(self) -> bool:
         if not self._maze.goal or not self._maze.start:
@@ -121,25 +439,8 @@ class SearchController:
         return True
 
     def _diagonal_color(self):
-        return Cell.START if self._diagonal_movement else Cell.WHITE
-
-    def _run_performance_search(self):
-        heuristics: List[Callable] = [euclidean_distance, manhattan_distance, chebyshev_distance]
-        results: Dict[str, List] = {}
-        self._maze.erase_maze()
-        self._maze.start = Location(350, 402)
-        self._maze.goal = Location(1190, 790)
-        self._maze.fill_random()
-        for heuristic in heuristics:
-            heuristic_name: str = heuristic.__name__.replace("_", " ").title()
-            results[heuristic_name] = []
-            heuristic = heuristic(self._maze.goal)
-            for i in range(10):
-                self._a_star = AStar(heuristic=heuristic, successor=self._maze.successor,
-                                     goal_check=self._maze.check_goal,
-                                     start=self._maze.start, maze=self._maze,
-                                     allow_diagonal=False)
-                self._a_star.start()
-                results[heuristic_name].append((self._a_star.time, self._a_star.len_of_path))
-                self._maze.clear_maze()
-        print(results)
+        return self._toggle_color(self._diagonal_movement)
+
+    @staticmethod
+    def _toggle_color(enabled: bool):
+        return Cell.START if enabled else Cell.WHITE
@@ -0,0 +1,60 @@
+"""
+Seeded random mazes and a plain breadth first search, the reference of the engine tests
+"""
+from collections import deque
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from a_star_core.grid import Grid, BLOCK
+from a_star_core.utils import Location
+
+STRAIGHT_MOVES = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+DIAGONAL_MOVES = STRAIGHT_MOVES + [(1, -1), (1, 1), (-1, 1), (-1, -1)]
+
+
+def random_grid(rows: int, columns: int, spread: float, seed: int) -> Grid:
+    grid = Grid(rows=rows, columns=columns)
+    grid.fill_random(spread=spread, seed=seed)
+    return grid
+
+
+def random_queries(grid: Grid, count: int, seed: int) -> List[Tuple[Location, Location]]:
+    """
+    :return: pairs of passable cells, reachable from each other or not
+    """
+    random = np.random.default_rng(seed)
+    cells = np.argwhere(grid.grid != BLOCK)
+    picks = random.integers(len(cells), size=(count, 2))
+    return [(Location(*map(int, cells[first])), Location(*map(int, cells[second]))) for first, second in picks]
+
+
+def bfs_distance(grid: Grid, start: Location, goal: Location, allow_diagonal: bool) -> Union[int, None]:
+    """
+    :return: the number of moves of the shortest path, None if the goal is not reachable
+    """
+    passable = (grid.grid != BLOCK).tolist()
+    moves = DIAGONAL_MOVES if allow_diagonal else STRAIGHT_MOVES
+    rows, columns = grid.rows, grid.columns
+    distances = {(start.row, start.column): 0}
+    queue = deque([(start.row, start.column)])
+    while queue:
+        row, column = queue.popleft()
+        if (row, column) == goal:
+            return distances[row, column]
+        for d_row, d_column in moves:
+            child = (row + d_row, column + d_column)
+            if 0 <= child[0] < rows and 0 <= child[1] < columns and passable[child[0]][child[1]] \
+                    and child not in distances:
+                distances[child] = distances[row, column] + 1
+                queue.append(child)
+    return None
+
+
+def assert_valid_path(grid: Grid, path: List[Location], start: Location, goal: Location, allow_diagonal: bool):
+    # from the start to the goal, one move at a time, only on passable cells
+    assert path[0] == start and path[-1] == goal
+    for location, following in zip(path, path[1:]):
+        d_row, d_column = abs(location.row - following.row), abs(location.column - following.column)
+        assert max(d_row, d_column) == 1 and (allow_diagonal or d_row + d_column == 1), (location, following)
+        assert grid.grid[following.row, following.column] != BLOCK, following
@@ -0,0 +1,55 @@
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import a_star_core
+
+PACKAGE = os.path.dirname(os.path.abspath(a_star_core.__file__))
+
+
+@pytest.mark.parametrize("name", a_star_core.__all__)
+def test_export_is_the_module_name(name):
+    module = importlib.import_module(f"a_star_core.{a_star_core._EXPORTS[name]}")
+    assert getattr(a_star_core, name) is getattr(module, name)
+
+
+def test_unknown_name():
+    with pytest.raises(AttributeError):
+        a_star_core.Missing
+
+
+def test_dir_list_the_exports():
+    assert set(a_star_core.__all__) <= set(dir(a_star_core))
+
+
+def test_import_is_lazy_and_without_pygame():
+    code = ("import sys, a_star_core; a_star_core.Grid; "
+            "print(sorted(name for name in ('pygame', 'a_star_core.astar', 'a_star_core.hpa') if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(PACKAGE), capture_output=True,
+                            text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_copied_package_works_on_its_own(tmp_path):
+    # only the package, without the repository on the path
+    shutil.copytree(PACKAGE, tmp_path / "a_star_core", ignore=shutil.ignore_patterns("__pycache__"))
+    code = ("import sys\n"
+            "from a_star_core import Grid, FlatAStar, JumpPointSearch, BLOCK, Location, manhattan_distance\n"
+            "grid = Grid(rows=20, columns=20)\n"
+            "grid.fill_random(spread=0.2, seed=3)\n"
+            "grid.start, grid.goal = Location(0, 0), Location(19, 19)\n"
+            "flat = FlatAStar(grid).search(start=grid.start, goal=grid.goal,\n"
+            "                              heuristic=manhattan_distance(grid.goal), allow_diagonal=True)\n"
+            "jps = JumpPointSearch(passable=grid.grid != BLOCK).search(\n"
+            "    start=grid.start, goal=grid.goal, heuristic=manhattan_distance(grid.goal), allow_diagonal=False)\n"
+            "print(flat[-1] == grid.goal, jps[-1] == grid.goal, 'grid' in sys.modules)\n")
+    environment = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    output = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                            env=environment)
+    assert output.returncode == 0, output.stderr
+    # the modules are found in the package, not as root modules
+    assert output.stdout.split() == ["True", "True", "False"]
@@ -0,0 +1,46 @@
+import pytest
+
+from a_star_core.anytime import AnytimeAStar
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+def _search(grid, start, goal, allow_diagonal) -> AnytimeAStar:
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    return AnytimeAStar(heuristic=heuristic(goal), successor=grid.successor,
+                        goal_check=lambda location: location == goal, start=start, allow_diagonal=allow_diagonal,
+                        initial_epsilon=3.0, epsilon_step=0.5)
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_improve_down_to_the_bfs_length(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    for start, goal in random_queries(grid, count=10, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        search = _search(grid, start, goal, allow_diagonal)
+        # a budget which is never reached, the search end when the path is proven optimal
+        result = search.search(budget_ms=60_000)
+        if distance is None:
+            assert result.path is None
+            assert search.improvements == []
+            continue
+        assert_valid_path(grid, result.path, start, goal, allow_diagonal)
+        assert len(result.path) - 1 == distance
+        assert result.epsilon == 1.0
+        # every path found on the way is within its bound, and better than the previous one
+        lengths = [length for _, length, _ in search.improvements]
+        assert lengths == sorted(lengths, reverse=True)
+        assert all(length - 1 <= epsilon * distance for _, length, epsilon in search.improvements)
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_path_found_before_a_short_deadline_is_bounded(allow_diagonal):
+    grid = random_grid(rows=120, columns=120, spread=0.25, seed=4)
+    for start, goal in random_queries(grid, count=5, seed=4):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        result = _search(grid, start, goal, allow_diagonal).search(budget_ms=1)
+        if result.path is None:
+            continue
+        assert_valid_path(grid, result.path, start, goal, allow_diagonal)
+        assert distance <= len(result.path) - 1 <= result.epsilon * distance
@@ -0,0 +1,66 @@
+import time
+
+from a_star_core.astar import AStar
+from a_star_core.grid import Grid
+from a_star_core.observer import ThrottledObserver
+from a_star_core.utils import Location, manhattan_distance
+
+
+def _maze() -> Grid:
+    grid = Grid(rows=80, columns=80)
+    grid.fill_random(spread=0.2, seed=1)
+    grid.start = Location(0, 0)
+    grid.goal = Location(79, 79)
+    return grid
+
+
+def _search(grid: Grid, observer=None) -> AStar:
+    return AStar(heuristic=manhattan_distance(grid.goal), successor=grid.successor, goal_check=grid.check_goal,
+                 start=grid.start, allow_diagonal=False, observer=observer)
+
+
+def test_stepped_search_time_excludes_rendering_between_steps():
+    grid = _maze()
+    # every repaint is slow, like a frame of the display
+    observer = ThrottledObserver(mark=lambda location, cell: None, repaint=lambda: time.sleep(0.002), every_n=50)
+    search = _search(grid, observer=observer)
+    search.begin()
+    stepping, rendering_inside = 0.0, 0.0
+    while True:
+        elapsed = observer.elapsed
+        t1 = time.perf_counter()
+        over = search.step(expansions=20)
+        stepping += time.perf_counter() - t1
+        rendering_inside += observer.elapsed - elapsed
+        if over:
+            break
+        # the controller flush the observer between the steps, this is not part of the search
+        observer.flush()
+    busy = stepping - rendering_inside
+    assert search.path
+    assert search.time >= 0
+    assert search.time <= busy
+    assert search.time >= 0.5 * busy
+
+
+def test_stepped_search_finds_the_path_of_the_whole_search():
+    grid = _maze()
+    whole = _search(grid)
+    whole.start()
+    stepped = _search(grid)
+    stepped.begin()
+    while not stepped.step(expansions=100):
+        pass
+    assert stepped.path == whole.path
+    assert stepped.time >= 0
+
+
+def test_search_does_not_print(capsys):
+    grid = _maze()
+    _search(grid).start()
+    # no goal, the search ends without a solution
+    unreachable = AStar(heuristic=manhattan_distance(grid.goal), successor=grid.successor,
+                        goal_check=lambda location: False, start=grid.start, allow_diagonal=False)
+    unreachable.start()
+    assert unreachable.path == []
+    assert capsys.readouterr().out == ""
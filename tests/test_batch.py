@@ -0,0 +1,24 @@
+import pytest
+
+from a_star_core.batch import batch_search
+from a_star_core.utils import chebyshev_distance, manhattan_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_every_query_is_answered_as_short_as_bfs(allow_diagonal):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=5)
+    queries = random_queries(grid, count=40, seed=5)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    results = list(batch_search(grid, queries, heuristic=heuristic, allow_diagonal=allow_diagonal, processes=2,
+                                chunksize=8))
+    # the results come in the order they are solved, every query once
+    assert sorted(result.index for result in results) == list(range(len(queries)))
+    for result in results:
+        assert (result.start, result.goal) == queries[result.index]
+        distance = bfs_distance(grid, result.start, result.goal, allow_diagonal)
+        if distance is None:
+            assert result.path is None
+        else:
+            assert_valid_path(grid, result.path, result.start, result.goal, allow_diagonal)
+            assert len(result.path) - 1 == distance
@@ -0,0 +1,25 @@
+import pytest
+
+from a_star_core.bidirectional import BidirectionalAStar
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_are_as_short_as_bfs(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    queries = random_queries(grid, count=15, seed=seed)
+    # and a start which is the goal
+    for start, goal in queries + [(queries[0][0], queries[0][0])]:
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        search = BidirectionalAStar(heuristic=heuristic, successor=grid.successor, start=start, goal=goal,
+                                    allow_diagonal=allow_diagonal)
+        search.start()
+        if distance is None:
+            assert search.path == []
+        else:
+            # the two halves are joined at the meeting location
+            assert_valid_path(grid, search.path, start, goal, allow_diagonal)
+            assert len(search.path) - 1 == distance
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from a_star_core.bitset_bfs import BitsetBFS
+from a_star_core.grid import Grid, BLOCK, EMPTY
+from a_star_core.utils import Location
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("checkpoint", [3, 64])
+def test_paths_are_as_short_as_bfs(allow_diagonal, seed, checkpoint):
+    # more than two words per row, the frontiers move across the words
+    grid = random_grid(rows=40, columns=150, spread=0.3, seed=seed)
+    search = BitsetBFS(grid.grid != BLOCK, checkpoint=checkpoint)
+    for start, goal in random_queries(grid, count=15, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+            assert len(path) - 1 == distance
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_winding_corridor(allow_diagonal):
+    # the frontier come back under the words it left before, outside of its recent windows
+    cells = np.zeros((21, 130), dtype=np.uint8)
+    for row in range(1, 21, 2):
+        cells[row] = BLOCK
+        cells[row, 129 if row % 4 == 1 else 0] = EMPTY
+    grid = Grid.from_array(cells)
+    start, goal = Location(0, 0), Location(20, 129)
+    search = BitsetBFS(grid.grid != BLOCK, checkpoint=5)
+    path = search.search(start=start, goal=goal, allow_diagonal=allow_diagonal)
+    assert_valid_path(grid, path, start, goal, allow_diagonal)
+    assert len(path) - 1 == bfs_distance(grid, start, goal, allow_diagonal)
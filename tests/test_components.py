@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from a_star_core.components import ComponentIndex, label_components
+from a_star_core.grid import BLOCK, EMPTY
+from a_star_core.utils import Location
+from grids import random_grid, random_queries, bfs_distance
+
+
+def _same_parts(index: ComponentIndex, grid, allow_diagonal: bool) -> bool:
+    # the index give one label per part of a fresh labeling, and different labels to different parts
+    expected = label_components(grid.grid != BLOCK, allow_diagonal=allow_diagonal)
+    pairs = set()
+    for row, column in np.argwhere(expected >= 0).tolist():
+        pairs.add((int(expected[row, column]), index.component((row, column), allow_diagonal)))
+    return len({part for part, _ in pairs}) == len(pairs) == len({label for _, label in pairs})
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_connected_matches_bfs(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.4, seed=seed)
+    index = ComponentIndex(grid)
+    for start, goal in random_queries(grid, count=30, seed=seed):
+        assert index.connected(start, goal, allow_diagonal) == (bfs_distance(grid, start, goal, allow_diagonal)
+                                                                is not None)
+    assert _same_parts(index, grid, allow_diagonal)
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_connected_matches_bfs_after_blocks_and_unblocks(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.35, seed=seed)
+    index = ComponentIndex(grid)
+    queries = random_queries(grid, count=40, seed=seed)
+    edits = np.random.default_rng(seed).integers((grid.rows, grid.columns), size=(40, 2))
+    for (start, goal), (row, column) in zip(queries, edits.tolist()):
+        # a few edits between the queries: two blocks which may split the parts, and a toggled cell
+        grid.block(Location(row, (column + 1) % grid.columns))
+        grid.block(Location((row + 1) % grid.rows, column))
+        grid.block(Location(row, column), to=EMPTY if grid.grid[row, column] == BLOCK else BLOCK)
+        if grid.grid[start.row, start.column] == BLOCK or grid.grid[goal.row, goal.column] == BLOCK:
+            continue
+        assert index.connected(start, goal, allow_diagonal) == (bfs_distance(grid, start, goal, allow_diagonal)
+                                                                is not None)
+    assert _same_parts(index, grid, allow_diagonal)
+    index.close()
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_block_checks_only_the_pieces_it_cuts(allow_diagonal, monkeypatch):
+    # a wall with one gap, the gap is closed then opened again
+    grid = random_grid(rows=40, columns=40, spread=0, seed=0)
+    for row in range(40):
+        if row != 20:
+            grid.block(Location(row, 20))
+    index = ComponentIndex(grid)
+    left, right = Location(5, 5), Location(30, 30)
+    assert index.connected(left, right, allow_diagonal)
+    relabels = []
+    monkeypatch.setattr(index, "_relabel", lambda diagonal: relabels.append(diagonal))
+    # a block in the open cuts nothing, it is checked without labeling the maze again
+    grid.block(Location(5, 10))
+    assert index.connected(left, right, allow_diagonal)
+    assert relabels == []
+    monkeypatch.undo()
+    # closing the gap cut the maze in two halves, too large for the local search
+    grid.block(Location(20, 20))
+    assert not index.connected(left, right, allow_diagonal)
+    grid.block(Location(20, 20), to=EMPTY)
+    assert index.connected(left, right, allow_diagonal)
+
+
+def test_small_piece_is_cut_off_without_labeling_the_maze_again(monkeypatch):
+    grid = random_grid(rows=40, columns=40, spread=0, seed=0)
+    # a pocket of 3 cells in the corner, its only exit is (0, 3)
+    for cell in [(1, 0), (1, 1), (1, 2)]:
+        grid.block(Location(*cell))
+    index = ComponentIndex(grid)
+    assert index.connected(Location(0, 0), Location(39, 39), allow_diagonal=False)
+    relabels = []
+    monkeypatch.setattr(index, "_relabel", lambda diagonal: relabels.append(diagonal))
+    grid.block(Location(0, 3))
+    assert not index.connected(Location(0, 0), Location(39, 39), allow_diagonal=False)
+    assert index.connected(Location(0, 0), Location(0, 2), allow_diagonal=False)
+    assert relabels == []
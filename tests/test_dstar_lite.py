@@ -0,0 +1,69 @@
+import pytest
+
+from a_star_core.dstar_lite import DStarLite
+from a_star_core.grid import BLOCK, EMPTY
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+def _check(grid, planner, start, goal, allow_diagonal):
+    distance = bfs_distance(grid, start, goal, allow_diagonal)
+    path = planner.plan()
+    if distance is None:
+        assert path is None
+    else:
+        assert_valid_path(grid, path, start, goal, allow_diagonal)
+        assert len(path) - 1 == distance
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_plans_are_as_short_as_bfs(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    for start, goal in random_queries(grid, count=10, seed=seed):
+        planner = DStarLite(grid, start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+        _check(grid, planner, start, goal, allow_diagonal)
+        planner.close()
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_replans_after_blocks(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.25, seed=seed)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    (start, goal), *others = random_queries(grid, count=12, seed=seed)
+    planner = DStarLite(grid, start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+    _check(grid, planner, start, goal, allow_diagonal)
+    for cell, _ in others:
+        # block the middle of the current path, so the repair has to go around it, and free another cell
+        if planner.path and len(planner.path) > 2:
+            grid.block(planner.path[len(planner.path) // 2])
+        if cell not in (start, goal):
+            grid.block(cell, to=EMPTY if grid.grid[cell.row, cell.column] == BLOCK else BLOCK)
+        _check(grid, planner, start, goal, allow_diagonal)
+    planner.close()
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_replans_after_start_moves(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.2, seed=seed)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    queries = random_queries(grid, count=10, seed=seed)
+    start, goal = queries[0]
+    planner = DStarLite(grid, start=start, goal=goal, heuristic=heuristic, allow_diagonal=allow_diagonal)
+    _check(grid, planner, start, goal, allow_diagonal)
+    for cell, _ in queries[1:]:
+        if planner.path and len(planner.path) > 3:
+            # walk a few moves along the path, then a block ahead of the new start
+            start = planner.path[3]
+            planner.move_start(start)
+            if len(planner.path) > 5:
+                grid.block(planner.path[5])
+        elif grid.grid[cell.row, cell.column] != BLOCK:
+            # or jump to any free cell, reachable or not
+            start = cell
+            planner.move_start(start)
+        _check(grid, planner, start, goal, allow_diagonal)
+    planner.close()
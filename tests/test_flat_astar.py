@@ -0,0 +1,44 @@
+import pytest
+
+from a_star_core.flat_astar import FlatAStar
+from a_star_core.grid import BLOCK, EMPTY
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_are_as_short_as_bfs(allow_diagonal, seed):
+    grid = random_grid(rows=40, columns=50, spread=0.3, seed=seed)
+    # one engine for every query, the arrays are reused from one search to the next
+    search = FlatAStar(grid)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    for start, goal in random_queries(grid, count=20, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, heuristic=heuristic(goal), allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+            assert len(path) - 1 == distance
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_paths_follow_the_edits(allow_diagonal):
+    # the neighbor masks are read live from the grid
+    grid = random_grid(rows=30, columns=30, spread=0.25, seed=3)
+    search = FlatAStar(grid)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    queries = random_queries(grid, count=20, seed=3)
+    for index, (start, goal) in enumerate(queries):
+        cell = queries[(index + 1) % len(queries)][1]
+        grid.block(cell, to=EMPTY if grid.grid[cell.row, cell.column] == BLOCK else BLOCK)
+        if grid.grid[start.row, start.column] == BLOCK or grid.grid[goal.row, goal.column] == BLOCK:
+            continue
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, heuristic=heuristic(goal), allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+            assert len(path) - 1 == distance
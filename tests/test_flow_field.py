@@ -0,0 +1,58 @@
+import pytest
+
+from a_star_core.flow_field import FlowField, FlowFieldCache
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_are_as_short_as_bfs(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    queries = random_queries(grid, count=30, seed=seed)
+    # a few goals, each shared by many starts
+    for goal in [goal for _, goal in queries[:3]]:
+        field = FlowField.build(grid, goal=goal, allow_diagonal=allow_diagonal)
+        for start, _ in queries:
+            distance = bfs_distance(grid, start, goal, allow_diagonal)
+            assert field.distance(start) == distance
+            path = field.path(start)
+            if distance is None:
+                assert path is None
+            else:
+                assert_valid_path(grid, path, start, goal, allow_diagonal)
+                assert len(path) - 1 == distance
+
+
+def test_blocked_goal_has_no_field():
+    grid = random_grid(rows=10, columns=10, spread=0, seed=0)
+    goal = random_queries(grid, count=1, seed=0)[0][1]
+    grid.block(goal)
+    with pytest.raises(ValueError):
+        FlowField.build(grid, goal=goal, allow_diagonal=False)
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_cache_follows_the_edits(allow_diagonal):
+    grid = random_grid(rows=20, columns=20, spread=0.25, seed=1)
+    queries = random_queries(grid, count=6, seed=1)
+    cache = FlowFieldCache(grid, maxsize=2)
+    start, goal = queries[0]
+    assert cache.get(goal=goal, allow_diagonal=allow_diagonal) is cache.get(goal=goal, allow_diagonal=allow_diagonal)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # the least recently used field is evicted
+    for _, other in queries[1:3]:
+        cache.get(goal=other, allow_diagonal=allow_diagonal)
+    assert len(cache) == 2
+    cache.get(goal=goal, allow_diagonal=allow_diagonal)
+    assert cache.misses == 4
+    # the fields are built again on the edited maze
+    path = cache.path(start=start, goal=goal, allow_diagonal=allow_diagonal)
+    assert len(path) > 2
+    grid.block(path[len(path) // 2])
+    path = cache.path(start=start, goal=goal, allow_diagonal=allow_diagonal)
+    distance = bfs_distance(grid, start, goal, allow_diagonal)
+    if distance is None:
+        assert path is None
+    else:
+        assert_valid_path(grid, path, start, goal, allow_diagonal)
+        assert len(path) - 1 == distance
@@ -0,0 +1,52 @@
+import pytest
+
+from a_star_core.astar import AStar
+from a_star_core.frontier import BinaryHeapFrontier, BucketFrontier, IndexedHeapFrontier
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+FRONTIERS = [BinaryHeapFrontier, BucketFrontier, IndexedHeapFrontier]
+
+
+@pytest.mark.parametrize("frontier", FRONTIERS)
+def test_pop_by_f_then_h_and_replace_pushed_keys(frontier):
+    queue = frontier()
+    queue.push(key="a", item="a", cost=4, heuristic=2)
+    queue.push(key="b", item="b", cost=1, heuristic=1)
+    queue.push(key="c", item="c", cost=2, heuristic=0)
+    # pushing a key again replace its item and its priority
+    queue.push(key="a", item="a again", cost=0, heuristic=1)
+    assert len(queue) == 3
+    popped = [queue.pop() for _ in range(3)]
+    assert popped[0] == "a again"
+    assert set(popped[1:]) == {"b", "c"}
+    if frontier is not BucketFrontier:
+        # the heaps break the ties by the lowest heuristic
+        assert popped[1:] == ["c", "b"]
+    assert queue.empty
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_bucket_frontier_rejects_fractional_priorities():
+    with pytest.raises(ValueError):
+        BucketFrontier().push(key="a", item="a", cost=1, heuristic=0.5)
+
+
+@pytest.mark.parametrize("frontier", FRONTIERS)
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(2))
+def test_astar_paths_are_as_short_as_bfs(frontier, allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    for start, goal in random_queries(grid, count=10, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        search = AStar(heuristic=heuristic(goal), successor=grid.successor,
+                       goal_check=lambda location: location == goal, start=start, allow_diagonal=allow_diagonal,
+                       frontier=frontier)
+        search.start()
+        if distance is None:
+            assert not search.path
+        else:
+            assert_valid_path(grid, search.path, start, goal, allow_diagonal)
+            assert len(search.path) - 1 == distance
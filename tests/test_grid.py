@@ -0,0 +1,41 @@
+from typing import List, Union
+
+from a_star_core.grid import Grid, EMPTY
+from a_star_core.path_cache import PathCache
+from a_star_core.utils import Location, manhattan_distance
+
+
+def test_erase_goals_of_maze_without_blocks_change_version():
+    grid = Grid(rows=10, columns=10)
+    grid.start = Location(0, 0)
+    grid.goal = Location(9, 9)
+    grid.add_goal(Location(5, 5))
+    changes: List[Union[Location, None]] = []
+    grid.subscribe(changes.append)
+    version = grid.version
+    grid.erase_maze()
+    assert grid.version > version
+    assert changes == [None]
+    assert not grid.check_goal(Location(5, 5))
+    assert grid.grid[5, 5] == EMPTY
+
+
+def test_erase_goals_invalidate_path_cache():
+    grid = Grid(rows=10, columns=10)
+    grid.start = Location(0, 0)
+    grid.goal = Location(9, 9)
+    grid.add_goal(Location(0, 3))
+    cache = PathCache(grid)
+    path = [Location(0, column) for column in range(4)]
+    cache.put(start=grid.start, goal=Location(0, 3), heuristic=manhattan_distance, allow_diagonal=False,
+              path=path, time=0.0)
+    grid.erase_maze()
+    assert cache.get(start=grid.start, goal=Location(0, 3), heuristic=manhattan_distance,
+                     allow_diagonal=False) is None
+
+
+def test_erase_empty_maze_keep_version():
+    grid = Grid(rows=10, columns=10)
+    version = grid.version
+    grid.erase_maze()
+    assert grid.version == version
@@ -0,0 +1,59 @@
+import pytest
+
+from a_star_core.grid import BLOCK, EMPTY
+from a_star_core.hpa import HierarchicalAStar
+from a_star_core.utils import Location, manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_paths_match_bfs_reachability(allow_diagonal, seed):
+    grid = random_grid(rows=45, columns=60, spread=0.3, seed=seed)
+    search = HierarchicalAStar(grid, cluster_size=8)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    for start, goal in random_queries(grid, count=25, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, heuristic=heuristic(goal), allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+            # the path go through the entrances, it is never shorter than the shortest one
+            assert len(path) - 1 >= distance
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_paths_follow_the_edits(allow_diagonal):
+    grid = random_grid(rows=40, columns=40, spread=0.25, seed=7)
+    search = HierarchicalAStar(grid, cluster_size=8)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    queries = random_queries(grid, count=30, seed=7)
+    for index, (start, goal) in enumerate(queries):
+        # block or free a cell between the searches, the abstraction is rebuilt where it changed
+        cell = queries[(index + 1) % len(queries)][0]
+        grid.block(cell, to=EMPTY if grid.grid[cell.row, cell.column] == BLOCK else BLOCK)
+        if grid.grid[start.row, start.column] == BLOCK or grid.grid[goal.row, goal.column] == BLOCK:
+            continue
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, heuristic=heuristic(goal), allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+
+
+def test_block_inside_a_cluster_only_rebuild_that_cluster():
+    grid = random_grid(rows=32, columns=32, spread=0.2, seed=1)
+    search = HierarchicalAStar(grid, cluster_size=8)
+    start, goal = Location(0, 0), Location(31, 31)
+    for location in (start, goal):
+        grid.block(location, to=EMPTY)
+    search.search(start=start, goal=goal, heuristic=manhattan_distance(goal), allow_diagonal=False)
+    before = dict(search._edges)
+    assert ((1, 1), False) in before
+    # a cell away from the borders of the cluster (1, 1)
+    cell = Location(11, 12)
+    grid.block(cell, to=EMPTY if grid.grid[cell.row, cell.column] == BLOCK else BLOCK)
+    assert ((1, 1), False) not in search._edges
+    assert all(search._edges[key] is edges for key, edges in before.items() if key[0] != (1, 1))
@@ -0,0 +1,31 @@
+import pytest
+
+from a_star_core.grid import BLOCK
+from a_star_core.jps import JumpPointSearch
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("spread", [0.1, 0.3])
+def test_paths_are_as_short_as_bfs(allow_diagonal, seed, spread):
+    grid = random_grid(rows=40, columns=50, spread=spread, seed=seed)
+    search = JumpPointSearch(grid.grid != BLOCK)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    for start, goal in random_queries(grid, count=20, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, heuristic=heuristic(goal), allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert path is None
+        else:
+            # the jump points are expanded back into single moves
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+            assert len(path) - 1 == distance
+
+
+def test_start_is_the_goal():
+    grid = random_grid(rows=10, columns=10, spread=0, seed=0)
+    start = random_queries(grid, count=1, seed=0)[0][0]
+    search = JumpPointSearch(grid.grid != BLOCK)
+    assert search.search(start=start, goal=start, heuristic=manhattan_distance(start), allow_diagonal=False) == [start]
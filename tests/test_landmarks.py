@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from a_star_core.flat_astar import FlatAStar
+from a_star_core.grid import BLOCK
+from a_star_core.landmarks import LandmarkTable, LandmarkStore, bfs_distances
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+def test_bfs_distances_match_bfs(allow_diagonal):
+    grid = random_grid(rows=25, columns=30, spread=0.3, seed=0)
+    for root, cell in random_queries(grid, count=20, seed=0):
+        distances = bfs_distances(grid.grid != BLOCK, root=root, allow_diagonal=allow_diagonal)
+        distance = bfs_distance(grid, root, cell, allow_diagonal)
+        expected = np.iinfo(distances.dtype).max if distance is None else distance
+        assert distances[cell.row, cell.column] == expected
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_heuristic_is_admissible(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    passable = grid.grid != BLOCK
+    table = LandmarkTable.build(passable, allow_diagonal=allow_diagonal, count=6)
+    assert table.landmarks
+    for goal, _ in random_queries(grid, count=10, seed=seed):
+        exact = bfs_distances(passable, root=goal, allow_diagonal=allow_diagonal).astype(np.int64)
+        reachable = exact != np.iinfo(np.uint32).max
+        field = table.field(goal)
+        # never more than the number of moves to the goal, wherever the goal is reachable
+        assert (field[reachable] <= exact[reachable]).all()
+        assert field[goal.row, goal.column] == 0
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_are_as_short_as_bfs(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    table = LandmarkTable.build(grid.grid != BLOCK, allow_diagonal=allow_diagonal, count=6)
+    search = FlatAStar(grid)
+    for start, goal in random_queries(grid, count=15, seed=seed):
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        path = search.search(start=start, goal=goal, heuristic=table(goal), allow_diagonal=allow_diagonal,
+                             field=table.field(goal))
+        if distance is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, start, goal, allow_diagonal)
+            assert len(path) - 1 == distance
+
+
+def test_store_saves_the_tables_and_rebuilds_them_after_a_block(tmp_path):
+    grid = random_grid(rows=20, columns=20, spread=0.2, seed=1)
+    store = LandmarkStore(grid, count=4, directory=str(tmp_path))
+    table = store.table(allow_diagonal=True)
+    assert len(list(tmp_path.iterdir())) == 1
+    # the same blocks, the table is kept
+    start, goal = random_queries(grid, count=1, seed=1)[0]
+    grid.start = start
+    assert store.table(allow_diagonal=True) is table
+    # a new store load the saved table
+    loaded = LandmarkStore(grid, count=4, directory=str(tmp_path)).table(allow_diagonal=True)
+    assert loaded.landmarks == table.landmarks
+    assert np.array_equal(loaded.distances, table.distances)
+    grid.block(goal)
+    assert store.table(allow_diagonal=True) is not table
+    assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from a_star_core.flat_astar import FlatAStar
+from a_star_core.grid import BLOCK
+from a_star_core.maze_file import MappedMaze, save_maze, load_maze, to_ascii, from_ascii, main
+from a_star_core.utils import manhattan_distance, chebyshev_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_saved_maze_is_loaded_back(tmp_path, allow_diagonal, seed):
+    # columns which do not fill the last byte of the rows
+    grid = random_grid(rows=25, columns=37, spread=0.3, seed=seed)
+    queries = random_queries(grid, count=10, seed=seed)
+    grid.start, grid.goal = queries[0]
+    path = str(tmp_path / "maze.maze")
+    save_maze(path, grid, connectivity=8 if allow_diagonal else 4)
+    loaded = load_maze(path)
+    assert np.array_equal(loaded.grid, grid.grid)
+    assert (loaded.start, loaded.goal) == (grid.start, grid.goal)
+    with MappedMaze(path) as maze:
+        assert maze.allow_diagonal == allow_diagonal
+        assert np.array_equal(maze.window(3, 5, 20, 30), (grid.grid[3:20, 5:30] == BLOCK).astype(np.uint8))
+        assert all(maze.is_blocked(location) == (grid.grid[location.row, location.column] == BLOCK)
+                   for pair in queries for location in pair)
+    # the loaded maze give the same shortest paths
+    search = FlatAStar(loaded)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    for start, goal in queries:
+        distance = bfs_distance(grid, start, goal, allow_diagonal)
+        found = search.search(start=start, goal=goal, heuristic=heuristic(goal), allow_diagonal=allow_diagonal)
+        if distance is None:
+            assert found is None
+        else:
+            assert_valid_path(grid, found, start, goal, allow_diagonal)
+            assert len(found) - 1 == distance
+
+
+def test_maze_without_start_and_goal(tmp_path):
+    grid = random_grid(rows=9, columns=64, spread=0.4, seed=1)
+    path = str(tmp_path / "maze.maze")
+    save_maze(path, grid)
+    loaded = load_maze(path)
+    assert loaded.start is None and loaded.goal is None
+    assert np.array_equal(loaded.grid, grid.grid)
+
+
+def test_ascii_round_trip(tmp_path):
+    grid = random_grid(rows=12, columns=21, spread=0.3, seed=2)
+    grid.start, grid.goal = random_queries(grid, count=1, seed=2)[0]
+    assert np.array_equal(from_ascii(to_ascii(grid)).grid, grid.grid)
+    # and through the command line, to the binary form and back
+    (tmp_path / "maze.txt").write_text(to_ascii(grid))
+    assert main(["pack", str(tmp_path / "maze.txt"), str(tmp_path / "maze.maze"), "--connectivity", "8"]) == 0
+    assert main(["unpack", str(tmp_path / "maze.maze"), str(tmp_path / "back.txt")]) == 0
+    assert (tmp_path / "back.txt").read_text() == to_ascii(grid)
+
+
+def test_not_a_maze_file(tmp_path):
+    path = tmp_path / "maze.maze"
+    path.write_bytes(b"not a maze file, but long enough for a header")
+    with pytest.raises(ValueError):
+        MappedMaze(str(path))
+    with pytest.raises(ValueError):
+        from_ascii("S?G\n")
@@ -0,0 +1,44 @@
+import pytest
+
+from a_star_core.multi_goal import GoalIndex, MultiGoalAStar
+from a_star_core.utils import manhattan_distance, chebyshev_distance, euclidean_distance
+from grids import random_grid, random_queries, bfs_distance, assert_valid_path
+
+
+@pytest.mark.parametrize("heuristic", [manhattan_distance, chebyshev_distance, euclidean_distance])
+@pytest.mark.parametrize("bucket_size", [None, 1, 3, 50])
+def test_nearest_goal_is_the_closest_of_all(heuristic, bucket_size):
+    grid = random_grid(rows=40, columns=60, spread=0, seed=0)
+    queries = random_queries(grid, count=60, seed=bucket_size or 0)
+    goals = [goal for _, goal in queries[:12]]
+    index = GoalIndex(goals=goals, heuristic=heuristic, bucket_size=bucket_size)
+    for location, _ in queries:
+        _, value = index.nearest(location)
+        assert value == min(heuristic(goal)(location) for goal in goals)
+
+
+def test_goal_index_needs_a_goal():
+    with pytest.raises(ValueError):
+        GoalIndex(goals=[], heuristic=manhattan_distance)
+
+
+@pytest.mark.parametrize("allow_diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_path_is_as_short_as_bfs_to_the_closest_goal(allow_diagonal, seed):
+    grid = random_grid(rows=30, columns=40, spread=0.3, seed=seed)
+    heuristic = chebyshev_distance if allow_diagonal else manhattan_distance
+    queries = random_queries(grid, count=24, seed=seed)
+    for group in range(0, len(queries), 4):
+        start = queries[group][0]
+        goals = [goal for _, goal in queries[group:group + 4]]
+        distances = [bfs_distance(grid, start, goal, allow_diagonal) for goal in goals]
+        reachable = [distance for distance in distances if distance is not None]
+        search = MultiGoalAStar(heuristic=heuristic, successor=grid.successor, start=start, goals=goals,
+                                allow_diagonal=allow_diagonal)
+        search.start()
+        if not reachable:
+            assert search.path == [] and search.goal is None
+            continue
+        assert search.goal in goals
+        assert_valid_path(grid, search.path, start, search.goal, allow_diagonal)
+        assert len(search.path) - 1 == min(reachable)